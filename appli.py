@@ -1,15 +1,32 @@
-import yfinance as yf
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from prophet import Prophet
-from statsmodels.tsa.arima.model import ARIMA
-from wordcloud import WordCloud
-from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 import requests
+import os
 import time
+from argentis.backtest import METRICS as BACKTEST_METRICS, SCHEDULES, backtest, drawdowns
+from argentis.downsample import downsample
+from argentis.fetching import FetchScheduler, TokenBucket
+from argentis.figures import FigureCache, bar_chart, forecast_chart, frontier_chart, heatmap_chart, pie_chart
+from argentis.forecast import (DEFAULT_ORDER, PROPHET_HORIZON, ForecastCache, forecast_one, order_config,
+                               prophet_forecast, search_order)
+from argentis.fast_forecast import MODELS as FAST_MODELS, forecast_panel
+from argentis.jobs import PENDING, JobQueue
+from argentis.news_store import NewsStore
+from argentis.frontier import annualized_moments, simulate_frontier
+from argentis.fundamentals import FundamentalsStore
+from argentis.optimizer import efficient_frontier, max_sharpe
+from argentis.price_store import PriceStore, slice_period
+from argentis.providers import make_provider, price_panel
+from argentis.risk import TAILS, portfolio_risk
+from argentis.rolling import RollingStore
+from argentis.screener import DEFAULT_RULES, format_rules, parse_rules, screen
+from argentis.sentiment import default_engine
+from argentis.simulation import DEFAULT_SEED, SimulationCache, simulation_key
+from argentis.stress import KINDS, METRICS, PORTFOLIO, factor_scenarios, historical_scenarios, parse_scenarios, stress_test
+from argentis.ticker import LazyTicker
+from argentis.valuation import DISCOUNT_RATE, GROWTH_RATE, sensitivity, value_universe
+from argentis.word_cloud import DEFAULT_STOPWORDS, WordCloudCache, word_frequencies
 
 # --- Config ---
 st.set_page_config(page_title="Argentis Investment", layout="wide")
@@ -21,8 +38,44 @@ custom_headers = {
     'Accept-Language': 'en-US,en;q=0.5',
     'Referer': 'https://finance.yahoo.com/'
 }
-session = requests.Session()
-session.headers.update(custom_headers)
+
+# --- Source et stockage local des historiques de prix ---
+# Construits une fois par processus : chaque rerun et chaque session partagent le même
+# limiteur de débit, le même pool de téléchargement et les verrous et tables en mémoire des stores
+@st.cache_resource
+def get_price_provider():
+    """Data provider shared by every session, behind one process-wide rate limiter (2 req/s, bursts of 5)."""
+    session = requests.Session()
+    session.headers.update(custom_headers)
+    scheduler = FetchScheduler(TokenBucket(rate=2, capacity=5), max_workers=8)
+    # ARGENTIS_PROVIDER=fake permet de lancer l'application hors ligne
+    return make_provider(os.environ.get("ARGENTIS_PROVIDER", "yahoo"), scheduler, session=session)
+
+STORES = {
+    "prices": PriceStore,
+    "rolling": RollingStore,
+    "news": NewsStore,
+    "word_clouds": WordCloudCache,
+    "figures": FigureCache,
+    "fundamentals": FundamentalsStore,
+    "forecasts": ForecastCache,
+    "simulations": SimulationCache,
+}
+
+@st.cache_resource
+def get_store(name):
+    """Store or disk cache shared by every session, with its locks and in-memory state."""
+    return STORES[name]()
+
+price_provider = get_price_provider()
+price_store = get_store("prices")
+rolling_store = get_store("rolling")
+news_store = get_store("news")
+word_cloud_cache = get_store("word_clouds")
+figure_cache = get_store("figures")
+fundamentals_store = get_store("fundamentals")
+forecast_cache = get_store("forecasts")
+simulation_cache = get_store("simulations")
 
 # --- Personnalisation CSS ---
 CSS_STYLE = """
@@ -160,51 +213,47 @@ page = st.sidebar.radio("Navigation", [
 ])
 
 # --- Utils ---
-@st.cache_data
-@retry(
-    stop=stop_after_attempt(10),
-    wait=wait_fixed(5),
-    retry=retry_if_exception_type(Exception)
-)
+@st.cache_resource(max_entries=256)
 def get_ticker_data(ticker_input):
-    """Fetch all required data for a ticker using yfinance."""
-    try:
-        time.sleep(3)  # Délai pour éviter les blocages
-        ticker = yf.Ticker(ticker_input, session=session)
-        info = ticker.info
-        historical_data = ticker.history(period="5y", interval="1d")
-        sustainability = ticker.sustainability
-        news = ticker.news
-
-        if historical_data.empty or 'Close' not in historical_data.columns or len(historical_data) < 2:
-            st.warning(f"Les données historiques pour {ticker_input} sont vides ou incomplètes.")
-            historical_data = None
-
-        return {
-            "info": info,
-            "historical_data": historical_data,
-            "sustainability": sustainability,
-            "news": news
-        }
-    except Exception as e:
-        st.error(f"Erreur lors de la récupération des données pour {ticker_input} : {str(e)}")
-        st.info("Cela peut être dû à une limitation de l'API de Yahoo Finance ou à un problème de réseau. Essayez un autre ticker (par exemple, AAPL ou MSFT) ou réessayez plus tard.")
-        return None
+    """Return a lazy handle on a ticker: each component is fetched on first access."""
+    return LazyTicker(ticker_input, price_provider, price_store, news_store=news_store, fundamentals=fundamentals_store)
 
-@st.cache_data
-@retry(
-    stop=stop_after_attempt(10),
-    wait=wait_fixed(5),
-    retry=retry_if_exception_type(Exception)
-)
+@st.cache_resource
+def get_job_queue():
+    """Background job queue shared by every session, so identical jobs run once."""
+    return JobQueue()
+
+# Points envoyés au navigateur par courbe : de l'ordre de la largeur des graphiques en pixels
+CHART_POINTS = 800
+
+def line_chart(data, points=CHART_POINTS):
+    """``st.line_chart`` of a series reduced by LTTB to about ``points`` points."""
+    st.line_chart(downsample(data, points))
+
+def show_figure(draw, figsize=None, **data):
+    """Display a chart through the figure cache: matplotlib only runs for data not drawn yet."""
+    st.image(figure_cache.render(draw, figsize=figsize, **data), use_column_width=True)
+
+def poll_jobs(job_ids, interval=1.0):
+    """Rerun the page until the given background jobs are finished."""
+    queue = get_job_queue()
+    if any(queue.status(job)["state"] in PENDING for job in job_ids):
+        time.sleep(interval)
+        st.rerun()
+
+@st.cache_resource
+def get_sentiment_engine():
+    """Sentiment engine shared by every session, with its lexicon compiled once and its score cache."""
+    return default_engine()
+
+@st.cache_data(ttl=900)
 def get_history(ticker_input, period="5y", interval="1d"):
     """Fetch historical stock data for a given ticker using yfinance."""
     try:
-        time.sleep(3)
-        ticker = yf.Ticker(ticker_input, session=session)
-        df = ticker.history(period=period, interval=interval)
+        # Les périodes journalières sont découpées dans l'historique 5 ans stocké
+        df = price_store.history(ticker_input, price_provider, period=period, interval=interval)
         
-        if df.empty or "Close" not in df.columns or len(df) < 2:
+        if df is None or df.empty or "Close" not in df.columns or len(df) < 2:
             st.warning(f"Les données pour {ticker_input} sont vides ou incomplètes.")
             return None
         return df
@@ -213,38 +262,72 @@ def get_history(ticker_input, period="5y", interval="1d"):
         st.info("Cela peut être dû à une limitation de l'API de Yahoo Finance. Essayez un autre ticker (par exemple, AAPL ou MSFT).")
         return None
 
-@st.cache_data
-@retry(
-    stop=stop_after_attempt(10),
-    wait=wait_fixed(5),
-    retry=retry_if_exception_type(Exception)
-)
-def get_ratios(ticker_input):
-    """Fetch key financial ratios for a given ticker using yfinance."""
+@st.cache_data(ttl=900)
+def get_price_panel(tickers, period="5y", field="Close"):
+    """Fetch daily prices for several tickers through the price store.
+
+    Fresh tickers are read from disk; the others are downloaded in parallel,
+    one rate-limited request per ticker, only for the bars after their last
+    stored date. Returns an aligned date x ticker panel and the list of
+    tickers without data.
+    """
     try:
-        time.sleep(3)
-        ticker = yf.Ticker(ticker_input, session=session)
-        info = ticker.info
+        tickers = list(tickers)
+        frames = price_store.history_many(tickers, price_provider, period=period)
+        missing = [t for t in tickers if frames.get(t) is None or field not in frames[t].columns or len(frames[t]) < 2]
+        panel = price_panel({t: frames[t] for t in tickers if t not in missing}, field=field)
+        return panel, missing
+    except Exception as e:
+        st.error(f"Erreur lors de la récupération des données pour {', '.join(tickers)} : {str(e)}")
+        st.info("Cela peut être dû à une limitation de l'API de Yahoo Finance. Essayez d'autres tickers (par exemple, AAPL ou MSFT).")
+        return pd.DataFrame(), list(tickers)
 
-        if not info:
-            st.warning(f"Les ratios financiers pour {ticker_input} sont indisponibles via yfinance.")
-            return None
+@st.cache_data(ttl=900)
+def get_chart_history(ticker_input, period="5y", points=CHART_POINTS, field="Close"):
+    """Closes of a ticker over a period, reduced for display and cached per (ticker, period, width)."""
+    df = get_history(ticker_input, period=period)
+    if df is None or field not in df.columns:
+        return None
+    return downsample(df[field], points)
 
-        return {
-            "PER": info.get("trailingPE", "N/A"),
-            "PBR": info.get("priceToBook", "N/A"),
-            "ROE": info.get("returnOnEquity", "N/A"),
-            "ROA": info.get("returnOnAssets", "N/A"),
-            "Debt to Equity": info.get("debtToEquity", "N/A"),
-            "Current Ratio": info.get("currentRatio", "N/A"),
-            "Quick Ratio": info.get("quickRatio", "N/A"),
-            "Gross Margin": info.get("grossMargins", "N/A"),
-            "Net Margin": info.get("profitMargins", "N/A"),
-        }
-    except Exception as e:
-        st.error(f"Erreur lors de la récupération des ratios pour {ticker_input} : {str(e)}")
+def format_value(x):
+    """Display a fundamental, "N/A" when it is missing."""
+    return "N/A" if pd.isna(x) else f"{x:g}"
+
+def ratios_from_info(info):
+    """Extract the key financial ratios from a yfinance info dict."""
+    return {
+        "PER": info.get("trailingPE", "N/A"),
+        "PBR": info.get("priceToBook", "N/A"),
+        "ROE": info.get("returnOnEquity", "N/A"),
+        "ROA": info.get("returnOnAssets", "N/A"),
+        "Debt to Equity": info.get("debtToEquity", "N/A"),
+        "Current Ratio": info.get("currentRatio", "N/A"),
+        "Quick Ratio": info.get("quickRatio", "N/A"),
+        "Gross Margin": info.get("grossMargins", "N/A"),
+        "Net Margin": info.get("profitMargins", "N/A"),
+    }
+
+def get_infos(tickers, fields=None):
+    """Read the info of several tickers from the fundamentals store.
+
+    Only tickers whose ``fields`` are stale are downloaded, in one bulk
+    request. Returns ``{ticker: info}`` for the tickers that answered.
+    """
+    return fundamentals_store.infos(tickers, price_provider, fields)
+
+def get_ratios(ticker_input):
+    """Fetch key financial ratios for a given ticker using yfinance."""
+    ticker_data = get_ticker_data(ticker_input)
+    info = ticker_data.info
+    if "info" in ticker_data.errors:
+        st.error(f"Erreur lors de la récupération des ratios pour {ticker_input} : {str(ticker_data.errors['info'])}")
         st.info("Cela peut être dû à une limitation de l'API de Yahoo Finance. Essayez un autre ticker (par exemple, AAPL ou MSFT).")
         return None
+    if not info:
+        st.warning(f"Les ratios financiers pour {ticker_input} sont indisponibles via yfinance.")
+        return None
+    return ratios_from_info(info)
 
 @st.cache_data
 def get_top_bottom_performers():
@@ -261,49 +344,48 @@ def get_top_bottom_performers():
     })
     return top_5, bottom_5
 
-@st.cache_data
-def calculate_wacc(ticker_input, ticker_data=None):
-    """Calculate a simplified WACC for a given ticker."""
-    try:
-        if ticker_data is None:
-            ticker_data = get_ticker_data(ticker_input)
-        if ticker_data is None or ticker_data.get("info") is None:
-            return None
-        info = ticker_data["info"]
-        total_debt = float(info.get("totalDebt", 0))
-        market_cap = float(info.get("marketCap", 1))
-        total_value = total_debt + market_cap
-        debt_weight = total_debt / total_value if total_value > 0 else 0
-        equity_weight = market_cap / total_value if total_value > 0 else 0
-        cost_of_equity = 0.08
-        cost_of_debt = 0.04
-        tax_rate = 0.21
-        wacc = (equity_weight * cost_of_equity) + (debt_weight * cost_of_debt * (1 - tax_rate))
-        return wacc * 100
-    except:
-        return None
+# Grilles de la surface de sensibilité du DCF (pas de 0,2 et 0,16 point, hypothèses par défaut incluses)
+DISCOUNT_GRID = np.round(np.linspace(0.04, 0.14, 51), 4)
+GROWTH_GRID = np.round(np.linspace(-0.02, 0.06, 51), 4)
+VALUATION_FIELDS = ["total_debt", "market_cap", "operating_cash_flow"]
 
-@st.cache_data
-def calculate_dcf(ticker_input, ticker_data=None):
-    """Calculate a simplified DCF valuation for a given ticker."""
-    try:
-        if ticker_data is None:
-            ticker_data = get_ticker_data(ticker_input)
-        if ticker_data is None or ticker_data.get("info") is None:
-            return None
-        info = ticker_data["info"]
-        cash_flow = float(info.get("operatingCashFlow", 0))
-        growth_rate = 0.02
-        discount_rate = 0.08
-        years = 5
-        dcf = 0
-        for i in range(1, years + 1):
-            dcf += cash_flow * (1 + growth_rate) ** i / (1 + discount_rate) ** i
-        terminal_value = cash_flow * (1 + growth_rate) ** (years + 1) / (discount_rate - growth_rate)
-        dcf += terminal_value / (1 + discount_rate) ** years
-        return dcf / 1e6
-    except:
-        return None
+@st.cache_data(ttl=3600)
+def get_valuations(tickers):
+    """WACC (%) and DCF (M$) of several tickers, valued together under the default assumptions."""
+    return value_universe(fundamentals_store.snapshot(tickers, price_provider, VALUATION_FIELDS))
+
+@st.cache_data(ttl=3600)
+def get_dcf_sensitivity(tickers):
+    """DCF (M$) of several tickers over the whole discount rate x growth rate grid, computed in one pass."""
+    table = fundamentals_store.snapshot(tickers, price_provider, VALUATION_FIELDS)
+    return sensitivity(table, DISCOUNT_GRID, GROWTH_GRID)
+
+def frontier_simulation(tickers, period, rets, sims, seed=DEFAULT_SEED, keep_weights=False):
+    """Monte Carlo frontier of the tickers' returns, computed once per (tickers, period, data, sims, seed)."""
+    rets = rets[list(tickers)]
+    mu, cov = annualized_moments(rets)
+    key = simulation_key("frontier", tickers, period, rets, sims, seed, keep_weights=keep_weights)
+    return simulation_cache.run(key, simulate_frontier, mu, cov, sims=sims, seed=seed, keep_weights=keep_weights,
+                                workers=min(4, os.cpu_count() or 1))
+
+def backtest_simulated(tickers, period, prices, frontier, sims, seed, schedule, threshold, cost):
+    """Backtest metrics of all the simulated portfolios of a frontier, under one rebalancing policy."""
+    key = simulation_key("backtest", tickers, period, prices, sims, seed, schedule=schedule, threshold=threshold, cost=cost)
+    return simulation_cache.run(key, lambda: backtest(prices, frontier.weights, schedule, threshold, cost).metrics)
+
+@st.cache_data(ttl=900)
+def get_stress_test(tickers, period, weights, alpha, custom="", seed=DEFAULT_SEED):
+    """Metrics of the assets and the portfolio under the whole scenario library, computed in one pass.
+
+    Historical replays search the five years of stored history; the stressed
+    returns are those of ``period``; random scenarios draw from ``seed``.
+    """
+    data, _ = get_price_panel(tickers, period=period)
+    history, _ = get_price_panel(tickers, period="5y")
+    rets = data.pct_change().dropna()
+    scenarios = (historical_scenarios(history[rets.columns]) + factor_scenarios(rets)
+                 + parse_scenarios(custom, list(rets.columns)))
+    return stress_test(rets, scenarios, weights=np.asarray(weights), alpha=alpha, rng=np.random.default_rng(seed))
 
 # --- Page: Accueil ---
 if page == "Accueil":
@@ -366,7 +448,7 @@ if page == "Accueil":
         if ticker_data is None:
             st.error(f"Impossible de récupérer les données pour {ticker_input}. Essayez un autre ticker (par exemple, AAPL ou MSFT).")
         else:
-            info = ticker_data.get("info")
+            info = ticker_data.get("info", {})
             data = ticker_data.get("historical_data")
             
             if data is None or data.empty:
@@ -389,9 +471,9 @@ if page == "Accueil":
                     selected_period = st.selectbox("Choisir l'horizon temporel", options=list(period_options.keys()))
                     period = period_options[selected_period]
                     
-                    historical_data = get_history(ticker_input, period=period)
-                    if historical_data is not None and not historical_data.empty and "Close" in historical_data.columns:
-                        st.line_chart(historical_data["Close"])
+                    chart_data = get_chart_history(ticker_input, period=period)
+                    if chart_data is not None and not chart_data.empty:
+                        st.line_chart(chart_data)
                     else:
                         st.write(f"Aucune donnée disponible pour afficher le graphique de {ticker_input} sur la période sélectionnée.")
                     
@@ -438,25 +520,39 @@ elif page == "Évaluation d'un Actif":
     if ticker_input:
         ticker_data = get_ticker_data(ticker_input)
         
+        symbol = ticker_input.strip().upper()
+        valuations = get_valuations((symbol,))
+        valuation = valuations.loc[symbol] if symbol in valuations.index else None
+
         st.subheader("WACC (Coût Moyen Pondéré du Capital)")
-        if ticker_data:
-            wacc = calculate_wacc(ticker_input, ticker_data)
-            if wacc is not None:
-                st.metric("WACC", f"{wacc:.2f}%")
-            else:
-                st.write("Données insuffisantes pour calculer le WACC.")
+        if valuation is not None and np.isfinite(valuation["wacc"]):
+            st.metric("WACC", f"{valuation['wacc']:.2f}%")
         else:
-            st.write("Impossible de récupérer les données pour calculer le WACC.")
+            st.write("Données insuffisantes pour calculer le WACC.")
     
         st.subheader("DCF (Valorisation par Flux de Trésorerie Actualisés)")
-        if ticker_data:
-            dcf = calculate_dcf(ticker_input, ticker_data)
-            if dcf is not None:
-                st.metric("DCF", f"{dcf:.2f} M$")
-            else:
-                st.write("Données insuffisantes pour calculer le DCF.")
+        if valuation is not None and np.isfinite(valuation["dcf"]):
+            st.metric("DCF", f"{valuation['dcf']:.2f} M$")
+
+            # Surface complète calculée une fois : changer les hypothèses ne fait que lire la grille
+            with st.expander("Sensibilité du DCF aux hypothèses"):
+                surface = get_dcf_sensitivity((symbol,))
+                col1, col2 = st.columns(2)
+                with col1:
+                    discount = st.select_slider("Taux d'actualisation", DISCOUNT_GRID, value=DISCOUNT_GRID[np.abs(DISCOUNT_GRID - DISCOUNT_RATE).argmin()],
+                                                format_func=lambda x: f"{x:.2%}")
+                with col2:
+                    growth = st.select_slider("Taux de croissance", GROWTH_GRID, value=GROWTH_GRID[np.abs(GROWTH_GRID - GROWTH_RATE).argmin()],
+                                              format_func=lambda x: f"{x:.2%}")
+                value = surface.values[0, np.searchsorted(DISCOUNT_GRID, discount), np.searchsorted(GROWTH_GRID, growth)]
+                if np.isfinite(value):
+                    st.metric("DCF avec ces hypothèses", f"{value:.2f} M$", f"{value - valuation['dcf']:+.2f} M$")
+                else:
+                    st.write("Le taux d'actualisation doit dépasser le taux de croissance.")
+                show_figure(heatmap_chart, values=surface.values[0], columns=GROWTH_GRID * 100, index=DISCOUNT_GRID * 100,
+                            xlabel="Taux de croissance (%)", ylabel="Taux d'actualisation (%)", label="DCF (M$)")
         else:
-            st.write("Impossible de récupérer les données pour calculer le DCF.")
+            st.write("Données insuffisantes pour calculer le DCF.")
     
         st.subheader("Ratios Financiers")
         if ticker_data:
@@ -472,7 +568,7 @@ elif page == "Évaluation d'un Actif":
         if ticker_data and ticker_data.get("historical_data") is not None:
             df = ticker_data["historical_data"]
             if not df.empty and "Close" in df.columns:
-                st.line_chart(df["Close"])
+                line_chart(df["Close"])
             else:
                 st.write("Aucune donnée disponible pour afficher l'historique des prix.")
         else:
@@ -568,7 +664,7 @@ elif page == "Comparateur d'Actifs":
                             ticker_2: close_2
                         }).dropna()
                         if not combined.empty and len(combined) >= 2:
-                            st.line_chart(combined)
+                            line_chart(combined)
                         else:
                             st.write(f"Données insuffisantes pour afficher la performance historique.")
                 else:
@@ -600,13 +696,25 @@ elif page == "Gestion de Portefeuille":
     total_weight = sum(portfolio.values())
     if total_weight > 0 and not 0.95 <= total_weight <= 1.05:
         st.warning("La somme des poids doit être proche de 100% (entre 95% et 105%).")
+
+    with st.expander("⚙️ Paramètres du backtest"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            cost_bps = st.number_input("Coûts de transaction (points de base du montant échangé)", 0.0, 200.0, 10.0, step=5.0)
+        with col2:
+            drift_threshold = st.slider("Seuil de dérive (%)", 1, 20, 5, help="Écart de poids déclenchant un rééquilibrage.")
+        with col3:
+            simulated_schedule = st.selectbox("Rééquilibrage des portefeuilles simulés", list(SCHEDULES),
+                                              format_func=SCHEDULES.get, index=1)
     
     if st.button("Simuler Portefeuille"):
         if not portfolio:
             st.error("Veuillez saisir au moins un symbole ou compagnie avec un poids valide.")
         else:
             try:
-                dfp = pd.DataFrame({t: get_history(t)["Close"] for t in portfolio})
+                dfp, missing = get_price_panel(tuple(portfolio))
+                if missing:
+                    raise ValueError(f"données indisponibles pour {', '.join(missing)}")
                 rets = dfp.pct_change().dropna()
                 weights = np.array([portfolio[t] for t in portfolio])
                 
@@ -616,24 +724,47 @@ elif page == "Gestion de Portefeuille":
                 portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(rets.cov() * 252, weights))) * 100
                 st.metric("Volatilité Annualisée", f"{portfolio_vol:.2f}%")
                 
-                n = len(portfolio)
-                sims = 5000
-                results = np.zeros((3, sims))
-                weights_list = []
-                for i in range(sims):
-                    w = np.random.dirichlet(np.ones(n))
-                    weights_list.append(w)
-                    ret = np.sum(rets.mean() * w) * 252
-                    vol = np.sqrt(np.dot(w.T, np.dot(rets.cov() * 252, w)))
-                    results[:, i] = [vol, ret, ret / vol]
-                idx = np.argmax(results[2])
-                w_opt = weights_list[idx]
+                frontier = frontier_simulation(tuple(portfolio), "5y", rets, sims=5000, keep_weights=True)
+                w_opt = frontier.best_weights
                 df_opt = pd.DataFrame({'Actif': list(portfolio), 'Poids optimal': [f"{w * 100:.2f}%" for w in w_opt]})
                 st.table(df_opt)
                 
-                fig, ax = plt.subplots()
-                ax.scatter(results[0], results[1], c=results[2], cmap='viridis')
-                st.pyplot(fig)
+                show_figure(frontier_chart, vols=frontier.vols, rets=frontier.rets, sharpes=frontier.sharpes)
+
+                st.markdown("#### Backtest")
+                # Les deux portefeuilles sous les quatre politiques : une seule passe sur le panel de prix
+                prices = dfp[list(portfolio)].dropna()
+                cost, threshold = cost_bps / 1e4, drift_threshold / 100
+                labels = [f"{name} — {SCHEDULES[s]}" for name in ("Votre portefeuille", "Portefeuille optimal") for s in SCHEDULES]
+                policies = backtest(prices, np.repeat([weights, w_opt], len(SCHEDULES), axis=0), list(SCHEDULES) * 2,
+                                    threshold, cost)
+                table = policies.metrics.drop(columns="schedule").set_axis(labels)
+                table[["total_return", "cagr", "volatility", "max_drawdown", "turnover"]] *= 100
+                st.table(table.rename(columns=BACKTEST_METRICS).style.format("{:.2f}")
+                         .format("{:.0f}", subset=[BACKTEST_METRICS["rebalances"]]))
+                own = pd.DataFrame(policies.values[:len(SCHEDULES)].T, index=policies.index, columns=list(SCHEDULES.values()))
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.caption("Valeur de votre portefeuille (base 100)")
+                    line_chart(own * 100)
+                with col2:
+                    st.caption("Drawdown de votre portefeuille (%)")
+                    line_chart(pd.DataFrame(drawdowns(own.to_numpy().T).T * 100, index=own.index, columns=own.columns))
+
+                simulated = backtest_simulated(tuple(portfolio), "5y", prices, frontier, 5000, DEFAULT_SEED,
+                                               simulated_schedule, threshold, cost)
+                mine = policies.metrics.iloc[list(SCHEDULES).index(simulated_schedule)]
+                st.caption(f"Votre portefeuille face aux {len(simulated)} portefeuilles simulés (rééquilibrage "
+                           f"{SCHEDULES[simulated_schedule].lower()})")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Rendement annualisé battu", f"{(simulated['cagr'] < mine['cagr']).mean() * 100:.0f}% des simulations")
+                with col2:
+                    st.metric("Ratio Sharpe battu", f"{(simulated['sharpe'] < mine['sharpe']).mean() * 100:.0f}% des simulations")
+                with col3:
+                    best = int(simulated["sharpe"].idxmax())
+                    st.metric("Meilleur Sharpe simulé", f"{simulated['sharpe'][best]:.2f}",
+                              help=", ".join(f"{t} {w * 100:.0f}%" for t, w in zip(portfolio, frontier.weights[best])))
             except Exception as e:
                 st.error(f"Erreur lors de la simulation : {str(e)}")
 
@@ -642,9 +773,80 @@ elif page == "Prévisions Machine Learning":
     st.title("🤖 Prévisions Machine Learning")
     
     # Saisie des paramètres
-    ticker_input = st.text_input("Symbole ou compagnie ML", key="ml", placeholder="Ex: AAPL")
+    mode = st.radio("Mode", ["Un actif", "Liste de suivi"], horizontal=True)
+    # Niveau rapide : modèles NumPy vectorisés et Prophet sans échantillonnage des intervalles
+    tier = st.radio("Niveau", ["Complet", "Rapide"], horizontal=True)
+    fast = tier == "Rapide"
+    profile = "fast" if fast else "standard"
+    model_names = {"arima": "ARIMA", "prophet": "Prophet (rapide)" if fast else "Prophet", **FAST_MODELS}
+    if mode == "Un actif":
+        ticker_input = st.text_input("Symbole ou compagnie ML", key="ml", placeholder="Ex: AAPL")
+        if not fast:
+            arima_mode = st.selectbox("Ordre ARIMA", ["(1, 1, 1)", "Automatique (AIC)", "Automatique (BIC)"])
+    else:
+        ticker_input = None
+        watchlist_input = st.text_input("Liste de suivi (séparés par des virgules)", key="ml_watchlist", placeholder="Ex: AAPL,MSFT,GOOGL")
+        choices = ["ses", "drift", "trend", "prophet"] if fast else ["arima", "prophet"]
+        batch_models = st.multiselect("Modèles", choices, default=choices, format_func=model_names.get)
     days = st.number_input("Jours à prévoir", 1, 30, 7, step=1)
 
+    job_queue = get_job_queue()
+    pending_jobs = []
+
+    if mode == "Liste de suivi":
+        tl = list(dict.fromkeys(t.strip().upper() for t in (watchlist_input or "").split(',') if t.strip()))
+        if tl and batch_models and st.button("Lancer les prévisions"):
+            data, invalid_tickers = get_price_panel(tuple(tl), period="5y")
+            if invalid_tickers:
+                st.warning(f"Données indisponibles pour : {', '.join(invalid_tickers)}.")
+            data = data.loc[:, data.count() >= 30]
+            # Modèles rapides : un seul appel pour toute la liste, calculé sur place
+            fast_rows = []
+            for m in batch_models:
+                if m in FAST_MODELS and not data.empty:
+                    start = time.perf_counter()
+                    prediction = forecast_panel(data, days, m)
+                    seconds = time.perf_counter() - start
+                    last = data.ffill().iloc[-1]
+                    fast_rows += [{"ticker": t, "model": m, "last": last[t], "forecast": prediction.mean[t].iloc[-1],
+                                   "lower": prediction.lower[t].iloc[-1], "upper": prediction.upper[t].iloc[-1],
+                                   "seconds": seconds / len(data.columns), "error": None} for t in data.columns]
+            # Une tâche par couple (ticker, modèle) ARIMA/Prophet, exécutée en arrière-plan : un changement de widget ne l'interrompt pas
+            st.session_state["ml_batch"] = (days, [
+                job_queue.submit(forecast_one, t, data[t].dropna(), m, days, forecast_cache.root, profile)
+                for t in data.columns for m in batch_models if m not in FAST_MODELS
+            ], fast_rows)
+        batch_days, batch_jobs, fast_rows = st.session_state.get("ml_batch", (days, [], []))
+        statuses = [job_queue.status(job) for job in batch_jobs]
+        finished = sum(s["state"] not in PENDING for s in statuses)
+        if batch_jobs and finished < len(batch_jobs):
+            st.progress(finished / len(batch_jobs), text=f"Prévisions : {finished}/{len(batch_jobs)}")
+            pending_jobs += batch_jobs
+        elif batch_jobs or fast_rows:
+            for status in statuses:
+                if status["state"] != "done":
+                    st.warning(f"Une prévision n'a pas pu être calculée ({status['error'] or 'tâche interrompue'}). Relancez les prévisions.")
+            results = pd.DataFrame(fast_rows + [r for r in map(job_queue.result, batch_jobs) if r is not None])
+            days = batch_days
+            if results.empty:
+                st.warning("Aucune prévision n'a pu être calculée.")
+            else:
+                for row in results[results["error"].notna()].itertuples():
+                    st.warning(f"Erreur lors de la prévision {model_names[row.model]} pour {row.ticker} : {row.error}")
+                results = results[results["error"].isna()].drop(columns="error")
+                results["change"] = (results["forecast"] / results["last"] - 1) * 100
+                results["model"] = results["model"].map(model_names)
+                results["seconds"] *= 1000
+                results = results.rename(columns={
+                    "ticker": "Ticker", "model": "Modèle", "last": "Dernier cours ($)", "forecast": f"Prévision J+{days} ($)",
+                    "lower": "Borne basse 80% ($)", "upper": "Borne haute 80% ($)", "seconds": "Durée (ms)",
+                    "change": "Variation (%)"})
+                st.dataframe(results.style.format(precision=2), hide_index=True, use_container_width=True)
+                # Latence par modèle : temps de calcul cumulé sur la liste (hors attente dans la file)
+                latency = results.groupby("Modèle")["Durée (ms)"].agg(["count", "sum", "mean"])
+                latency.columns = ["Tickers", "Durée totale (ms)", "Durée par ticker (ms)"]
+                st.dataframe(latency.style.format(precision=1), use_container_width=True)
+
     if ticker_input:
         # Récupération des données historiques
         ticker_data = get_ticker_data(ticker_input)
@@ -662,60 +864,90 @@ elif page == "Prévisions Machine Learning":
                 # Colonnes pour organiser les prévisions
                 col1, col2 = st.columns(2)
 
-                # Prévision ARIMA
+                # Prévision ARIMA, ou modèles vectorisés au niveau rapide
                 with col1:
-                    st.subheader("Prévision ARIMA")
-                    try:
-                        model_arima = ARIMA(df["y"], order=(1, 1, 1))
-                        arima_fit = model_arima.fit()
-                        forecast_arima = arima_fit.forecast(steps=days)
-                        forecast_values = forecast_arima.values
-                        st.metric("Valeur Prédite (Dernier Jour)", f"{float(forecast_values[-1]):.2f} $")
-                    except Exception as e:
-                        st.warning(f"Erreur lors de la prévision ARIMA : {str(e)}. Essayez un autre ticker ou ajustez les paramètres.")
+                    forecast_values = None
+                    fast_forecasts = {}
+                    if fast:
+                        st.subheader("Modèles rapides")
+                        for m, name in FAST_MODELS.items():
+                            start = time.perf_counter()
+                            fast_forecasts[m] = forecast_panel(data["Close"], days, m).mean.iloc[:, 0].to_numpy()
+                            st.metric(f"{name} (Dernier Jour)", f"{float(fast_forecasts[m][-1]):.2f} $")
+                            st.caption(f"Calculé en {(time.perf_counter() - start) * 1000:.1f} ms")
+                    else:
+                        st.subheader("Prévision ARIMA")
+                    arima_order = None if fast else DEFAULT_ORDER
+                    if not fast and arima_mode != "(1, 1, 1)":
+                        # Ordre cherché une fois par ticker (en arrière-plan), puis lu dans le cache
+                        criterion = "aic" if "AIC" in arima_mode else "bic"
+                        arima_order = forecast_cache.order(ticker_data.symbol, order_config(criterion))
+                        if arima_order is None:
+                            order_job = job_queue.submit(search_order, ticker_data.symbol, data["Close"], criterion,
+                                                         cache_root=forecast_cache.root)
+                            status = job_queue.status(order_job)
+                            if status["state"] == "done":
+                                arima_order = job_queue.result(order_job)[0]
+                            elif status["state"] in PENDING:
+                                st.progress(status["done"] / (status["total"] or 1), text="Recherche de l'ordre ARIMA en cours...")
+                                pending_jobs.append(order_job)
+                            else:
+                                st.warning(f"Erreur lors de la recherche de l'ordre ARIMA : {status['error']}.")
+                    if arima_order is not None:
+                        try:
+                            # Ajustement mis en cache, complété avec les nouvelles barres au lieu d'être refait
+                            start = time.perf_counter()
+                            arima_fit = forecast_cache.arima(ticker_data.symbol, data["Close"], order=arima_order)
+                            forecast_values = np.asarray(arima_fit.forecast(steps=days))
+                            st.metric("Valeur Prédite (Dernier Jour)", f"{float(forecast_values[-1]):.2f} $")
+                            st.caption(f"Ordre (p, d, q) : {tuple(arima_order)} — calculé en {(time.perf_counter() - start) * 1000:.0f} ms")
+                        except Exception as e:
+                            st.warning(f"Erreur lors de la prévision ARIMA : {str(e)}. Essayez un autre ticker ou ajustez les paramètres.")
 
                 # Prévision Prophet
                 with col2:
-                    st.subheader("Prévision Prophet")
-                    try:
-                        m = Prophet()
-                        m.fit(df)
-                        future = m.make_future_dataframe(periods=days)
-                        forecast_prophet = m.predict(future)
-                        pred_values = forecast_prophet["yhat"].tail(days).values
+                    st.subheader(f"Prévision {model_names['prophet']}")
+                    # Ajustement lancé en arrière-plan, une fois sur l'horizon maximal : changer le nombre de jours ne refait rien
+                    forecast_prophet = None
+                    prophet_job = job_queue.submit(prophet_forecast, ticker_data.symbol, df, PROPHET_HORIZON,
+                                                   forecast_cache.root, profile)
+                    status = job_queue.status(prophet_job)
+                    if status["state"] == "done":
+                        forecast_prophet, prophet_seconds = job_queue.result(prophet_job)
+                        forecast_prophet = forecast_prophet.head(days)
+                        pred_values = forecast_prophet["yhat"].values
                         st.metric("Valeur Prédite (Dernier Jour)", f"{float(pred_values[-1]):.2f} $")
-                    except Exception as e:
-                        st.warning(f"Erreur lors de la prévision Prophet : {str(e)}. Essayez un autre ticker ou ajustez les paramètres.")
+                        st.caption(f"Calculé en {prophet_seconds * 1000:.0f} ms")
+                    elif status["state"] in PENDING:
+                        st.info("Ajustement du modèle Prophet en cours...")
+                        pending_jobs.append(prophet_job)
+                    else:
+                        st.warning(f"Erreur lors de la prévision Prophet : {status['error']}. Essayez un autre ticker ou ajustez les paramètres.")
 
                 # Graphique combiné des prévisions
                 st.subheader("Graphique des Prévisions")
                 try:
-                    historical = df.set_index("ds")["y"]
+                    # Historique réduit à la résolution du graphique ; les prévisions restent complètes
+                    historical = downsample(df.set_index("ds")["y"], CHART_POINTS)
                     forecast_dates = pd.date_range(start=df["ds"].iloc[-1] + pd.Timedelta(days=1), periods=days, freq="D")
-                    forecast_arima_df = pd.DataFrame(forecast_values, index=forecast_dates, columns=["ARIMA"])
-                    forecast_prophet_df = forecast_prophet[["ds", "yhat", "yhat_lower", "yhat_upper"]].set_index("ds")
-                    forecast_prophet_df = forecast_prophet_df.tail(days)
-
-                    fig, ax = plt.subplots(figsize=(10, 6))
-                    ax.plot(historical.index, historical.values, label="Historique", color="#1a75ff")
-                    ax.plot(forecast_arima_df.index, forecast_arima_df["ARIMA"], label="Prévision ARIMA", color="#28a745", linestyle="--")
-                    ax.plot(forecast_prophet_df.index, forecast_prophet_df["yhat"], label="Prévision Prophet", color="#ff9900", linestyle="--")
-                    ax.fill_between(
-                        forecast_prophet_df.index,
-                        forecast_prophet_df["yhat_lower"],
-                        forecast_prophet_df["yhat_upper"],
-                        color="#ff9900",
-                        alpha=0.1,
-                        label="Intervalle de Confiance (Prophet)"
-                    )
-                    ax.set_xlabel("Date")
-                    ax.set_ylabel("Prix de Clôture ($)")
-                    ax.legend()
-                    ax.grid(True)
-                    st.pyplot(fig)
+
+                    lines, band = [], None
+                    if forecast_values is not None:
+                        lines.append(("Prévision ARIMA", forecast_dates, forecast_values, "#28a745"))
+                    for (m, values), color in zip(fast_forecasts.items(), ["#28a745", "#9933cc", "#dc3545"]):
+                        lines.append((f"Prévision {FAST_MODELS[m]}", forecast_dates, values, color))
+                    if forecast_prophet is not None:
+                        forecast_prophet_df = forecast_prophet.set_index("ds")
+                        lines.append((f"Prévision {model_names['prophet']}", forecast_prophet_df.index,
+                                      forecast_prophet_df["yhat"], "#ff9900"))
+                        band = (f"Intervalle de Confiance ({model_names['prophet']})", forecast_prophet_df.index,
+                                forecast_prophet_df["yhat_lower"], forecast_prophet_df["yhat_upper"], "#ff9900")
+                    show_figure(forecast_chart, figsize=(10, 6), history=historical, lines=lines, band=band)
                 except Exception as e:
                     st.warning(f"Erreur lors de l'affichage du graphique des prévisions : {str(e)}.")
 
+    poll_jobs(pending_jobs)
+
 # --- Page: Sentiment & NLP ---
 elif page == "Sentiment & NLP":
     st.title("📰 Sentiment & NLP")
@@ -725,6 +957,7 @@ elif page == "Sentiment & NLP":
     
     if ticker_sentiment:
         ticker_data = get_ticker_data(ticker_sentiment)
+        stored_news = False
         if ticker_data is None or ticker_data.get("news") is None:
             st.info("Les actualités ne sont pas disponibles pour ce ticker via yfinance. Utilisation de données simulées.")
             news = [
@@ -734,6 +967,7 @@ elif page == "Sentiment & NLP":
             ]
         else:
             news = ticker_data["news"]
+            stored_news = bool(news)
             if not news:
                 st.info("Aucune actualité récente disponible via yfinance. Utilisation de données simulées.")
                 news = [
@@ -744,16 +978,8 @@ elif page == "Sentiment & NLP":
         
         titles = [n.get("title", "") for n in news]
         
-        sentiment_scores = []
-        for t in titles:
-            score = (t.lower().count('gain') + t.lower().count('strong') - 
-                     t.lower().count('loss') - t.lower().count('weak'))
-            if score > 0:
-                sentiment_scores.append("Positif")
-            elif score < 0:
-                sentiment_scores.append("Négatif")
-            else:
-                sentiment_scores.append("Neutre")
+        # Tous les titres sont notés en un passage ; ceux déjà vus sont lus dans le cache du moteur
+        sentiment_scores = get_sentiment_engine().label(titles)
         
         st.markdown("### Analyse des Sentiments")
         col1, col2 = st.columns(2)
@@ -762,23 +988,21 @@ elif page == "Sentiment & NLP":
             st.markdown("#### Distribution des Sentiments")
             if sentiment_scores:
                 sentiment_counts = pd.Series(sentiment_scores).value_counts()
-                fig_sent, ax = plt.subplots()
-                sns.barplot(x=sentiment_counts.index, y=sentiment_counts.values, palette=["#28a745", "#ffc107", "#dc3545"])
-                ax.set_ylabel("Nombre d'actualités")
-                st.pyplot(fig_sent)
+                show_figure(bar_chart, x=sentiment_counts.index, y=sentiment_counts.values,
+                            palette=["#28a745", "#ffc107", "#dc3545"], ylabel="Nombre d'actualités")
             else:
                 st.write("Aucune donnée pour afficher la distribution des sentiments.")
         
         with col2:
             st.markdown("#### Nuage de Mots")
-            text = " ".join(titles)
-            if text.strip():
-                wc = WordCloud(width=400, height=200, background_color='white', 
-                               colormap='RdYlGn').generate(text)
-                fig_wc, ax = plt.subplots()
-                ax.imshow(wc, interpolation='bilinear')
-                ax.axis('off')
-                st.pyplot(fig_wc)
+            # Mots des titres affichés ci-dessous ; image servie depuis le cache tant qu'ils ne changent pas
+            if stored_news:
+                frequencies = news_store.word_counts(ticker_data.symbol, DEFAULT_STOPWORDS, articles=len(news))
+            else:
+                frequencies = word_frequencies(titles)
+            if frequencies:
+                st.image(word_cloud_cache.render(frequencies, width=400, height=200, background_color="white",
+                                                 colormap="RdYlGn"), use_column_width=True)
             else:
                 st.write("Aucune actualité disponible pour générer un nuage de mots.")
         
@@ -813,37 +1037,48 @@ elif page == "Recommandations Automatiques":
     
     tickers_input = st.text_input("Symboles ou compagnies (séparés par des virgules)", key="reco", placeholder="Ex: AAPL,MSFT,GOOGL")
     sort_by = st.selectbox("Trier par", ["Score", "P/E", "Croissance"], index=0)
+    sort_columns = {"Score": "score", "P/E": "pe", "Croissance": "growth"}
+    with st.expander("⚙️ Règles de sélection"):
+        # Règles évaluées sur toutes les lignes du tableau à la fois ; la première vérifiée donne le score
+        rules_text = st.text_area("Règles (une par ligne, « condition : score »)", format_rules(DEFAULT_RULES),
+                                  help="Colonnes : pe, pb, roe, roa, growth, debt_to_equity, current_ratio, quick_ratio, "
+                                       "gross_margin, net_margin, dividend_yield, market_cap, price.")
+        where = st.text_input("Filtre", placeholder="Ex: roe > 0.15 and debt_to_equity < 100")
+        top_k = st.number_input("Nombre de recommandations", 1, 500, 30)
+        local_universe = st.checkbox("Cribler toute la base locale de fondamentaux",
+                                     help="Tous les tickers déjà consultés, sans nouvel appel réseau.")
     
-    if tickers_input:
-        tl = [t.strip().upper() for t in tickers_input.split(',')]
-        reco = {}
-        for t in tl:
-            ticker_data = get_ticker_data(t)
-            if ticker_data and ticker_data.get("info"):
-                info = ticker_data["info"]
-                pe = info.get("trailingPE", "N/A")
-                gr = info.get("earningsGrowth", "N/A")
-                score = 0
-                if pe != "N/A" and gr != "N/A":
-                    score = 5 if pe < 20 and gr > 0 else (1 if pe > 30 else 3)
-                reco[t] = {'P/E': pe, 'Croissance': gr, 'Score': score}
-            else:
-                st.warning(f"Impossible de récupérer les données pour {t}. Essayez un autre ticker.")
+    if tickers_input or local_universe:
+        tl = list(dict.fromkeys(t.strip().upper() for t in tickers_input.split(',') if t.strip()))
+        table = fundamentals_store.snapshot(tl, price_provider)
+        missing = [t for t in tl if t not in table.index]
+        if missing:
+            st.warning(f"Impossible de récupérer les données pour {', '.join(missing)}. Essayez d'autres tickers.")
+        try:
+            if local_universe:
+                # Toute la base locale, sans téléchargement ; filtre résolu par les index triés
+                table = fundamentals_store.table()
+                if where.strip():
+                    table = table.loc[fundamentals_store.select(where)]
+            elif where.strip():
+                table = table.loc[[t for t in fundamentals_store.select(where) if t in table.index]]
+            ranked = screen(table, parse_rules(rules_text), sort_by=sort_columns[sort_by], k=int(top_k))
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
         
-        if reco:
-            sorted_reco = sorted(reco.items(), key=lambda x: x[1][sort_by] if x[1][sort_by] != 'N/A' else -float('inf'), reverse=True)
-            
+        if not ranked.empty:
             st.markdown("### Recommandations")
             cols = st.columns(3)
-            for i, (t, row) in enumerate(sorted_reco):
+            for i, (t, row) in enumerate(ranked.iterrows()):
                 with cols[i % 3]:
                     st.markdown(
                         f"""
                         <div style='background-color:#f8f9fa;padding:15px;border-radius:8px;margin:10px 0;'>
                             <h4>{t}</h4>
-                            <p><strong>Score:</strong> {row['Score']}/5</p>
-                            <p><strong>P/E:</strong> {row['P/E'] if row['P/E'] != 'N/A' else 'N/A'}</p>
-                            <p><strong>Croissance:</strong> {row['Croissance'] if row['Croissance'] != 'N/A' else 'N/A'}</p>
+                            <p><strong>Score:</strong> {format_value(row['score'])}/5</p>
+                            <p><strong>P/E:</strong> {format_value(row['pe'])}</p>
+                            <p><strong>Croissance:</strong> {format_value(row['growth'])}</p>
                             <button style='background-color:#1a75ff;color:white;border-radius:5px;padding:5px 10px;border:none;'>Acheter</button>
                         </div>
                         """,
@@ -851,11 +1086,8 @@ elif page == "Recommandations Automatiques":
                     )
             
             st.markdown("#### Comparaison des Scores")
-            df_reco = pd.DataFrame(reco).T
-            fig_reco, ax = plt.subplots()
-            sns.barplot(x=df_reco.index, y=df_reco['Score'], ax=ax, palette="viridis")
-            ax.set_ylabel("Score de Recommandation")
-            st.pyplot(fig_reco)
+            show_figure(bar_chart, x=ranked.index, y=ranked['score'], palette="viridis",
+                        ylabel="Score de Recommandation")
             
         else:
             st.write("Aucune donnée disponible pour les recommandations.")
@@ -872,26 +1104,28 @@ elif page == "Gestion Avancée des Risques":
             period = st.selectbox("Période des données", ["1mo", "3mo", "6mo", "1y"], index=3)
         with col2:
             confidence_level = st.slider("Niveau de confiance VaR/CVaR (%)", 90, 99, 95)
+            mc_sims = st.selectbox("Trajectoires Monte Carlo", [10000, 100000, 1000000], index=1)
+            tails = st.selectbox("Queues des tirages Monte Carlo", list(TAILS), index=1,
+                                 help="Des tirages Student-t donnent des pertes extrêmes plus fréquentes que la loi normale de la méthode paramétrique.")
+            dof = TAILS[tails]
+            seed = st.number_input("Graine aléatoire", 0, 2 ** 32 - 1, DEFAULT_SEED, key="risk_seed",
+                                   help="Une même graine redonne les mêmes simulations.")
+            rolling_window = st.selectbox("Fenêtre glissante (jours)", [21, 63, 126], index=1)
+        weights_input = st.text_input("Poids du portefeuille en % (séparés par des virgules, vide = équipondéré)", key="risk_weights", placeholder="Ex: 50,30,20")
     
+    job_queue = get_job_queue()
+    pending_jobs = []
+
     if tickers_input:
         tl = [t.strip().upper() for t in tickers_input.split(',')]
         if not tl:
             st.warning("Veuillez saisir au moins un ticker valide.")
         else:
-            invalid_tickers = []
-            data_dict = {}
-            for t in tl:
-                data = get_history(t, period=period)
-                if data is None:
-                    invalid_tickers.append(t)
-                else:
-                    data_dict[t] = data['Close']
+            data, invalid_tickers = get_price_panel(tuple(tl), period=period)
             
             if invalid_tickers:
                 st.error(f"Impossible de récupérer les données pour les tickers suivants : {', '.join(invalid_tickers)}. Essayez d'autres tickers (par exemple, AAPL, MSFT).")
             else:
-                data = pd.DataFrame(data_dict)
-                
                 if data.empty:
                     st.error(f"Aucune donnée disponible pour les tickers {', '.join(tl)} sur la période {period}. Vérifiez les tickers ou essayez une autre période.")
                 else:
@@ -926,21 +1160,92 @@ elif page == "Gestion Avancée des Risques":
                         
                         with col2:
                             st.markdown("#### Volatilité Annualisée")
-                            fig_gauge, ax = plt.subplots()
-                            sns.barplot(x=vol, y=tl, ax=ax, palette="Blues_d")
-                            ax.set_xlabel("Volatilité (%)")
-                            st.pyplot(fig_gauge)
+                            show_figure(bar_chart, x=vol, y=tl, palette="Blues_d", xlabel="Volatilité (%)")
                         
+                        st.markdown("#### VaR et CVaR du Portefeuille")
+                        if weights_input.strip():
+                            try:
+                                weights = np.array([float(w) for w in weights_input.split(',')])
+                            except ValueError:
+                                weights = None
+                            if weights is None or len(weights) != rets.shape[1] or (weights < 0).any() or weights.sum() <= 0:
+                                st.warning(f"Saisissez {rets.shape[1]} poids positifs : portefeuille équipondéré utilisé.")
+                                weights = np.ones(rets.shape[1])
+                        else:
+                            weights = np.ones(rets.shape[1])
+                        weights = weights / weights.sum()
+                        if mc_sims > 100000:
+                            # Simulation longue : calculée en arrière-plan et partagée entre les sessions
+                            risk_job = job_queue.submit(portfolio_risk, rets, weights, alpha, (1, 5, 10), mc_sims, dof=dof,
+                                                        seed=int(seed))
+                            status = job_queue.status(risk_job)
+                            portfolio_estimates = job_queue.result(risk_job) if status["state"] == "done" else None
+                            if status["state"] in PENDING:
+                                st.progress(status["done"] / (status["total"] or 3), text="Simulation Monte Carlo en cours...")
+                                pending_jobs.append(risk_job)
+                            elif portfolio_estimates is None:
+                                st.warning(f"Erreur lors de la simulation Monte Carlo : {status['error'] or 'tâche interrompue'}.")
+                        else:
+                            portfolio_estimates = portfolio_risk(rets, weights, alpha, horizons=(1, 5, 10), sims=mc_sims, dof=dof,
+                                                                 seed=int(seed))
+                        if portfolio_estimates is not None:
+                            port_var, port_cvar = portfolio_estimates
+                            horizons = {1: '1 Jour', 5: '5 Jours', 10: '10 Jours'}
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                st.table((port_var * 100).rename(columns=horizons).style.format("{:.2f}%").set_caption("VaR du portefeuille (%)"))
+                            with col2:
+                                st.table((port_cvar * 100).rename(columns=horizons).style.format("{:.2f}%").set_caption("CVaR du portefeuille (%)"))
+
+                        st.markdown("#### Métriques Glissantes")
+                        # Accumulateurs nourris avec tout l'historique stocké : seule la fenêtre affichée dépend de la période
+                        full_data, _ = get_price_panel(tuple(tl), period="5y")
+                        rolling = {t: slice_period(rolling_store.risk(t, full_data[t], rolling_window, alpha), period) for t in full_data.columns}
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.caption(f"Volatilité annualisée glissante ({rolling_window} j, %)")
+                            line_chart(pd.DataFrame({t: r["volatility"] * 100 for t, r in rolling.items()}))
+                            st.caption("Drawdown depuis le plus haut de la fenêtre (%)")
+                            line_chart(pd.DataFrame({t: r["drawdown"] * 100 for t, r in rolling.items()}))
+                        with col2:
+                            st.caption(f"VaR historique glissante 1 jour ({confidence_level}%, %)")
+                            line_chart(pd.DataFrame({t: r["var"] * 100 for t, r in rolling.items()}))
+                            st.caption("Drawdown maximal sur la fenêtre (%)")
+                            line_chart(pd.DataFrame({t: r["max_drawdown"] * 100 for t, r in rolling.items()}))
+                        if full_data.shape[1] > 1:
+                            cols = list(full_data.columns)
+                            corr = pd.DataFrame({
+                                f"{a} / {b}": rolling_store.correlation(a, b, full_data[a], full_data[b], rolling_window)
+                                for i, a in enumerate(cols) for b in cols[i + 1:]
+                            })
+                            st.caption(f"Corrélation glissante des rendements ({rolling_window} j)")
+                            line_chart(slice_period(corr, period))
+
                         st.markdown("#### Simulateur de Scénarios")
-                        scenario = st.selectbox("Choisir un scénario", ["Chute de marché (-10%)", "Hausse de marché (+10%)", "Volatilité élevée"])
-                        if scenario == "Chute de marché (-10%)":
-                            sim_rets = rets * 1.1
-                        elif scenario == "Hausse de marché (+10%)":
-                            sim_rets = rets * 0.9
+                        # Toute la bibliothèque est évaluée d'un coup : changer de scénario ne fait que lire le tableau
+                        custom = st.text_area("Scénarios personnalisés (un par ligne, « nom : choc % par actif »)", key="stress_custom",
+                                              placeholder=f"Ex: Choc sectoriel : {', '.join(['-15'] * rets.shape[1])}",
+                                              help="Une seule valeur s'applique à tous les actifs.")
+                        try:
+                            stress = get_stress_test(tuple(tl), period, tuple(weights), alpha, custom, int(seed))
+                        except ValueError as e:
+                            st.error(str(e))
+                            stress = get_stress_test(tuple(tl), period, tuple(weights), alpha, seed=int(seed))
+                        kinds = st.multiselect("Types de scénarios", list(KINDS.values()), default=list(KINDS.values()))
+                        stress = stress[stress["kind"].isin(kinds)]
+                        if stress.empty:
+                            st.info("Aucun scénario disponible pour ces critères.")
                         else:
-                            sim_rets = rets * np.random.normal(1, 0.02, len(rets))
-                        sim_var = sim_rets.quantile(alpha) * 100
-                        st.metric("VaR simulée (1 Jour)", f"{sim_var.mean():.2f}%")
+                            summary = stress.xs(PORTFOLIO, level="asset").sort_values("return")
+                            st.caption(f"Portefeuille sous {len(summary)} scénarios, du plus défavorable au plus favorable")
+                            st.dataframe((summary[list(METRICS)] * 100).rename(columns=METRICS).assign(Type=summary["kind"])
+                                         .style.format("{:.2f}%", subset=list(METRICS.values())))
+                            scenario = st.selectbox("Détail d'un scénario", list(summary.index))
+                            detail = stress.loc[scenario]
+                            st.metric("VaR simulée du portefeuille (1 Jour)", f"{detail.loc[PORTFOLIO, 'var'] * 100:.2f}%")
+                            st.table((detail[list(METRICS)] * 100).rename(columns=METRICS).style.format("{:.2f}%"))
+
+    poll_jobs(pending_jobs)
 
 # --- Page: Optimisation de Portefeuille ---
 elif page == "Optimisation de Portefeuille":
@@ -951,27 +1256,27 @@ elif page == "Optimisation de Portefeuille":
         col1, col2 = st.columns(2)
         with col1:
             period = st.selectbox("Période des données", ["1y", "2y", "5y"], index=0)
+            method = st.radio("Méthode", ["Simulation Monte Carlo", "Optimisation exacte"], horizontal=True)
         with col2:
-            sims = st.slider("Nombre de simulations", 1000, 10000, 5000, step=1000)
+            if method == "Simulation Monte Carlo":
+                sims = st.slider("Nombre de simulations", 1000, 10000, 5000, step=1000)
+                seed = st.number_input("Graine aléatoire", 0, 2 ** 32 - 1, DEFAULT_SEED, key="opt_seed",
+                                       help="Une même graine redonne les mêmes portefeuilles simulés.")
+            else:
+                max_weight = st.slider("Poids maximal par actif (%)", 5, 100, 100, step=5)
+                use_sector_caps = st.checkbox("Plafonner le poids par secteur")
+                sector_cap = st.slider("Poids maximal par secteur (%)", 10, 100, 50, step=5, disabled=not use_sector_caps)
 
     if tickers_input:
         tl = [t.strip().upper() for t in tickers_input.split(',')]
         if len(tl) == 0:
             st.warning("Veuillez saisir au moins un ticker valide.")
         else:
-            invalid_tickers = []
-            data_dict = {}
-            for t in tl:
-                data = get_history(t, period=period)
-                if data is None:
-                    invalid_tickers.append(t)
-                else:
-                    data_dict[t] = data['Close']
+            data, invalid_tickers = get_price_panel(tuple(tl), period=period)
             
             if invalid_tickers:
                 st.error(f"Impossible de récupérer les données pour les tickers suivants : {', '.join(invalid_tickers)}. Essayez d'autres tickers (par exemple, AAPL, MSFT).")
             else:
-                data = pd.DataFrame(data_dict)
                 if data.empty:
                     st.error(f"Aucune donnée disponible pour les tickers {', '.join(tl)} sur la période sélectionnée ({period}). Vérifiez les tickers ou essayez une autre période.")
                 else:
@@ -979,44 +1284,47 @@ elif page == "Optimisation de Portefeuille":
                     if rets.empty or len(rets) < 2:
                         st.error(f"Données insuffisantes pour effectuer l'optimisation. Assurez-vous que les tickers {', '.join(tl)} ont suffisamment de données sur la période {period}.")
                     else:
-                        n = len(tl)
-                        results = np.zeros((3, sims))
-                        weights_list = []
-                        for i in range(sims):
-                            w = np.random.dirichlet(np.ones(n))
-                            weights_list.append(w)
-                            ret = np.sum(rets.mean() * w) * 252
-                            vol = np.sqrt(np.dot(w.T, np.dot(rets.cov() * 252, w)))
-                            results[:, i] = [vol, ret, ret / vol]
-                        idx = np.argmax(results[2])
-                        w_opt = weights_list[idx]
+                        mu, cov = annualized_moments(rets[tl])
+                        if method == "Simulation Monte Carlo":
+                            frontier = frontier_simulation(tuple(tl), period, rets, sims, int(seed))
+                            results = np.vstack([frontier.vols, frontier.rets, frontier.sharpes])
+                            opt_point = results[:, frontier.best]
+                            w_opt = frontier.best_weights
+                        else:
+                            try:
+                                sectors = sector_caps = None
+                                if use_sector_caps:
+                                    infos = get_infos(tuple(tl), fields=["sector"])
+                                    sectors = [infos.get(t, {}).get("sector", "Inconnu") for t in tl]
+                                    sector_caps = {s: sector_cap / 100 for s in sectors}
+                                constraints = dict(max_weight=max_weight / 100, sectors=sectors, sector_caps=sector_caps)
+                                best = max_sharpe(mu, cov, **constraints)
+                                curve = efficient_frontier(mu, cov, points=40, **constraints)
+                            except ValueError as e:
+                                st.error(f"Optimisation impossible : {str(e)}")
+                                st.stop()
+                            results = np.array([[p.vol for p in curve], [p.ret for p in curve], [p.sharpe for p in curve]])
+                            opt_point = np.array([best.vol, best.ret, best.sharpe])
+                            w_opt = best.weights
 
                         st.markdown("### Résultats de l'Optimisation")
                         col1, col2 = st.columns([2, 1])
 
                         with col1:
                             st.markdown("#### Frontière Efficiente")
-                            fig, ax = plt.subplots()
-                            scatter = ax.scatter(results[0] * 100, results[1] * 100, c=results[2], cmap='viridis')
-                            ax.scatter(results[0, idx] * 100, results[1, idx] * 100, c='red', s=100, label='Portefeuille Optimal')
-                            ax.set_xlabel("Volatilité Annualisée (%)")
-                            ax.set_ylabel("Rendement Annualisé (%)")
-                            ax.legend()
-                            plt.colorbar(scatter, label='Ratio Sharpe')
-                            st.pyplot(fig)
+                            exact = method == "Optimisation exacte"
+                            show_figure(frontier_chart, vols=results[0] * 100, rets=results[1] * 100, sharpes=results[2],
+                                        optimum=(opt_point[0] * 100, opt_point[1] * 100),
+                                        min_variance=(results[0, 0] * 100, results[1, 0] * 100) if exact else None,
+                                        line=exact, labels=True)
 
                         with col2:
                             st.markdown("#### Répartition des Poids Optimaux")
-                            fig_pie, ax_pie = plt.subplots()
-                            ax_pie.pie(w_opt, labels=tl, autopct='%1.1f%%', startangle=90, colors=sns.color_palette("muted"))
-                            ax_pie.axis('equal')
-                            st.pyplot(fig_pie)
+                            show_figure(pie_chart, weights=w_opt, labels=tl)
 
                         st.markdown("#### Métriques Clés")
                         col_metrics = st.columns(3)
-                        opt_return = np.sum(rets.mean() * w_opt) * 252 * 100
-                        opt_vol = results[0, idx] * 100
-                        sharpe_ratio = results[2, idx]
+                        opt_vol, opt_return, sharpe_ratio = opt_point[0] * 100, opt_point[1] * 100, opt_point[2]
                         with col_metrics[0]:
                             st.metric("Rendement Annualisé", f"{opt_return:.2f}%")
                         with col_metrics[1]:
@@ -1051,14 +1359,9 @@ elif page == "Dashboard Personnalisé":
         tl = [t.strip().upper() for t in tickers_input.split(',')]
         for t in tl:
             ticker_data = get_ticker_data(t)
-            if ticker_data is None:
-                st.error(f"Impossible de récupérer les données pour {t}. Essayez un autre ticker (par exemple, AAPL ou MSFT).")
-                continue
-                
             st.markdown(f"### {t}")
-            data = ticker_data.get("historical_data")
-            info = ticker_data.get("info")
-            news = ticker_data.get("news")
+            # Seuls les composants des widgets affichés sont téléchargés
+            data = ticker_data.get("historical_data") if show_price or show_chart else None
             
             if show_price:
                 if data is not None and not data.empty and "Close" in data.columns:
@@ -1068,8 +1371,10 @@ elif page == "Dashboard Personnalisé":
                     st.write(f"Aucune donnée disponible pour afficher le prix actuel de {t}.")
             
             if show_chart:
-                if data is not None and not data.empty and "Close" in data.columns:
-                    st.line_chart(data["Close"])
+                # Série réduite mise en cache par ticker : N tickers ne renvoient que N x CHART_POINTS points
+                chart_data = get_chart_history(t) if data is not None else None
+                if chart_data is not None and not chart_data.empty:
+                    st.line_chart(chart_data)
                 else:
                     st.write(f"Aucune donnée disponible pour afficher le graphique historique de {t}.")
             
@@ -1083,6 +1388,7 @@ elif page == "Dashboard Personnalisé":
             
             if show_news:
                 st.subheader("Actualités Récentes")
+                news = ticker_data.get("news")
                 if news:
                     for n in news[:5]:
                         title = n.get("title", "N/A")
@@ -1090,6 +1396,23 @@ elif page == "Dashboard Personnalisé":
                 else:
                     st.write(f"Aucune actualité récente disponible pour {t}.")
 
+        if show_news:
+            # Recherche locale dans les actualités stockées : aucun appel réseau une fois la liste ingérée
+            st.markdown("### Recherche dans les Actualités")
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                news_query = st.text_input("Mots recherchés", key="dash_news_query", placeholder="Ex: résultats, partnership")
+            with col2:
+                news_days = st.number_input("Derniers jours", 1, 90, 7, key="dash_news_days")
+            if news_query:
+                matches = news_store.search(news_query, tickers=tl, since=pd.Timedelta(days=news_days))
+                if matches:
+                    for n in matches:
+                        published = pd.Timestamp(n["providerPublishTime"], unit="s").strftime("%d/%m/%Y %H:%M")
+                        st.write(f"- {published} — {n['title']} ({', '.join(n['relatedTickers'])})")
+                else:
+                    st.write("Aucune actualité ne correspond à cette recherche.")
+
 # --- Page: Suivi Temps Réel du Portefeuille ---
 elif page == "Suivi Temps Réel du Portefeuille":
     st.title("⏱️ Suivi Temps Réel du Portefeuille")
@@ -1103,25 +1426,25 @@ elif page == "Suivi Temps Réel du Portefeuille":
             st.error("Vous avez saisi plus de 20 titres. Veuillez limiter à 20 titres maximum.")
         else:
             portfolio_data = {}
+            panel, missing = get_price_panel(tuple(tl))
             for t in tl:
-                ticker_data = get_ticker_data(t)
-                if ticker_data and ticker_data.get("historical_data") is not None:
-                    data = ticker_data["historical_data"]
-                    if not data.empty and "Close" in data.columns:
-                        price = data["Close"].iloc[-1]
-                        # Calculer la variation sur le dernier jour (si disponible)
-                        if len(data["Close"]) >= 2:
-                            prev_price = data["Close"].iloc[-2]
-                            change = price - prev_price
-                            change_pct = (change / prev_price) * 100
-                        else:
-                            change = "N/A"
-                            change_pct = "N/A"
-                        portfolio_data[t] = {"price": price, "change": change, "change_pct": change_pct}
+                if t in missing:
+                    st.warning(f"Impossible de récupérer les données pour {t}.")
+                    continue
+                close = panel[t].dropna()
+                if not close.empty:
+                    price = close.iloc[-1]
+                    # Calculer la variation sur le dernier jour (si disponible)
+                    if len(close) >= 2:
+                        prev_price = close.iloc[-2]
+                        change = price - prev_price
+                        change_pct = (change / prev_price) * 100
                     else:
-                        st.warning(f"Aucune donnée disponible pour {t}.")
+                        change = "N/A"
+                        change_pct = "N/A"
+                    portfolio_data[t] = {"price": price, "change": change, "change_pct": change_pct}
                 else:
-                    st.warning(f"Impossible de récupérer les données pour {t}.")
+                    st.warning(f"Aucune donnée disponible pour {t}.")
             
             if portfolio_data:
                 st.subheader("Valeur Actuelle du Portefeuille")
@@ -1146,23 +1469,30 @@ elif page == "Export & Reporting":
     if tickers_input:
         tl = [t.strip().upper() for t in tickers_input.split(',')]
         report_data = []
+        panel, missing = get_price_panel(tuple(tl))
+        infos = get_infos(tuple(tl))
+        # Toute la liste valorisée en un seul calcul vectorisé
+        valuations = get_valuations(tuple(tl))
         for t in tl:
-            ticker_data = get_ticker_data(t)
-            if ticker_data and ticker_data.get("historical_data") is not None:
-                data = ticker_data["historical_data"]
-                ratios = get_ratios(t)
-                if data is not None and not data.empty and "Close" in data.columns:
-                    latest_price = data["Close"].iloc[-1]
-                    report_data.append({
-                        "Ticker": t,
-                        "Prix Actuel ($)": latest_price,
-                        "P/E Ratio": ratios.get("PER", "N/A") if ratios else "N/A",
-                        "Volatilité Annualisée (%)": (data["Close"].pct_change().std() * np.sqrt(252) * 100) if len(data["Close"]) > 1 else "N/A"
-                    })
-                else:
-                    st.warning(f"Aucune donnée historique disponible pour {t}.")
-            else:
+            if t in missing:
                 st.warning(f"Impossible de récupérer les données pour {t}.")
+                continue
+            close = panel[t].dropna()
+            ratios = ratios_from_info(infos[t]) if t in infos else None
+            if not close.empty:
+                latest_price = close.iloc[-1]
+                wacc_value = valuations["wacc"].get(t, np.nan)
+                dcf_value = valuations["dcf"].get(t, np.nan)
+                report_data.append({
+                    "Ticker": t,
+                    "Prix Actuel ($)": latest_price,
+                    "P/E Ratio": ratios.get("PER", "N/A") if ratios else "N/A",
+                    "WACC (%)": wacc_value if np.isfinite(wacc_value) else "Insuffisant",
+                    "DCF (M$)": dcf_value if np.isfinite(dcf_value) else "Insuffisant",
+                    "Volatilité Annualisée (%)": (close.pct_change().std() * np.sqrt(252) * 100) if len(close) > 1 else "N/A"
+                })
+            else:
+                st.warning(f"Aucune donnée historique disponible pour {t}.")
         
         if report_data:
             df_report = pd.DataFrame(report_data)
@@ -0,0 +1,8 @@
+"""Calculation and storage engines behind the Argentis Investment app."""
+import os
+from pathlib import Path
+
+# Répertoire des données persistantes (prix, modèles, actualités...)
+DATA_DIR = Path(os.environ.get("ARGENTIS_DATA_DIR", Path(__file__).resolve().parent.parent / ".argentis_data"))
+# Largeur des intervalles de prévision : celle de Prophet par défaut, reprise par ARIMA et les modèles rapides
+INTERVAL_WIDTH = 0.8
@@ -0,0 +1,146 @@
+"""Backtests of many portfolios at once over an aligned price panel.
+
+Each portfolio has target weights and a rebalancing policy: never, on the
+first trading day of each month or quarter, or whenever an asset's weight
+drifts from its target by more than a threshold. Between two rebalancings
+the holdings are fixed, so a portfolio's value is its target weights times
+the assets' growth since the last rebalancing. All portfolios advance
+together through windows of days evaluated as one ``(portfolio, day, asset)``
+array; the loop runs once per window or rebalancing, never once per day.
+A rebalancing pays ``cost`` times the traded fraction of the portfolio.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .frontier import TRADING_DAYS
+
+SCHEDULES = {
+    "none": "Aucun",
+    "monthly": "Mensuel",
+    "quarterly": "Trimestriel",
+    "threshold": "Seuil de dérive",
+}
+
+METRICS = {
+    "total_return": "Rendement total (%)",
+    "cagr": "Rendement annualisé (%)",
+    "volatility": "Volatilité annualisée (%)",
+    "sharpe": "Ratio Sharpe",
+    "max_drawdown": "Drawdown max (%)",
+    "turnover": "Rotation cumulée (%)",
+    "rebalances": "Rééquilibrages",
+}
+
+# index : dates du panel, values : tableau (portefeuille, jour) des valeurs (1 au départ),
+# metrics : une ligne par portefeuille, colonnes de METRICS
+Backtest = namedtuple("Backtest", "index values metrics")
+
+
+def rebalance_calendar(index, schedule):
+    """Days of ``index`` on which a calendar ``schedule`` rebalances (never the first day)."""
+    flags = np.zeros(len(index), dtype=bool)
+    if schedule in ("monthly", "quarterly") and len(index) > 1:
+        index = pd.DatetimeIndex(index)
+        period = index.month if schedule == "monthly" else index.quarter
+        flags[1:] = (np.asarray(period)[1:] != np.asarray(period)[:-1]) | (index.year[1:] != index.year[:-1])
+    elif schedule not in SCHEDULES:
+        raise ValueError(f"Rééquilibrage inconnu : {schedule}")
+    return flags
+
+
+def drawdowns(values):
+    """Drawdown of every value from the running peak of its row."""
+    return values / np.maximum.accumulate(values, axis=-1) - 1
+
+
+def backtest(prices, weights, schedules="none", thresholds=0.05, cost=0.0, risk_free=0.0, window=21,
+             memory_budget=64 * 2 ** 20):
+    """Simulate every row of ``weights`` through ``prices`` with its rebalancing policy.
+
+    ``prices`` is a panel without missing values (one column per asset,
+    in the order of the weights). ``schedules``, ``thresholds`` (absolute
+    drift, used by the "threshold" schedule) and ``cost`` (fraction of the
+    traded amount) are given once or per portfolio. Days are evaluated by
+    windows of at most ``window`` days (fewer if the ``(portfolio, day,
+    asset)`` arrays would exceed ``memory_budget`` bytes): a portfolio that
+    rebalances inside a window resumes the next one from that day.
+    """
+    p = prices.to_numpy(dtype=float)
+    w = np.atleast_2d(np.asarray(weights, dtype=float))
+    w = w / w.sum(axis=1, keepdims=True)
+    n_days, n_assets = p.shape
+    k = len(w)
+    if n_days < 2 or w.shape[1] != n_assets:
+        raise ValueError("Il faut au moins deux jours de prix et un poids par actif.")
+    schedules = np.broadcast_to(np.asarray(schedules, dtype=object), k)
+    names = list(dict.fromkeys(schedules))
+    calendars = np.stack([rebalance_calendar(prices.index, s) for s in names])
+    calendar_of = np.array([names.index(s) for s in schedules])
+    thresholds = np.where(schedules == "threshold", np.broadcast_to(np.asarray(thresholds, dtype=float), k), np.inf)
+    cost = np.broadcast_to(np.asarray(cost, dtype=float), k)
+
+    values = np.empty((k, n_days))
+    values[:, 0] = 1.0
+    shares = w / p[0]                       # parts détenues depuis le dernier rééquilibrage
+    cursor = np.ones(k, dtype=np.int64)     # premier jour non évalué
+    turnover = np.zeros(k)
+    rebalances = np.zeros(k, dtype=np.int64)
+    # Trois tableaux (portefeuilles, fenêtre, actifs) vivent en même temps
+    window = max(1, min(window, int(memory_budget // (3 * k * n_assets * 8))))
+    steps = np.arange(window)
+
+    active = np.arange(k)
+    while len(active):
+        days = np.minimum(cursor[active, None] + steps, n_days - 1)
+        if (cursor[active] == cursor[active[0]]).all():
+            # Portefeuilles synchrones (calendrier commun) : une seule fenêtre de prix (jours, actifs) partagée
+            window_prices = p[days[0]]
+            total = shares[active] @ window_prices.T
+        else:
+            window_prices = p[days]
+            total = (window_prices @ shares[active, :, None])[..., 0]
+        due = calendars[calendar_of[active, None], days]
+        drifting = np.isfinite(thresholds[active])
+        if drifting.any():
+            # |poids dérivé - cible| > seuil, sans division : |parts x prix - cible x valeur| > seuil x valeur
+            rows = active[drifting]
+            held = shares[rows, None, :] * (window_prices[drifting] if window_prices.ndim == 3 else window_prices)
+            scaled = total[drifting, :, None]
+            due[drifting] |= (np.abs(held - w[rows, None, :] * scaled) > thresholds[rows, None, None] * scaled).any(axis=2)
+        due &= cursor[active, None] + steps < n_days
+        hit = due.any(axis=1)
+        first = due.argmax(axis=1)
+        # Toute la fenêtre est écrite ; les jours après un rééquilibrage seront réécrits au tour suivant
+        values.ravel()[active[:, None] * n_days + days] = total
+
+        if hit.any():
+            j = active[hit]
+            day = days[hit, first[hit]]
+            held = shares[j] * p[day]
+            value = held.sum(axis=1)
+            traded = np.abs(w[j] - held / value[:, None]).sum(axis=1)
+            values[j, day] = value * (1 - cost[j] * traded)
+            shares[j] = w[j] * values[j, day][:, None] / p[day]
+            turnover[j] += traded
+            rebalances[j] += 1
+        cursor[active] += np.where(hit, first + 1, window)
+        active = active[cursor[active] < n_days]
+
+    rets = values[:, 1:] / values[:, :-1] - 1
+    years = (n_days - 1) / TRADING_DAYS
+    volatility = rets.std(axis=1, ddof=1) * np.sqrt(TRADING_DAYS) if n_days > 2 else np.full(k, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = (rets.mean(axis=1) * TRADING_DAYS - risk_free) / volatility
+    metrics = pd.DataFrame({
+        "total_return": values[:, -1] - 1,
+        "cagr": values[:, -1] ** (1 / years) - 1,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "max_drawdown": drawdowns(values).min(axis=1),
+        "turnover": turnover,
+        "rebalances": rebalances,
+    })
+    metrics.insert(0, "schedule", [SCHEDULES[s] for s in schedules])
+    return Backtest(prices.index, values, metrics)
@@ -0,0 +1,85 @@
+"""Bounded on-disk cache shared by the model, chart, word cloud and simulation caches.
+
+Each entry is one file ``<root>/<name>`` written atomically. At most
+``max_entries`` files with the cache's suffixes are kept; reading an entry
+refreshes its modification time, which is the recency used for eviction, so
+the directory behaves as an LRU shared by every process that uses it. The
+caches built on it only choose the entry names and how values are turned
+into bytes (``dumps``) and back (``loads``).
+"""
+import os
+import pickle
+import threading
+from pathlib import Path
+
+
+def _identity(data):
+    return data
+
+
+def pickle_dumps(value):
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class DiskCache:
+    """LRU directory of entries serialized by ``dumps`` and read back by ``loads`` (raw bytes by default)."""
+
+    def __init__(self, root, max_entries, suffixes=(".pkl",), dumps=_identity, loads=_identity):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.suffixes = tuple(suffixes)
+        self.dumps = dumps
+        self.loads = loads
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return self.root / name
+
+    def get(self, name):
+        """Value stored under ``name``, or None if it is missing or unreadable."""
+        path = self.path(name)
+        try:
+            value = self.loads(path.read_bytes())
+            os.utime(path)
+        except Exception:
+            return None
+        return value
+
+    def put(self, name, value):
+        """Store ``value`` under ``name``, then evict the least recently used entries."""
+        data = self.dumps(value)
+        path = self.path(name)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._evict()
+
+    def get_or_create(self, name, create):
+        """Value stored under ``name``, computed by ``create()`` and stored if not cached."""
+        value = self.get(name)
+        if value is None:
+            value = create()
+            self.put(name, value)
+        return value
+
+    def names(self, pattern="*"):
+        """Sorted names of the entries matching a glob ``pattern``."""
+        return sorted(p.name for p in self.root.glob(pattern) if p.suffix in self.suffixes)
+
+    def delete(self, name):
+        self.path(name).unlink(missing_ok=True)
+
+    def _evict(self):
+        entries = []
+        for p in self.root.iterdir():
+            if p.suffix not in self.suffixes:
+                continue
+            try:
+                entries.append((p.stat().st_mtime, p))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        for _, p in entries[:max(0, len(entries) - self.max_entries)]:
+            p.unlink(missing_ok=True)
@@ -0,0 +1,111 @@
+"""Reduce long series to the number of points a chart can actually show.
+
+Two decimations are available: Largest-Triangle-Three-Buckets (LTTB), which
+keeps the points that shape the curve, and min-max bucketing, which keeps
+the lowest and highest point of every bucket. Both keep the first and last
+points and the global minimum and maximum, unlike regular sampling, and
+never return more than the requested number of points.
+"""
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x, y, points, keep=()):
+    """Positions of the ``points`` values kept by LTTB (all positions if there are fewer).
+
+    A bucket containing a position of ``keep`` keeps it instead of its point
+    of largest triangle.
+    """
+    n = len(y)
+    if points >= n or points < 3:
+        return np.arange(n)
+    # points - 2 seaux entre le premier et le dernier point, chacun d'au moins une valeur
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    keep = np.sort(np.asarray(keep, dtype=np.int64))
+    a = 0
+    for i in range(points - 2):
+        start, stop = edges[i], edges[i + 1]
+        forced = np.searchsorted(keep, start)
+        if forced < len(keep) and keep[forced] < stop:
+            a = selected[i + 1] = keep[forced]
+            continue
+        if i == points - 3:
+            next_x, next_y = x[n - 1], y[n - 1]
+        else:
+            next_x, next_y = x[stop:edges[i + 2]].mean(), y[stop:edges[i + 2]].mean()
+        # Aire du triangle (point retenu précédent, candidat, moyenne du seau suivant)
+        area = np.abs((x[a] - next_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def lttb_extrema_indices(x, y, points):
+    """LTTB positions that include the global minimum and maximum, ``points`` of them.
+
+    Each extreme is kept by its bucket; two extremes sharing a bucket are
+    kept by LTTB on one bucket less (``points - 1`` positions at worst).
+    """
+    n = len(y)
+    if points >= n or points < 4:
+        return lttb_indices(x, y, points)
+    extremes = np.unique([np.argmin(y), np.argmax(y)])
+    kept = lttb_indices(x, y, points, keep=extremes)
+    if np.isin(extremes, kept).all():
+        return kept
+    return np.union1d(lttb_indices(x, y, points - 1, keep=extremes[:1]), extremes)
+
+
+def minmax_indices(y, points):
+    """Positions of both ends and of the minimum and maximum of ``(points - 2) // 2`` equal inner buckets."""
+    n = len(y)
+    if points >= n or points < 4:
+        return np.arange(n)
+    # Les deux extrémités sont réservées : les seaux couvrent les positions 1 à n - 2
+    inner = y[1:n - 1]
+    buckets = (points - 2) // 2
+    edges = np.linspace(0, len(inner), buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    found = [[0, n - 1]]
+    for reduce in (np.minimum, np.maximum):
+        # Première position de chaque seau qui atteint son extremum
+        hits = np.flatnonzero(inner == reduce.reduceat(inner, edges[:-1])[bucket])
+        found.append(1 + hits[np.unique(bucket[hits], return_index=True)[1]])
+    return np.unique(np.concatenate(found))
+
+
+def _positions(series, points, method):
+    """Row positions kept for one column, its missing values being skipped."""
+    valid = np.flatnonzero(series.notna().to_numpy())
+    y = series.to_numpy(dtype=float)[valid]
+    if method == "minmax":
+        kept = minmax_indices(y, points)
+    elif method == "lttb":
+        index = series.index
+        if isinstance(index, pd.DatetimeIndex):
+            x = index.asi8[valid].astype(float)
+            x -= x[0] if len(x) else 0.0
+        else:
+            x = valid.astype(float)
+        kept = lttb_extrema_indices(x, y, points)
+    else:
+        raise ValueError(f"Méthode de réduction inconnue : {method}")
+    return valid[kept]
+
+
+def downsample(data, points=800, method="lttb"):
+    """Keep about ``points`` rows of a Series or of every column of a DataFrame.
+
+    For a frame, the rows kept for each column are merged, so every curve
+    keeps its own peaks. Data that is already short enough is returned as is.
+    """
+    if data is None or len(data) <= points:
+        return data
+    if isinstance(data, pd.Series):
+        return data.iloc[_positions(data, points, method)]
+    kept = [_positions(data[c], points, method) for c in data.columns]
+    return data.iloc[np.unique(np.concatenate(kept))] if kept else data
@@ -0,0 +1,114 @@
+"""Lightweight forecasting models vectorized across tickers.
+
+Each model takes a date x ticker panel of closes and forecasts every column
+in one pass of array operations: simple exponential smoothing (smoothing
+constant chosen per ticker on a grid), random walk with drift and a linear
+trend on the last bars. Intervals assume Gaussian errors and have the
+``INTERVAL_WIDTH`` of the ARIMA and Prophet forecasts.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from . import INTERVAL_WIDTH
+
+# Trois frames (horizon x tickers), l'index allant de 1 à l'horizon
+FastForecast = namedtuple("FastForecast", "mean lower upper")
+
+MODELS = {
+    "ses": "Lissage exponentiel",
+    "drift": "Dérive",
+    "trend": "Tendance linéaire",
+}
+
+
+def _values(panel):
+    """Close panel as an array, gaps forward-filled; leading NaNs (not yet listed) are kept."""
+    panel = panel.to_frame() if isinstance(panel, pd.Series) else panel
+    return panel.columns, panel.ffill().to_numpy(dtype=float)
+
+
+def ses(values, horizon, alphas=np.linspace(0.05, 1.0, 20)):
+    """Simple exponential smoothing of every column; return ``(mean, std)`` arrays of shape (horizon, n).
+
+    The recursion runs once over time for all tickers and all smoothing
+    constants at the same time (arrays of shape (len(alphas), n)); each
+    ticker keeps the constant with the smallest one-step squared error.
+    """
+    alphas = np.asarray(alphas, dtype=float)[:, None]
+    level = np.broadcast_to(values[0], (len(alphas), values.shape[1])).copy()
+    sse = np.zeros_like(level)
+    count = np.zeros_like(level)
+    for y in values[1:]:
+        err = y - level
+        started = ~np.isnan(level)
+        ok = started & ~np.isnan(err)
+        sse += np.where(ok, err, 0.0) ** 2
+        count += ok
+        level = np.where(started, level + alphas * err, y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mse = sse / count
+    best = np.argmin(np.where(np.isnan(mse), np.inf, mse), axis=0)
+    cols = np.arange(values.shape[1])
+    alpha, sigma = alphas[best, 0], np.sqrt(mse[best, cols])
+    h = np.arange(1, horizon + 1)[:, None]
+    mean = np.broadcast_to(level[best, cols], (horizon, values.shape[1]))
+    return mean, sigma * np.sqrt(1 + (h - 1) * alpha ** 2)
+
+
+def drift(values, horizon):
+    """Random walk with drift: the last close extended by the average daily change."""
+    observed = ~np.isnan(values)
+    first = observed.argmax(axis=0)
+    cols = np.arange(values.shape[1])
+    n = len(values) - first
+    last = values[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (last - values[first, cols]) / (n - 1)
+        sigma = np.sqrt(np.nansum((np.diff(values, axis=0) - slope) ** 2, axis=0) / (n - 2))
+    h = np.arange(1, horizon + 1)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = sigma * np.sqrt(h * (1 + h / (n - 1)))
+    return last + h * slope, std
+
+
+def trend(values, horizon, window=252):
+    """Least-squares line through the last ``window`` closes of every column, extrapolated."""
+    y = values[-window:]
+    mask = ~np.isnan(y)
+    x = np.arange(len(y), dtype=float)[:, None]
+    n = mask.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = (x * mask).sum(axis=0) / n
+        y_mean = np.nansum(y, axis=0) / n
+        dx = np.where(mask, x - x_mean, 0.0)
+        sxx = (dx ** 2).sum(axis=0)
+        slope = np.nansum(dx * (y - y_mean), axis=0) / sxx
+        intercept = y_mean - slope * x_mean
+        resid = np.where(mask, y - (intercept + slope * x), 0.0)
+        sigma = np.sqrt((resid ** 2).sum(axis=0) / (n - 2))
+        x_new = len(y) - 1 + np.arange(1, horizon + 1)[:, None]
+        std = sigma * np.sqrt(1 + 1 / n + (x_new - x_mean) ** 2 / sxx)
+    return intercept + slope * x_new, std
+
+
+def forecast_panel(panel, horizon, model="ses", **params):
+    """Forecast ``horizon`` days of every column of a close panel (or of one series) with one model.
+
+    Returns a ``FastForecast`` of frames indexed by step (1 to ``horizon``);
+    tickers with too short a history get NaN.
+    """
+    models = {"ses": ses, "drift": drift, "trend": trend}
+    if model not in models:
+        raise ValueError(f"Modèle inconnu : {model}")
+    columns, values = _values(panel)
+    mean, std = models[model](values, horizon, **params)
+    # Moins de trois cours : pas assez pour estimer la dispersion
+    too_short = (~np.isnan(values)).sum(axis=0) < 3
+    mean = np.where(too_short, np.nan, mean)
+    z = norm.ppf(0.5 + INTERVAL_WIDTH / 2)
+    index = pd.RangeIndex(1, horizon + 1, name="step")
+    return FastForecast(*(pd.DataFrame(a, index=index, columns=columns)
+                          for a in (mean, mean - z * std, mean + z * std)))
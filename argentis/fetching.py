@@ -0,0 +1,103 @@
+"""Concurrent fetch scheduler throttled by a process-wide token bucket."""
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Erreurs transitoires : réseau et HTTP (OSError, dont les exceptions de requests) et page
+# d'erreur HTML servie à la place du JSON (limitation de débit). Les erreurs de programmation
+# (ValueError, RuntimeError...) et les symboles inconnus ne sont pas réessayés
+TRANSIENT_ERRORS = (OSError, json.JSONDecodeError)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("Le débit du limiteur doit être strictement positif.")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take ``tokens`` if available right now; return the wait needed otherwise (0 on success)."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until ``tokens`` are available, one token at a time beyond ``capacity``."""
+        while tokens > 0:
+            step = min(tokens, self.capacity)
+            wait = self.try_acquire(step)
+            while wait > 0:
+                time.sleep(wait)
+                wait = self.try_acquire(step)
+            tokens -= step
+
+
+def backoff_delay(attempt, base=0.5, cap=20.0):
+    """Exponential backoff with full jitter for the given (0-based) retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class FetchScheduler:
+    """Run fetches concurrently under a shared rate limit, retrying failures.
+
+    Every attempt consumes one token of ``bucket``, so the overall request rate
+    stays under the provider limit whatever the number of worker threads and
+    Streamlit sessions. Failed attempts are retried up to ``max_attempts`` times
+    with exponential backoff and jitter.
+    """
+
+    def __init__(self, bucket, max_workers=8, max_attempts=5, base_delay=0.5, max_delay=20.0,
+                 retry_on=TRANSIENT_ERRORS):
+        self.bucket = bucket
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def call(self, fn, *args, tokens=1, **kwargs):
+        """Call ``fn`` in the current thread, rate-limited and retried."""
+        for attempt in range(self.max_attempts):
+            self.bucket.acquire(tokens)
+            try:
+                return fn(*args, **kwargs)
+            except self.retry_on:
+                if attempt == self.max_attempts - 1:
+                    raise
+                time.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule ``fn`` on the worker pool and return a Future."""
+        return self._executor.submit(self.call, fn, *args, **kwargs)
+
+    def map(self, fn, items, **kwargs):
+        """Call ``fn(item, **kwargs)`` for every item concurrently.
+
+        Returns ``(results, errors)``, two dicts keyed by item, so that one
+        failing ticker does not hide the others.
+        """
+        items = list(dict.fromkeys(items))
+        futures = {item: self.submit(fn, item, **kwargs) for item in items}
+        results, errors = {}, {}
+        for item, future in futures.items():
+            try:
+                results[item] = future.result()
+            except Exception as e:
+                errors[item] = e
+        return results, errors
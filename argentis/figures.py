@@ -0,0 +1,110 @@
+"""Charts rendered to PNG/SVG once per content, through a disk LRU cache.
+
+A chart is a drawing function ``draw(fig, ax, **data)`` called on a bare
+``matplotlib.figure.Figure``: the figure is never registered with pyplot,
+so it is released as soon as it has been saved. The cache key hashes the
+drawing function's code, the rendering settings and the data, so that a
+chart already drawn with the same inputs is served without matplotlib.
+"""
+import hashlib
+import io
+from pathlib import Path
+
+import seaborn as sns
+from matplotlib.figure import Figure
+
+from . import DATA_DIR
+from .disk_cache import DiskCache
+from .simulation import update_hash
+
+
+def figure_key(draw, settings, data):
+    """Hash of a drawing function (its code), rendering settings and data."""
+    h = hashlib.sha1()
+    code = draw.__code__
+    h.update(f"{draw.__module__}.{draw.__qualname__}".encode())
+    h.update(code.co_code)
+    h.update(repr(code.co_consts).encode())
+    update_hash(h, settings)
+    update_hash(h, data)
+    return h.hexdigest()
+
+
+class FigureCache:
+    """LRU store of rendered charts in ``<root>/<hash>.<format>``, at most ``max_entries`` files."""
+
+    def __init__(self, root=None, max_entries=512):
+        self.root = Path(root) if root is not None else DATA_DIR / "figures"
+        self.max_entries = max_entries
+        self._files = DiskCache(self.root, max_entries, suffixes=(".png", ".svg"))
+
+    def render(self, draw, fmt="png", figsize=None, dpi=100, **data):
+        """Return the chart ``draw(fig, ax, **data)`` as PNG bytes (or SVG text), drawing it if not cached."""
+        settings = {"fmt": fmt, "figsize": figsize, "dpi": dpi}
+
+        def create():
+            fig = Figure(figsize=figsize, dpi=dpi)
+            draw(fig, fig.subplots(), **data)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt, bbox_inches="tight")
+            return buffer.getvalue()
+
+        content = self._files.get_or_create(f"{figure_key(draw, settings, data)}.{fmt}", create)
+        return content.decode("utf-8") if fmt == "svg" else content
+
+
+# --- Graphiques de l'application ---
+
+def frontier_chart(fig, ax, vols, rets, sharpes, optimum=None, min_variance=None, line=False, labels=False):
+    """Simulated or exact frontier colored by Sharpe ratio, with the optimal portfolio in red."""
+    if line:
+        ax.plot(vols, rets, color='grey', zorder=1)
+    if min_variance is not None:
+        ax.scatter(*min_variance, c='blue', s=100, marker='D', label='Variance Minimale', zorder=3)
+    scatter = ax.scatter(vols, rets, c=sharpes, cmap='viridis', zorder=2)
+    if optimum is not None:
+        ax.scatter(*optimum, c='red', s=100, label='Portefeuille Optimal', zorder=3)
+    if labels:
+        ax.set_xlabel("Volatilité Annualisée (%)")
+        ax.set_ylabel("Rendement Annualisé (%)")
+        ax.legend()
+        fig.colorbar(scatter, ax=ax, label='Ratio Sharpe')
+
+
+def forecast_chart(fig, ax, history, lines=(), band=None):
+    """Close history followed by forecast lines ``(label, dates, values, color)`` and a ``band``."""
+    ax.plot(history.index, history.values, label="Historique", color="#1a75ff")
+    for label, dates, values, color in lines:
+        ax.plot(dates, values, label=label, color=color, linestyle="--")
+    if band is not None:
+        label, dates, lower, upper, color = band
+        ax.fill_between(dates, lower, upper, color=color, alpha=0.1, label=label)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Prix de Clôture ($)")
+    ax.legend()
+    ax.grid(True)
+
+
+def bar_chart(fig, ax, x, y, palette=None, xlabel=None, ylabel=None):
+    """Seaborn bar chart; horizontal when ``y`` holds the labels."""
+    sns.barplot(x=x, y=y, ax=ax, palette=palette)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+
+
+def pie_chart(fig, ax, weights, labels):
+    """Portfolio weights as a pie."""
+    ax.pie(weights, labels=labels, autopct='%1.1f%%', startangle=90, colors=sns.color_palette("muted"))
+    ax.axis('equal')
+
+
+def heatmap_chart(fig, ax, values, columns, index, xlabel=None, ylabel=None, label=None):
+    """Surface of a 2-D grid (rows: ``index``, columns: ``columns``) with a colour bar."""
+    mesh = ax.pcolormesh(columns, index, values, cmap="viridis", shading="auto")
+    fig.colorbar(mesh, ax=ax, label=label)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
@@ -0,0 +1,275 @@
+"""Disk cache of fitted forecasting models (ARIMA, Prophet).
+
+Entries are keyed by model kind, ticker, configuration and the date of the
+last observation, and evicted least-recently-used first. A cached ARIMA fit
+is extended with the bars that arrived since (``append(refit=False)``)
+instead of being refitted; Prophet fits are stored as JSON along with their
+forecast so that a shorter horizon needs no prediction at all. The ARIMA
+order can also be searched automatically, the winner being kept per ticker.
+Prophet runs either with its default settings or with a reduced-cost
+profile that skips uncertainty sampling.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.stattools import adfuller
+
+from . import DATA_DIR, INTERVAL_WIDTH
+from .disk_cache import DiskCache, pickle_dumps
+
+MODELS = ("arima", "prophet")
+# Horizon des prévisions Prophet mises en cache (maximum de la page ML)
+PROPHET_HORIZON = 30
+# Ordre ARIMA historique de la page ML, utilisé hors recherche automatique
+DEFAULT_ORDER = (1, 1, 1)
+# Réglages Prophet par profil ; "fast" saute l'échantillonnage des intervalles,
+# qui sont alors réduits à la prévision centrale
+PROPHET_PROFILES = {
+    "standard": {},
+    "fast": {"uncertainty_samples": 0},
+}
+
+
+def _config_hash(config):
+    return hashlib.sha1(repr(sorted(config.items())).encode()).hexdigest()[:10]
+
+
+class ForecastCache:
+    """LRU store of fitted models in ``<root>/<kind>-<TICKER>-<config>-<last date>.pkl``.
+
+    Entries live in a ``DiskCache`` of at most ``max_entries`` files; fits of
+    one (kind, ticker, config) are serialized by a lock of their own.
+    """
+
+    def __init__(self, root=None, max_entries=64):
+        self.root = Path(root) if root is not None else DATA_DIR / "models"
+        self.max_entries = max_entries
+        self._files = DiskCache(self.root, max_entries, dumps=pickle_dumps, loads=pickle.loads)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, prefix):
+        with self._locks_guard:
+            return self._locks.setdefault(prefix, threading.Lock())
+
+    @staticmethod
+    def _prefix(kind, ticker, config):
+        safe = ticker.strip().upper().replace("/", "_").replace("-", "_")
+        return f"{kind}-{safe}-{_config_hash(config)}"
+
+    @staticmethod
+    def _name(prefix, last_date):
+        return f"{prefix}-{pd.Timestamp(last_date):%Y%m%d}.pkl"
+
+    def _latest(self, prefix):
+        """Most recent entry of a (kind, ticker, config) whatever its last date."""
+        names = self._files.names(f"{prefix}-*.pkl")
+        return names[-1] if names else None
+
+    def arima(self, ticker, y, order=(1, 1, 1), max_appended=63):
+        """Return ARIMA results fitted on the close series ``y`` (indexed by date).
+
+        A fit cached for an earlier date is extended with the new bars as long
+        as the bars it saw are unchanged and at most ``max_appended`` bars were
+        added since the last real fit; otherwise the model is refitted.
+        """
+        config = {"order": tuple(order)}
+        prefix = self._prefix("arima", ticker, config)
+        last_date = y.index[-1]
+        name = self._name(prefix, last_date)
+        with self._lock(prefix):
+            entry = self._files.get(name)
+            if entry is not None:
+                return entry["results"]
+
+            values = y.to_numpy(dtype=float)
+            previous = self._latest(prefix)
+            entry = self._files.get(previous) if previous is not None else None
+            results, appended = None, 0
+            if entry is not None and entry["last_date"] in y.index:
+                pos = y.index.get_loc(entry["last_date"])
+                new = values[pos + 1:]
+                unchanged = np.isclose(values[pos], entry["last_value"], rtol=1e-9, atol=0)
+                if unchanged and len(new) and entry["appended"] + len(new) <= max_appended:
+                    results = entry["results"].append(new, refit=False)
+                    appended = entry["appended"] + len(new)
+            if results is None:
+                results = ARIMA(values, order=tuple(order)).fit()
+            self._files.put(name, {"results": results, "last_date": last_date, "last_value": values[-1],
+                                   "appended": appended})
+            if previous is not None and previous != name:
+                self._files.delete(previous)
+            return results
+
+    def _order_path(self, ticker, config):
+        return self.root / "orders" / f"{self._prefix('order', ticker, config)}.json"
+
+    def order(self, ticker, config, max_age=30 * 24 * 3600):
+        """Return the ARIMA order found for a ticker by a search with ``config``, or None."""
+        try:
+            with open(self._order_path(ticker, config)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["searched"] > max_age:
+            return None
+        return tuple(entry["order"])
+
+    def save_order(self, ticker, config, order, score):
+        path = self._order_path(ticker, config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"order": list(order), "score": score, "searched": time.time()}, f)
+        os.replace(tmp, path)
+
+    def prophet(self, ticker, df, horizon=30, **config):
+        """Return the Prophet forecast (``ds``, ``yhat``, ``yhat_lower``, ``yhat_upper``) of the next ``horizon`` days.
+
+        ``df`` has the Prophet ``ds``/``y`` columns; ``config`` is passed to
+        ``Prophet()``. The fit is reused for any horizon up to the cached one.
+        """
+        prefix = self._prefix("prophet", ticker, config)
+        name = self._name(prefix, df["ds"].iloc[-1])
+        with self._lock(prefix):
+            entry = self._files.get(name)
+            if entry is not None and len(entry["forecast"]) >= horizon:
+                return entry["forecast"].head(horizon)
+            if entry is not None:
+                m = model_from_json(entry["model"])
+            else:
+                m = Prophet(**config)
+                m.fit(df)
+            future = m.make_future_dataframe(periods=horizon, include_history=False)
+            forecast = m.predict(future)
+            for bound in ("yhat_lower", "yhat_upper"):
+                if bound not in forecast:
+                    forecast[bound] = forecast["yhat"]
+            forecast = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+            for old in self._files.names(f"{prefix}-*.pkl"):
+                if old != name:
+                    self._files.delete(old)
+            self._files.put(name, {"model": model_to_json(m), "forecast": forecast})
+            return forecast
+
+
+def forecast_one(ticker, close, model, horizon, cache_root=None, profile="standard"):
+    """Forecast ``horizon`` days of one close series with one model, through the disk cache.
+
+    Returns a row (dict) with the last close, the forecast of the last day,
+    its ``INTERVAL_WIDTH`` interval and the time taken in ``seconds``; a
+    failure is reported in ``error``. ``profile`` selects the Prophet settings.
+    """
+    row = {"ticker": ticker, "model": model, "last": float(close.iloc[-1]), "forecast": np.nan,
+           "lower": np.nan, "upper": np.nan, "seconds": np.nan, "error": None}
+    cache = ForecastCache(cache_root)
+    start = time.perf_counter()
+    try:
+        if model == "arima":
+            prediction = cache.arima(ticker, close).get_forecast(steps=horizon)
+            lower, upper = np.asarray(prediction.conf_int(alpha=1 - INTERVAL_WIDTH))[-1]
+            row.update(forecast=float(np.asarray(prediction.predicted_mean)[-1]), lower=lower, upper=upper)
+        elif model == "prophet":
+            df = pd.DataFrame({"ds": close.index, "y": close.to_numpy()})
+            forecast = cache.prophet(ticker, df, horizon=max(horizon, PROPHET_HORIZON),
+                                     **PROPHET_PROFILES[profile]).iloc[horizon - 1]
+            row.update(forecast=forecast["yhat"], lower=forecast["yhat_lower"], upper=forecast["yhat_upper"])
+        else:
+            raise ValueError(f"Modèle inconnu : {model}")
+    except Exception as e:
+        row["error"] = str(e)
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def prophet_forecast(ticker, df, horizon=PROPHET_HORIZON, cache_root=None, profile="standard"):
+    """Module-level entry point of ``ForecastCache.prophet``, to run it as a background job.
+
+    Returns the forecast and the time it took in seconds.
+    """
+    start = time.perf_counter()
+    forecast = ForecastCache(cache_root).prophet(ticker, df, horizon=horizon, **PROPHET_PROFILES[profile])
+    return forecast, time.perf_counter() - start
+
+
+def differencing_order(values, max_d=2, pvalue=0.05):
+    """Smallest number of differences after which the ADF test rejects a unit root."""
+    for d in range(max_d):
+        if adfuller(np.diff(values, n=d), autolag="AIC")[1] < pvalue:
+            return d
+    return max_d
+
+
+def _fit_order(values, order):
+    """Worker side: information criteria of one ARIMA order (inf if the fit fails)."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fit = ARIMA(values, order=order).fit()
+        return order, fit.aic, fit.bic
+    except Exception:
+        return order, np.inf, np.inf
+
+
+def order_config(criterion="aic", max_p=3, max_q=3, max_d=2):
+    """Search settings under which a winning order is cached (see ``ForecastCache.order``)."""
+    return {"criterion": criterion, "max_p": max_p, "max_q": max_q, "max_d": max_d}
+
+
+def search_order(ticker, y, criterion="aic", max_p=3, max_q=3, max_d=2, max_workers=None, cache_root=None,
+                 on_progress=None):
+    """Search the ARIMA order of a close series minimising AIC or BIC; return ``(order, score)``.
+
+    ``d`` comes from ADF tests, then the ``(p, q)`` grid is explored by waves
+    of increasing ``p + q``, each wave fitted in parallel across processes.
+    The search stops at the first wave that does not improve the criterion.
+    The winner is kept in the cache, so the next call for the ticker returns
+    it without fitting anything (the score is then None).
+    """
+    cache = ForecastCache(cache_root)
+    config = order_config(criterion, max_p, max_q, max_d)
+    cached = cache.order(ticker, config)
+    if cached is not None:
+        return cached, None
+    values = y.to_numpy(dtype=float)
+    d = differencing_order(values, max_d)
+    column = 1 if criterion == "aic" else 2
+    waves = [[(p, d, k - p) for p in range(max(0, k - max_q), min(k, max_p) + 1)] for k in range(max_p + max_q + 1)]
+    total = sum(len(w) for w in waves)
+    workers = min(max_workers or os.cpu_count() or 1, max(len(w) for w in waves))
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) if workers > 1 else None
+    best, done = (None, np.inf), 0
+    try:
+        for wave in waves:
+            if pool is not None:
+                results = list(pool.map(_fit_order, [values] * len(wave), wave))
+            else:
+                results = [_fit_order(values, order) for order in wave]
+            done += len(wave)
+            if on_progress is not None:
+                on_progress(done, total)
+            order, score = min(((r[0], r[column]) for r in results), key=lambda r: r[1])
+            if score >= best[1] and best[0] is not None:
+                break
+            if score < best[1]:
+                best = (order, score)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if best[0] is None:
+        raise ValueError("Aucun modèle ARIMA n'a pu être ajusté.")
+    cache.save_order(ticker, config, best[0], float(best[1]))
+    return best
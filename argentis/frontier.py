@@ -0,0 +1,96 @@
+"""Vectorized Monte Carlo sampling of the efficient frontier."""
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .simulation import spawn_generators
+
+TRADING_DAYS = 252
+# Portefeuilles tirés d'un même flux aléatoire (un flux indépendant par bloc)
+STREAM_BLOCK = 1024
+
+# vols, rets, sharpes : un élément par portefeuille simulé
+# best : indice du meilleur ratio de Sharpe, best_weights : ses poids
+# weights : matrice (sims, n) des poids, ou None si keep_weights=False
+Frontier = namedtuple("Frontier", "vols rets sharpes best best_weights weights")
+
+
+def annualized_moments(rets, periods=TRADING_DAYS):
+    """Return the annualized mean vector and covariance matrix of a returns frame."""
+    mu = rets.mean().to_numpy() * periods
+    cov = rets.cov().to_numpy() * periods
+    return mu, cov
+
+
+def random_weights(rng, size, n):
+    """Draw ``size`` portfolios uniformly on the simplex (Dirichlet(1, ..., 1))."""
+    w = rng.standard_gamma(1.0, size=(size, n))
+    w /= w.sum(axis=1, keepdims=True)
+    return w
+
+
+def _evaluate(generators, sizes, mu, cov):
+    """Draw and evaluate one chunk of blocks of portfolios: their weights, returns and volatilities."""
+    w = np.concatenate([random_weights(rng, size, len(mu)) for rng, size in zip(generators, sizes)])
+    return w, w @ mu, np.sqrt(np.einsum("ij,ij->i", w @ cov, w))
+
+
+def simulate_frontier(mu, cov, sims, seed=None, risk_free=0.0, memory_budget=64 * 2 ** 20,
+                      keep_weights=False, workers=1):
+    """Evaluate ``sims`` random long-only portfolios with batched matrix products.
+
+    Means and covariance are computed once by the caller; the portfolios are
+    drawn and evaluated by chunks so that the temporary matrices stay within
+    ``memory_budget`` bytes whatever the number of simulations: at most
+    ``workers`` chunks are in flight, each reduced as soon as it is done.
+    Every block of ``STREAM_BLOCK`` portfolios draws from its own stream
+    spawned from ``seed`` and chunks are made of whole blocks: the same seed
+    gives the same portfolios whatever the budget and number of ``workers``
+    (threads) used.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    if n == 0 or sims <= 0:
+        raise ValueError("Il faut au moins un actif et une simulation.")
+    workers = max(1, workers)
+    blocks = range(0, sims, STREAM_BLOCK)
+    generators = spawn_generators(seed, len(blocks))
+    block_sizes = [min(STREAM_BLOCK, sims - start) for start in blocks]
+    # Trois matrices (chunk, n) par tranche en cours : poids, poids @ cov, produit
+    per_chunk = max(1, int(memory_budget // (3 * n * 8 * workers * STREAM_BLOCK)))
+    starts = list(blocks[::per_chunk])
+
+    vols = np.empty(sims)
+    rets = np.empty(sims)
+    weights = np.empty((sims, n)) if keep_weights else None
+    best_sharpe, best_weights = -np.inf, None
+    with ThreadPoolExecutor(workers) as pool:
+        # Les produits matriciels de NumPy libèrent le GIL : les tranches avancent en parallèle
+        pending = deque()
+        for i, start in enumerate(starts):
+            first = i * per_chunk
+            chunk = slice(first, first + per_chunk)
+            pending.append((start, pool.submit(_evaluate, generators[chunk], block_sizes[chunk], mu, cov)))
+            if len(pending) < workers and i < len(starts) - 1:
+                continue
+            # Réduction dans l'ordre de soumission dès qu'une place doit se libérer
+            while pending and (len(pending) >= workers or i == len(starts) - 1):
+                start, future = pending.popleft()
+                w, r, v = future.result()
+                stop = start + len(r)
+                rets[start:stop] = r
+                vols[start:stop] = v
+                if keep_weights:
+                    weights[start:stop] = w
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    s = (r - risk_free) / v
+                j = int(np.nanargmax(s)) if not np.all(np.isnan(s)) else 0
+                if s[j] > best_sharpe or best_weights is None:
+                    best_sharpe, best_weights = s[j], w[j].copy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpes = (rets - risk_free) / vols
+    best = int(np.nanargmax(sharpes)) if not np.all(np.isnan(sharpes)) else 0
+    return Frontier(vols, rets, sharpes, best, best_weights, weights)
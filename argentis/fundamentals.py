@@ -0,0 +1,198 @@
+"""Local snapshot of the fundamentals of every ticker seen, one row per ticker.
+
+The table is stored in ``<root>/fundamentals.parquet`` with typed columns
+(floats for figures, strings for names) and the time of each row's snapshot.
+A field is stale after the TTL of its group (prices move within the day,
+ratios with each report, names almost never): a request only downloads the
+``info`` of the tickers whose requested fields are stale, in one bulk call.
+Range lookups on numeric columns go through sorted indexes.
+"""
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_DIR
+from .screener import FIELDS, TEXT_FIELDS
+
+# Durée de vie (secondes) des champs de chaque groupe
+FIELD_TTL = {
+    "market": 900,
+    "ratios": 6 * 3600,
+    "profile": 7 * 24 * 3600,
+}
+
+# Colonne -> (champ de l'info yfinance, groupe de durée de vie)
+COLUMNS = {
+    **{col: (key, "ratios") for col, key in FIELDS.items()},
+    "price": ("currentPrice", "market"),
+    "market_cap": ("marketCap", "market"),
+    "bid": ("bid", "market"),
+    "ask": ("ask", "market"),
+    "low_52w": ("fiftyTwoWeekLow", "market"),
+    "high_52w": ("fiftyTwoWeekHigh", "market"),
+    "total_debt": ("totalDebt", "ratios"),
+    "operating_cash_flow": ("operatingCashFlow", "ratios"),
+    **{col: (key, "profile") for col, key in TEXT_FIELDS.items()},
+}
+
+_CONDITION_RE = re.compile(r"^\s*(\w+)\s*(<=|>=|==|<|>)\s*(-?[\d.]+(?:e-?\d+)?)\s*$", re.IGNORECASE)
+
+
+def snapshot_row(info):
+    """Typed row of the table from a yfinance info dict (missing or non-numeric figures become NaN)."""
+    row = {}
+    for col, (key, _) in COLUMNS.items():
+        value = info.get(key)
+        if col in TEXT_FIELDS:
+            row[col] = value if isinstance(value, str) else None
+        else:
+            row[col] = pd.to_numeric(value, errors="coerce") if np.isscalar(value) else np.nan
+    return row
+
+
+def _typed(table):
+    for col in COLUMNS:
+        if col not in table:
+            table[col] = None
+        table[col] = table[col].astype("string" if col in TEXT_FIELDS else float)
+    table["snapshot"] = table["snapshot"].astype(float)
+    return table[list(COLUMNS) + ["snapshot"]]
+
+
+class FundamentalsStore:
+    """Persist one row of fundamentals per ticker and refresh stale rows in bulk.
+
+    The table is kept in memory between calls and reloaded when the file
+    changes (another session refreshed it). Sorted indexes of the numeric
+    columns are rebuilt lazily for each version of the table.
+    """
+
+    def __init__(self, root=None, ttl=None, clock=time.time):
+        self.root = Path(root) if root is not None else DATA_DIR / "fundamentals"
+        self.ttl = dict(FIELD_TTL, **(ttl or {}))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._table = None
+        self._mtime = None
+        self._indexes = {}
+
+    @property
+    def path(self):
+        return self.root / "fundamentals.parquet"
+
+    def table(self):
+        """The whole table (index: ticker), as stored on disk."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if self._table is None or mtime != self._mtime:
+            table = None
+            if mtime is not None:
+                try:
+                    table = pd.read_parquet(self.path)
+                except Exception:
+                    # Fichier corrompu : on repartira de zéro
+                    table = None
+            if table is None:
+                table = _typed(pd.DataFrame({"snapshot": []}, index=pd.Index([], name="ticker", dtype=object)))
+            self._table, self._mtime, self._indexes = table, mtime, {}
+        return self._table
+
+    def _save(self, table):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        table.to_parquet(tmp)
+        os.replace(tmp, self.path)
+
+    def max_age(self, fields=None):
+        """Age after which a row is too old for ``fields`` (all columns if None)."""
+        return min(self.ttl[COLUMNS[f][1]] for f in (fields or COLUMNS))
+
+    def stale(self, tickers, fields=None):
+        """Tickers with no row or a row older than the TTL of ``fields``."""
+        snapshot = self.table()["snapshot"].reindex(tickers)
+        return list(snapshot.index[~(self._clock() - snapshot < self.max_age(fields))])
+
+    def refresh(self, tickers, provider, fields=None):
+        """Download the info of the stale tickers in one ``info_many`` call and store their rows."""
+        tickers = [t.strip().upper() for t in tickers]
+        with self._lock:
+            stale = self.stale(tickers, fields)
+            if not stale:
+                return
+            infos = provider.info_many(stale)
+            now = self._clock()
+            rows = {t: dict(snapshot_row(info), snapshot=now) for t, info in infos.items() if info}
+            if not rows:
+                return
+            new = _typed(pd.DataFrame.from_dict(rows, orient="index"))
+            table = self.table()
+            table = pd.concat([table.drop(index=new.index, errors="ignore"), new])
+            table.index.name = "ticker"
+            self._save(table)
+            self._table, self._mtime, self._indexes = table, self.path.stat().st_mtime, {}
+
+    def snapshot(self, tickers, provider=None, fields=None):
+        """Rows of the tickers (refreshed first through ``provider`` if given); unknown tickers are left out."""
+        tickers = [t.strip().upper() for t in tickers]
+        if provider is not None:
+            self.refresh(tickers, provider, fields)
+        table = self.table()
+        return table.loc[[t for t in dict.fromkeys(tickers) if t in table.index]]
+
+    def infos(self, tickers, provider=None, fields=None):
+        """``{ticker: info}`` with the yfinance keys of the stored fields, missing ones omitted."""
+        rows = self.snapshot(tickers, provider, fields)
+        return {
+            t: {COLUMNS[col][0]: value for col, value in row.items() if col in COLUMNS and not pd.isna(value)}
+            for t, row in zip(rows.index, rows.to_dict("records"))
+        }
+
+    def _index(self, col):
+        if col not in self._indexes:
+            values = self.table()[col].to_numpy(dtype=float)
+            positions = np.flatnonzero(~np.isnan(values))
+            order = positions[np.argsort(values[positions], kind="stable")]
+            self._indexes[col] = (values[order], order)
+        return self._indexes[col]
+
+    def _lookup(self, col, op, value):
+        """Row positions satisfying ``col op value``, by binary search in the column's sorted index."""
+        values, order = self._index(col)
+        if op == "<":
+            return order[:np.searchsorted(values, value, "left")]
+        if op == "<=":
+            return order[:np.searchsorted(values, value, "right")]
+        if op == ">":
+            return order[np.searchsorted(values, value, "right"):]
+        if op == ">=":
+            return order[np.searchsorted(values, value, "left"):]
+        return order[np.searchsorted(values, value, "left"):np.searchsorted(values, value, "right")]
+
+    def select(self, expression):
+        """Tickers of the local table satisfying ``expression``, without any download.
+
+        Conjunctions of comparisons between a numeric column and a number
+        ("pe < 15 and roe > 0.15") are answered from the sorted indexes; any
+        other expression is evaluated by ``DataFrame.query``.
+        """
+        table = self.table()
+        parts = re.split(r"\s+and\s+|\s*&\s*", expression.strip())
+        matches = [_CONDITION_RE.match(p) for p in parts]
+        numeric = [c for c in COLUMNS if c not in TEXT_FIELDS]
+        if all(m is not None and m.group(1) in numeric for m in matches):
+            positions = None
+            for m in matches:
+                found = self._lookup(m.group(1), m.group(2), float(m.group(3)))
+                positions = found if positions is None else np.intersect1d(positions, found, assume_unique=True)
+            return list(table.index[np.sort(positions)])
+        try:
+            return list(table.query(expression).index)
+        except Exception as e:
+            raise ValueError(f"Expression invalide « {expression} » : {e}") from None
@@ -0,0 +1,161 @@
+"""Background jobs run in worker processes, deduplicated by input hash.
+
+A job is identified by the hash of its function and arguments: submitting
+the same computation twice (another rerun, another user) returns the same ID
+and shares one run. Progress and results live in ``<root>/<id>.json`` and
+``<root>/<id>.pkl`` so that any session can poll them.
+"""
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from . import DATA_DIR
+from .simulation import update_hash
+
+PENDING = ("queued", "running")
+
+
+def job_id(fn, args, kwargs):
+    """Hash identifying a computation: function name and arguments, frames and arrays by content."""
+    h = hashlib.sha1(f"{fn.__module__}.{fn.__qualname__}".encode())
+    update_hash(h, args)
+    update_hash(h, dict(kwargs))
+    return h.hexdigest()
+
+
+def _write_atomic(path, data, binary=False):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb" if binary else "w") as f:
+        if binary:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class _ProgressFile:
+    """``on_progress(done, total)`` callback writing the job status, at most every ``interval`` seconds."""
+
+    def __init__(self, path, interval=0.2):
+        self.path = path
+        self.interval = interval
+        self._last = 0.0
+
+    def write(self, state, done=0, total=None, error=None):
+        _write_atomic(self.path, {"state": state, "done": done, "total": total, "error": error})
+
+    def __call__(self, done, total):
+        now = time.monotonic()
+        if done >= total or now - self._last >= self.interval:
+            self._last = now
+            self.write("running", done, total)
+
+
+def _run_job(root, key, fn, args, kwargs):
+    """Worker side: run ``fn``, then store its result (or its error) under ``key``."""
+    root = Path(root)
+    progress = _ProgressFile(root / f"{key}.json")
+    progress.write("running")
+    if "on_progress" in inspect.signature(fn).parameters:
+        kwargs = dict(kwargs, on_progress=progress)
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        progress.write("failed", error=str(e))
+        raise
+    _write_atomic(root / f"{key}.pkl", result, binary=True)
+    progress.write("done", 1, 1)
+
+
+class JobQueue:
+    """Run functions in a pool of worker processes and poll them by job ID.
+
+    Functions must be importable (module level) since workers are spawned.
+    Those accepting an ``on_progress`` argument get a callback reporting
+    ``(done, total)``. Results are kept on disk for ``max_age`` seconds; a
+    failed job is only started again ``retry_after`` seconds later, unless
+    it was lost with a crashed worker. A pool broken by such a crash is
+    replaced by a new one on the next submission.
+    """
+
+    def __init__(self, root=None, max_workers=None, max_age=24 * 3600, retry_after=60):
+        self.root = Path(root) if root is not None else DATA_DIR / "jobs"
+        self.max_workers = max_workers
+        self.max_age = max_age
+        self.retry_after = retry_after
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self, broken=False):
+        if broken and self._executor is not None:
+            # Processus mort (mémoire, signal) : le pool refuse toute tâche, on en démarre un autre
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._executor is None:
+            # "spawn" : les processus ne dupliquent pas les threads de l'application (verrous, pool de téléchargement)
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _purge(self):
+        limit = time.time() - self.max_age
+        for path in self.root.iterdir():
+            try:
+                if path.stat().st_mtime < limit:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    def submit(self, fn, *args, **kwargs):
+        """Start ``fn(*args, **kwargs)`` unless the same job is running or done; return its ID."""
+        key = job_id(fn, args, kwargs)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._purge()
+            if (self.root / f"{key}.pkl").exists():
+                return key
+            if key in self._futures:
+                future, started = self._futures[key]
+                error = future.exception() if future.done() else None
+                lost = isinstance(error, BrokenProcessPool)
+                if error is None or (not lost and time.monotonic() - started < self.retry_after):
+                    return key
+            _write_atomic(self.root / f"{key}.json", {"state": "queued", "done": 0, "total": None, "error": None})
+            try:
+                future = self._pool().submit(_run_job, str(self.root), key, fn, args, kwargs)
+            except BrokenProcessPool:
+                future = self._pool(broken=True).submit(_run_job, str(self.root), key, fn, args, kwargs)
+            self._futures[key] = (future, time.monotonic())
+            return key
+
+    def status(self, key):
+        """Return ``{"state", "done", "total", "error"}``; state is queued, running, done, failed or unknown."""
+        if (self.root / f"{key}.pkl").exists():
+            return {"state": "done", "done": 1, "total": 1, "error": None}
+        if key not in self._futures:
+            # Job d'un autre processus serveur (ou perdu au redémarrage) : à soumettre de nouveau
+            return {"state": "unknown", "done": 0, "total": None, "error": None}
+        future = self._futures[key][0]
+        if future.done() and future.exception() is not None:
+            return {"state": "failed", "done": 0, "total": None, "error": str(future.exception())}
+        try:
+            with open(self.root / f"{key}.json") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"state": "queued", "done": 0, "total": None, "error": None}
+
+    def result(self, key):
+        """Return the result of a finished job, or None if it is not available."""
+        try:
+            with open(self.root / f"{key}.pkl", "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
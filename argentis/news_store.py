@@ -0,0 +1,222 @@
+"""Local news store: incremental ingestion per ticker and a full-text index.
+
+Articles live in one SQLite database. Each ticker keeps a cursor on the
+publish time of the newest article ingested, so a refresh only inserts what
+is newer; an article is stored once whatever the number of tickers it
+concerns, duplicates being recognised by URL or by title. The words of the
+titles feed an inverted index (term -> articles) answering searches such as
+"news mentioning X across these tickers in the last 7 days" locally. Word
+clouds count the words of a ticker's latest headlines, the ones on the page.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from . import DATA_DIR
+from .sentiment import normalize
+
+_WORD_RE = re.compile(r"\w+")
+# Mots des nuages : lettres seulement ; les élisions (l', d'...) tombent avec les mots d'une lettre
+_CLOUD_WORD_RE = re.compile(r"[^\W\d_]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT UNIQUE,
+    title_key TEXT UNIQUE,
+    published INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    publisher TEXT,
+    link TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+CREATE TABLE IF NOT EXISTS article_tickers (
+    ticker TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (ticker, article_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (term, article_id)
+) WITHOUT ROWID;
+-- Compteurs de mots cumulés depuis la première ingestion, remplacés par le comptage des derniers titres
+DROP TABLE IF EXISTS word_counts;
+CREATE TABLE IF NOT EXISTS cursors (
+    ticker TEXT PRIMARY KEY,
+    published INTEGER NOT NULL,
+    fetched REAL NOT NULL
+);
+"""
+
+
+def tokenize(text):
+    """Distinct index terms of a text: normalized words of two letters or more."""
+    return {w for w in _WORD_RE.findall(normalize(text)) if len(w) > 1}
+
+
+def cloud_words(text):
+    """Words of a title as shown in a word cloud: casefolded, accents kept."""
+    return [w for w in _CLOUD_WORD_RE.findall(text.casefold()) if len(w) > 1]
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _published(item):
+    """Publish time (epoch seconds) of a yfinance news item, whichever its format."""
+    if item.get("providerPublishTime"):
+        return int(item["providerPublishTime"])
+    content = item.get("content") or {}
+    if content.get("pubDate"):
+        return int(pd.Timestamp(content["pubDate"]).timestamp())
+    return int(time.time())
+
+
+class NewsStore:
+    """Persist the headlines of every ticker in ``<root>/news.sqlite`` and index their words.
+
+    ``refresh`` asks the provider for a ticker's news at most every
+    ``max_age`` seconds; the other methods only read the local database.
+    Articles are returned as dicts with the yfinance keys (``title``,
+    ``publisher``, ``link``, ``providerPublishTime``, ``relatedTickers``).
+    """
+
+    def __init__(self, root=None, max_age=900):
+        self.root = Path(root) if root is not None else DATA_DIR / "news"
+        self.max_age = max_age
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            self.root.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(self.root / "news.sqlite", timeout=30)
+        if not self._ready:
+            # WAL : les lectures des autres sessions ne bloquent pas l'ingestion
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+            self._ready = True
+        return con
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    @staticmethod
+    def _key(ticker):
+        return ticker.strip().upper()
+
+    def cursor(self, ticker):
+        """Return ``(last publish time, last fetch time)`` of a ticker, or None if never ingested."""
+        with closing(self._connect()) as con:
+            row = con.execute("SELECT published, fetched FROM cursors WHERE ticker = ?",
+                              (self._key(ticker),)).fetchone()
+        return row
+
+    def ingest(self, ticker, items):
+        """Store the news items of a ticker newer than its cursor; return the number of new articles."""
+        ticker = self._key(ticker)
+        added = 0
+        with closing(self._connect()) as con, con:
+            row = con.execute("SELECT published FROM cursors WHERE ticker = ?", (ticker,)).fetchone()
+            since = row[0] if row else -1
+            newest = since
+            for item in items or []:
+                published = _published(item)
+                title = item.get("title") or (item.get("content") or {}).get("title") or ""
+                # Même horodatage que le curseur : l'article peut être nouveau, le dédoublonnage tranche
+                if published < since or not title.strip():
+                    continue
+                newest = max(newest, published)
+                link = item.get("link") or ""
+                url_key = _hash(link.strip().lower()) if link else None
+                title_key = _hash(" ".join(_WORD_RE.findall(normalize(title))))
+                existing = con.execute("SELECT id FROM articles WHERE url_key = ? OR title_key = ?",
+                                       (url_key, title_key)).fetchone()
+                if existing is None:
+                    article_id = con.execute(
+                        "INSERT INTO articles (url_key, title_key, published, title, publisher, link) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (url_key, title_key, published, title, item.get("publisher"), link or None)).lastrowid
+                    con.executemany("INSERT OR IGNORE INTO terms (term, article_id) VALUES (?, ?)",
+                                    [(term, article_id) for term in tokenize(title)])
+                    added += 1
+                else:
+                    article_id = existing[0]
+                related = {ticker, *(self._key(t) for t in item.get("relatedTickers") or [])}
+                con.executemany("INSERT OR IGNORE INTO article_tickers (ticker, article_id) VALUES (?, ?)",
+                                [(t, article_id) for t in related])
+            con.execute("INSERT OR REPLACE INTO cursors (ticker, published, fetched) VALUES (?, ?, ?)",
+                        (ticker, newest, time.time()))
+        return added
+
+    def is_fresh(self, ticker):
+        """Tell whether the ticker's news were fetched less than ``max_age`` seconds ago."""
+        cursor = self.cursor(ticker)
+        return cursor is not None and time.time() - cursor[1] < self.max_age
+
+    def refresh(self, ticker, provider, limit=50):
+        """Ingest the ticker's new headlines unless fetched recently; return its latest articles."""
+        with self._lock(self._key(ticker)):
+            if not self.is_fresh(ticker):
+                self.ingest(ticker, provider.news(ticker))
+        return self.search(tickers=[ticker], limit=limit)
+
+    def word_counts(self, ticker, stopwords=(), limit=200, articles=50, since=None):
+        """Return the ``limit`` most frequent words of a ticker's latest headlines as ``{word: count}``.
+
+        Only the ``articles`` newest titles count (the window ``refresh``
+        returns), optionally restricted to those published after ``since``.
+        """
+        stopwords = set(stopwords)
+        titles = [a["title"] for a in self.search(tickers=[ticker], since=since, limit=articles)]
+        counts = Counter(w for title in titles for w in cloud_words(title) if w not in stopwords)
+        return dict(counts.most_common(limit))
+
+    def search(self, text=None, tickers=None, since=None, limit=100):
+        """Articles matching every word of ``text``, concerning one of ``tickers``, published after ``since``.
+
+        ``since`` is a date or a timedelta back from now. Articles are
+        returned newest first.
+        """
+        clauses, params = [], []
+        if text:
+            terms = sorted(tokenize(text))
+            if not terms:
+                return []
+            clauses.append("a.id IN (SELECT article_id FROM terms WHERE term IN (%s) "
+                           "GROUP BY article_id HAVING COUNT(*) = ?)" % ",".join("?" * len(terms)))
+            params += terms + [len(terms)]
+        if tickers:
+            tickers = [self._key(t) for t in tickers]
+            clauses.append("a.id IN (SELECT article_id FROM article_tickers WHERE ticker IN (%s))"
+                           % ",".join("?" * len(tickers)))
+            params += tickers
+        if since is not None:
+            if hasattr(since, "total_seconds"):
+                since = time.time() - since.total_seconds()
+            else:
+                since = pd.Timestamp(since).timestamp()
+            clauses.append("a.published >= ?")
+            params.append(int(since))
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with closing(self._connect()) as con:
+            rows = con.execute(
+                "SELECT a.id, a.title, a.publisher, a.link, a.published, "
+                "(SELECT GROUP_CONCAT(ticker) FROM article_tickers t WHERE t.article_id = a.id) "
+                f"FROM articles a{where} ORDER BY a.published DESC LIMIT ?", params + [limit]).fetchall()
+        return [
+            {"uuid": str(article_id), "title": title, "publisher": publisher, "link": link,
+             "providerPublishTime": published, "relatedTickers": related.split(",") if related else []}
+            for article_id, title, publisher, link, published, related in rows
+        ]
@@ -0,0 +1,280 @@
+"""Exact constrained mean-variance optimisation (min-variance, max-Sharpe, frontier).
+
+The portfolios are solutions of convex quadratic programs
+``min x' P x  s.t.  l <= A x <= u`` solved with an ADMM scheme (the OSQP
+algorithm): the KKT matrix is inverted through its Cholesky factorisation,
+refreshed only when the step sizes are adapted, so that an iteration is a
+few matrix-vector products.
+"""
+from collections import namedtuple
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+Portfolio = namedtuple("Portfolio", "weights ret vol sharpe")
+
+
+class _QuadraticProgram:
+    """``min x' P x + q' x  s.t.  l <= A x <= u`` solved by ADMM, then polished.
+
+    The ADMM iterations stop at a moderate tolerance; the constraints found
+    active are then solved exactly as an equality-constrained KKT system
+    (the "polishing" step of OSQP).
+    """
+
+    def __init__(self, P, A, sigma=1e-6, alpha=1.6):
+        # Mise à l'échelle de l'objectif et des contraintes : ne change pas la
+        # solution mais équilibre les résidus, dont dépend la vitesse de convergence
+        self.obj_scale = 1 / max(np.mean(np.diag(P)), 1e-12)
+        self.P = 2 * P * self.obj_scale
+        self.row_scale = 1 / np.maximum(np.linalg.norm(A, axis=1), 1e-12)
+        self.A = A * self.row_scale[:, None]
+        self.sigma = sigma
+        self.alpha = alpha
+        self.state = None
+        self._factored = None
+
+    def _factor(self, rho):
+        """Inverse of the KKT matrix for the step sizes ``rho``, reused while they do not change."""
+        if self._factored is None or not np.array_equal(self._factored[0], rho):
+            n = self.P.shape[0]
+            K = self.P + self.sigma * np.eye(n) + self.A.T @ (rho[:, None] * self.A)
+            # Inverse explicite (via Cholesky) : une itération coûte un produit matrice-vecteur
+            # au lieu de deux résolutions triangulaires et de leurs vérifications
+            self._factored = (rho.copy(), cho_solve(cho_factor(K), np.eye(n)))
+        return self._factored[1]
+
+    def solve(self, l, u, q=None, rho=0.1, max_iter=4000, eps=1e-5):
+        A, P = self.A, self.P
+        m, n = A.shape
+        l, u = l * self.row_scale, u * self.row_scale
+        q = np.zeros(n) if q is None else q * self.obj_scale
+        eq = np.isclose(l, u)
+        rho_vec = np.where(eq, 1e3 * rho, rho)
+        if self.state is None:
+            x, z, y = np.zeros(n), np.clip(np.zeros(m), l, u), np.zeros(m)
+        else:
+            # Démarrage à chaud depuis la solution précédente (points de la frontière), avec
+            # ses pas si les contraintes d'égalité sont les mêmes : la factorisation est réutilisée
+            x, z, y, previous_eq, previous_rho = self.state
+            z = np.clip(z, l, u)
+            if np.array_equal(previous_eq, eq):
+                rho_vec = previous_rho
+        K_inv = self._factor(rho_vec)
+        for k in range(1, max_iter + 1):
+            x_t = K_inv @ (self.sigma * x - q + A.T @ (rho_vec * z - y))
+            z_t = A @ x_t
+            x = self.alpha * x_t + (1 - self.alpha) * x
+            z_relax = self.alpha * z_t + (1 - self.alpha) * z
+            z_new = np.clip(z_relax + y / rho_vec, l, u)
+            y = y + rho_vec * (z_relax - z_new)
+            z = z_new
+            if k % 25:
+                continue
+            Ax, Px, Aty = A @ x, P @ x, A.T @ y
+            r_prim = np.max(np.abs(Ax - z))
+            r_dual = np.max(np.abs(Px + q + Aty))
+            scale_prim = max(np.max(np.abs(Ax)), np.max(np.abs(z)), 1e-12)
+            scale_dual = max(np.max(np.abs(Px)), np.max(np.abs(Aty)), np.max(np.abs(q)), 1e-12)
+            if r_prim <= eps * (1 + scale_prim) and r_dual <= eps * (1 + scale_dual):
+                break
+            # Pas adaptatif (OSQP) : équilibre les résidus primal et dual
+            ratio = np.sqrt((r_prim / scale_prim) / max(r_dual / scale_dual, 1e-30))
+            if ratio > 5 or ratio < 0.2:
+                rho_vec = np.clip(rho_vec * ratio, 1e-6, 1e6)
+                K_inv = self._factor(rho_vec)
+        else:
+            if r_prim > 1e-3 * (1 + scale_prim):
+                raise ValueError("L'optimisation n'a pas convergé : contraintes probablement incompatibles.")
+        self.state = (x, z, y, eq, rho_vec)
+        return self._polish(x, y, l, u, q)
+
+    def _polish(self, x, y, l, u, q):
+        """Solve exactly with the active set guessed by ADMM; keep ``x`` if that fails.
+
+        Active rows bearing on a single variable (bounds) fix that variable:
+        the KKT system is only solved for the free variables and the other
+        active rows, then the multipliers of the bounds are recovered from
+        stationarity.
+        """
+        A, P = self.A, self.P
+        n = P.shape[0]
+        tol = 1e-7 * max(1.0, np.max(np.abs(y)))
+        lower = (y < -tol) & np.isfinite(l)
+        upper = (y > tol) & np.isfinite(u)
+        active = np.flatnonzero(lower | upper)
+        b = np.where(lower, l, u)
+        nonzero = A[active] != 0
+        single = nonzero.sum(axis=1) == 1
+        bound_rows = active[single]
+        fixed = nonzero[single].argmax(axis=1)
+        if len(np.unique(fixed)) < len(fixed):
+            # Deux bornes actives sur la même variable : ensemble actif incohérent
+            return x
+        rows = active[~single]
+        free = np.ones(n, dtype=bool)
+        free[fixed] = False
+        x_pol = np.zeros(n)
+        x_pol[fixed] = b[bound_rows] / A[bound_rows, fixed]
+        A_rows = A[rows][:, free]
+        k = len(rows)
+        kkt = np.block([[P[np.ix_(free, free)] + 1e-10 * np.eye(free.sum()), A_rows.T],
+                        [A_rows, -1e-10 * np.eye(k)]])
+        rhs = np.concatenate([-q[free] - P[free][:, fixed] @ x_pol[fixed], b[rows] - A[rows][:, fixed] @ x_pol[fixed]])
+        try:
+            sol = np.linalg.solve(kkt, rhs)
+        except np.linalg.LinAlgError:
+            return x
+        x_pol[free] = sol[:free.sum()]
+        y_pol = np.zeros(len(y))
+        y_pol[rows] = sol[free.sum():]
+        y_pol[bound_rows] = -(P @ x_pol + q + A[rows].T @ y_pol[rows])[fixed] / A[bound_rows, fixed]
+        Ax = A @ x_pol
+        feasible = np.all(Ax >= l - 1e-8) and np.all(Ax <= u + 1e-8)
+        signs_ok = np.all(y_pol[lower] <= 1e-9) and np.all(y_pol[upper] >= -1e-9)
+        return x_pol if feasible and signs_ok else x
+
+
+def _portfolio(w, mu, cov, risk_free):
+    w = np.clip(w, 0, None)
+    w = w / w.sum()
+    ret = float(w @ mu)
+    vol = float(np.sqrt(w @ cov @ w))
+    return Portfolio(w, ret, vol, (ret - risk_free) / vol if vol > 0 else np.nan)
+
+
+def _caps(n, max_weight):
+    if max_weight is None:
+        return np.ones(n)
+    caps = np.broadcast_to(np.asarray(max_weight, dtype=float), (n,)).copy()
+    return np.clip(caps, 0.0, 1.0)
+
+
+def _sector_matrix(n, sectors, sector_caps):
+    """Return (S, caps) such that the sector constraints read ``S @ w <= caps``."""
+    if not sectors or not sector_caps:
+        return np.zeros((0, n)), np.zeros(0)
+    names = [s for s in dict.fromkeys(sectors) if s in sector_caps]
+    S = np.array([[1.0 if s == name else 0.0 for s in sectors] for name in names]).reshape(len(names), n)
+    return S, np.array([sector_caps[name] for name in names], dtype=float)
+
+
+def _check_feasible(caps, sectors, sector_caps):
+    if np.sum(caps) < 1 - 1e-9:
+        raise ValueError("Les plafonds par actif sont trop bas : leur somme doit atteindre 100%.")
+    if sectors and sector_caps:
+        capacity = 0.0
+        for sector in dict.fromkeys(sectors):
+            room = sum(caps[i] for i, s in enumerate(sectors) if s == sector)
+            capacity += min(room, sector_caps.get(sector, 1.0))
+        if capacity < 1 - 1e-9:
+            raise ValueError("Les plafonds sectoriels sont trop bas : leur somme doit atteindre 100%.")
+
+
+def _weight_program(mu, cov, caps, sectors, sector_caps):
+    """QP over weights: bounds, budget, sector caps and a (free) target-return row."""
+    n = len(mu)
+    S, s_caps = _sector_matrix(n, sectors, sector_caps)
+    A = np.vstack([np.eye(n), np.ones((1, n)), S, mu[None, :]])
+    l = np.concatenate([np.zeros(n), [1.0], np.full(len(s_caps), -np.inf), [-np.inf]])
+    u = np.concatenate([caps, [1.0], s_caps, [np.inf]])
+    return _QuadraticProgram(cov, A), l, u
+
+
+def min_variance(mu, cov, max_weight=None, sectors=None, sector_caps=None, target_return=None,
+                 risk_free=0.0):
+    """Long-only minimum-variance portfolio, optionally for a target return.
+
+    ``max_weight`` is a cap per asset (scalar or vector), ``sectors`` gives the
+    sector of each asset and ``sector_caps`` maps a sector to its maximum weight.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    caps = _caps(len(mu), max_weight)
+    _check_feasible(caps, sectors, sector_caps)
+    qp, l, u = _weight_program(mu, cov, caps, sectors, sector_caps)
+    if target_return is not None:
+        l[-1] = u[-1] = target_return
+    return _portfolio(qp.solve(l, u), mu, cov, risk_free)
+
+
+def max_sharpe(mu, cov, risk_free=0.0, max_weight=None, sectors=None, sector_caps=None):
+    """Long-only maximum-Sharpe portfolio.
+
+    Solved as the convex problem ``min y' cov y`` subject to ``(mu - rf)' y = 1``
+    and ``y >= 0``, then ``w = y / sum(y)``. The caps become homogeneous linear
+    constraints on ``y``: ``y_i <= cap_i * sum(y)``.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    excess = mu - risk_free
+    if not np.any(excess > 0):
+        raise ValueError("Aucun actif n'a un rendement supérieur au taux sans risque : ratio de Sharpe non maximisable.")
+    caps = _caps(n, max_weight)
+    _check_feasible(caps, sectors, sector_caps)
+    S, s_caps = _sector_matrix(n, sectors, sector_caps)
+    rows = [np.eye(n), excess[None, :]]
+    lows = [np.zeros(n), [1.0]]
+    if max_weight is not None:
+        rows.append(np.outer(caps, np.ones(n)) - np.eye(n))
+        lows.append(np.zeros(n))
+    if len(s_caps):
+        rows.append(np.outer(s_caps, np.ones(n)) - S)
+        lows.append(np.zeros(len(s_caps)))
+    A = np.vstack(rows)
+    l = np.concatenate(lows)
+    u = np.full(len(l), np.inf)
+    u[n] = 1.0
+    y = _QuadraticProgram(cov, A).solve(l, u)
+    return _portfolio(y, mu, cov, risk_free)
+
+
+def max_return(mu, max_weight=None, sectors=None, sector_caps=None):
+    """Highest return reachable under the weight constraints.
+
+    The asset caps are nested in the sector caps, so filling the best assets
+    first is optimal.
+    """
+    mu = np.asarray(mu, dtype=float)
+    caps = _caps(len(mu), max_weight)
+    room = dict(sector_caps or {})
+    left, total = 1.0, 0.0
+    for i in np.argsort(mu)[::-1]:
+        sector = sectors[i] if sectors else None
+        take = min(caps[i], left, room.get(sector, 1.0))
+        if take <= 0:
+            continue
+        total += take * mu[i]
+        left -= take
+        if sector in room:
+            room[sector] -= take
+        if left <= 1e-12:
+            break
+    return total
+
+
+def efficient_frontier(mu, cov, points=30, risk_free=0.0, max_weight=None, sectors=None,
+                       sector_caps=None):
+    """Trace the constrained efficient frontier from the min-variance portfolio upwards.
+
+    Each point solves ``min w' cov w - lambda mu' w`` for a geometric grid of
+    risk aversions, warm-started from its neighbour with the same step sizes,
+    so the points share the factorisation until the step sizes are adapted. Returns a list of ``Portfolio`` ordered by return.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    caps = _caps(len(mu), max_weight)
+    _check_feasible(caps, sectors, sector_caps)
+    qp, l, u = _weight_program(mu, cov, caps, sectors, sector_caps)
+    frontier = [_portfolio(qp.solve(l, u), mu, cov, risk_free)]
+    # Échelle naturelle de lambda : variance typique / dispersion des rendements
+    scale = np.mean(np.diag(cov)) / max(np.ptp(mu), 1e-12)
+    top = max_return(mu, max_weight, sectors, sector_caps)
+    for lam in scale * np.logspace(-3, 2, points - 1):
+        point = _portfolio(qp.solve(l, u, q=-lam * mu), mu, cov, risk_free)
+        if point.ret > frontier[-1].ret + 1e-9:
+            frontier.append(point)
+        if point.ret >= top - 1e-6:
+            break
+    return frontier
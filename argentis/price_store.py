@@ -0,0 +1,201 @@
+"""On-disk daily OHLCV store, partitioned by ticker in Parquet files."""
+import os
+import re
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+import pandas as pd
+
+from . import DATA_DIR
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def period_offset(period):
+    """Convert a yfinance period string ("5d", "6mo", "5y"...) into a DateOffset."""
+    match = _PERIOD_RE.match(period)
+    if match is None:
+        raise ValueError(f"Période non reconnue : {period}")
+    value, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return pd.DateOffset(days=value)
+    if unit == "wk":
+        return pd.DateOffset(weeks=value)
+    if unit == "mo":
+        return pd.DateOffset(months=value)
+    return pd.DateOffset(years=value)
+
+
+def slice_period(df, period):
+    """Keep the bars of a daily history that fall within a yfinance period.
+
+    "Nd" periods count trading days like yfinance does ("5d" = last 5 bars);
+    longer periods are calendar offsets from the last bar.
+    """
+    if df is None or df.empty or period == "max":
+        return df
+    if period == "ytd":
+        return df[df.index >= pd.Timestamp(year=df.index[-1].year, month=1, day=1)]
+    match = _PERIOD_RE.match(period)
+    if match is not None and match.group(2) == "d":
+        return df.iloc[-int(match.group(1)):]
+    return df[df.index >= df.index[-1] - period_offset(period)]
+
+
+def covers_period(base_period, period):
+    """Tell whether a daily history of ``base_period`` contains any ``period`` window."""
+    if period == "max" or base_period == "max":
+        return base_period == "max"
+    if period == "ytd":
+        period = "1y"
+    anchor = pd.Timestamp("2000-01-01")
+    return anchor - period_offset(period) >= anchor - period_offset(base_period)
+
+
+def naive_daily_index(df):
+    """Drop the timezone of a daily index so that tickers from different exchanges align by date."""
+    if df is not None and isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+        df = df.copy()
+        df.index = df.index.tz_localize(None)
+    return df
+
+
+def _has_corporate_action(df):
+    """Tell whether a block of bars contains a dividend or a split."""
+    for col in ("Dividends", "Stock Splits"):
+        if col in df.columns and (df[col].fillna(0) != 0).any():
+            return True
+    return False
+
+
+class PriceStore:
+    """Persist daily bars per ticker and refresh them incrementally.
+
+    Each ticker lives in ``<root>/ticker=<SYMBOL>/data.parquet``. A refresh only
+    asks the provider for the bars after the last stored date; a file touched
+    less than ``max_age`` seconds ago is served without any network call.
+    """
+
+    def __init__(self, root=None, max_age=900):
+        self.root = Path(root) if root is not None else DATA_DIR / "prices"
+        self.max_age = max_age
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, ticker):
+        safe = ticker.strip().upper().replace("/", "_")
+        return self.root / f"ticker={safe}" / "data.parquet"
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.strip().upper(), threading.Lock())
+
+    def load(self, ticker):
+        """Return the stored bars for a ticker, or None if nothing is stored."""
+        path = self._path(ticker)
+        if not path.exists():
+            return None
+        try:
+            return naive_daily_index(pd.read_parquet(path))
+        except Exception:
+            # Fichier corrompu (écriture interrompue...) : on repartira de zéro
+            return None
+
+    def last_date(self, ticker):
+        """Return the date of the last stored bar, or None."""
+        df = self.load(ticker)
+        if df is None or df.empty:
+            return None
+        return df.index[-1]
+
+    def is_fresh(self, ticker):
+        """Tell whether the ticker was refreshed less than ``max_age`` seconds ago."""
+        path = self._path(ticker)
+        return path.exists() and time.time() - path.stat().st_mtime < self.max_age
+
+    def save(self, ticker, df, period=None):
+        """Write the bars for a ticker atomically, trimmed to ``period`` if given."""
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        if period is not None and not df.empty:
+            df = df[df.index >= df.index[-1] - period_offset(period)]
+        path = self._path(ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+        return df
+
+    def append(self, ticker, new, period=None):
+        """Merge freshly downloaded bars into the stored history."""
+        stored = self.load(ticker)
+        if stored is not None and not stored.empty:
+            new = pd.concat([stored, new])
+        return self.save(ticker, new, period=period)
+
+    def history(self, ticker, provider, period="5y", interval="1d", base_period="5y"):
+        """Answer a history request, slicing the stored ``base_period`` when it covers it.
+
+        Only intraday intervals and periods longer than the store hit the network.
+        """
+        return self.history_many([ticker], provider, period, interval, base_period)[ticker]
+
+    def history_many(self, tickers, provider, period="5y", interval="1d", base_period="5y"):
+        """Same as ``history`` for several tickers, with grouped downloads."""
+        if interval != "1d" or not covers_period(base_period, period):
+            return provider.download(tickers, period=period, interval=interval)
+        frames = self.refresh_many(tickers, provider, period=base_period)
+        return {t: slice_period(df, period) for t, df in frames.items()}
+
+    def refresh(self, ticker, provider, period="5y"):
+        """Return the ``period`` daily history of one ticker, downloading only what is missing."""
+        return self.refresh_many([ticker], provider, period=period)[ticker]
+
+    def refresh_many(self, tickers, provider, period="5y"):
+        """Return ``{ticker: history or None}``, with at most two grouped downloads.
+
+        Tickers refreshed less than ``max_age`` seconds ago are served from disk.
+        The others are grouped into one request starting at the oldest of their
+        last stored dates, and one ``period`` request for tickers with nothing
+        stored yet (or whose adjusted history changed after a dividend or split).
+        Spellings of the same symbol ("aapl", " AAPL") share one entry.
+        """
+        symbols = {t: t.strip().upper() for t in tickers}
+        # Une seule fois par symbole : les verrous ne sont pas réentrants
+        unique = list(dict.fromkeys(symbols.values()))
+        result, stale, cold = {}, {}, []
+        with ExitStack() as stack:
+            # Verrous pris dans un ordre fixe pour éviter les interblocages entre sessions
+            for t in sorted(unique):
+                stack.enter_context(self._lock(t))
+            for t in unique:
+                stored = self.load(t)
+                if stored is None or stored.empty:
+                    cold.append(t)
+                elif self.is_fresh(t):
+                    result[t] = stored
+                else:
+                    stale[t] = stored
+
+            if stale:
+                # Dernière barre re-téléchargée : elle pouvait être incomplète (séance en cours)
+                start = min(df.index[-1] for df in stale.values()).strftime("%Y-%m-%d")
+                fetched = provider.download(list(stale), start=start)
+                for t, stored in stale.items():
+                    new = fetched.get(t)
+                    if new is None or new.empty:
+                        os.utime(self._path(t))
+                        result[t] = stored
+                    elif _has_corporate_action(new.loc[new.index > stored.index[-1]]):
+                        # Dividende ou split : les prix ajustés antérieurs changent, on recharge tout
+                        cold.append(t)
+                    else:
+                        result[t] = self.save(t, pd.concat([stored, new.loc[new.index >= stored.index[-1]]]), period=period)
+
+            if cold:
+                fetched = provider.download(cold, period=period)
+                for t in cold:
+                    df = fetched.get(t)
+                    result[t] = self.save(t, df, period=period) if df is not None and not df.empty else None
+        return {t: result.get(s) for t, s in symbols.items()}
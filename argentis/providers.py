@@ -0,0 +1,211 @@
+"""Pluggable daily price providers: Yahoo Finance and an offline fake."""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from .price_store import naive_daily_index, period_offset
+
+
+def price_panel(frames, field="Close"):
+    """Align one column of several OHLCV frames into a date x ticker panel."""
+    columns = {t: df[field] for t, df in frames.items() if df is not None and field in df.columns}
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame(columns).sort_index()
+
+
+class PriceProvider:
+    """Interface of a market data source.
+
+    ``history`` downloads the daily bars of one ticker; ``download`` downloads
+    several tickers and returns ``{ticker: DataFrame or None}``. Bars are
+    requested either with ``period`` (yfinance syntax) or ``start`` ("YYYY-MM-DD").
+    ``info``, ``sustainability`` and ``news`` return the matching yfinance
+    components of one ticker; ``info_many`` returns ``{ticker: info}`` for
+    the tickers that answered.
+    """
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        raise NotImplementedError
+
+    def download(self, tickers, period=None, start=None, interval="1d"):
+        return {t: self.history(t, period=period, start=start, interval=interval) for t in tickers}
+
+    def info(self, ticker):
+        raise NotImplementedError
+
+    def info_many(self, tickers):
+        return {t: self.info(t) for t in tickers}
+
+    def sustainability(self, ticker):
+        raise NotImplementedError
+
+    def news(self, ticker):
+        raise NotImplementedError
+
+
+class YahooProvider(PriceProvider):
+    """Yahoo Finance provider backed by yfinance.
+
+    Every request goes through ``scheduler`` (a FetchScheduler), which applies
+    the process-wide rate limit and the retries.
+    """
+
+    def __init__(self, scheduler, session=None):
+        self.scheduler = scheduler
+        self.session = session
+
+    def _ticker(self, ticker):
+        import yfinance as yf
+
+        return yf.Ticker(ticker, session=self.session)
+
+    def _history(self, ticker, period=None, start=None, interval="1d"):
+        kwargs = {"start": start} if start is not None else {"period": period or "5y"}
+        df = self._ticker(ticker).history(interval=interval, raise_errors=True, **kwargs)
+        return naive_daily_index(df)
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        return self.scheduler.call(self._history, ticker, period=period, start=start, interval=interval)
+
+    def download(self, tickers, period=None, start=None, interval="1d"):
+        # Une requête par ticker, en parallèle sous le limiteur de débit commun
+        results, _ = self.scheduler.map(self._history, tickers, period=period, start=start, interval=interval)
+        return {t: results.get(t) for t in tickers}
+
+    def info(self, ticker):
+        return self.scheduler.call(lambda: self._ticker(ticker).info)
+
+    def info_many(self, tickers):
+        results, _ = self.scheduler.map(lambda t: self._ticker(t).info, tickers)
+        return {t: results[t] for t in tickers if t in results}
+
+    def sustainability(self, ticker):
+        return self.scheduler.call(lambda: self._ticker(ticker).sustainability)
+
+    def news(self, ticker):
+        return self.scheduler.call(lambda: self._ticker(ticker).news)
+
+
+class FakeProvider(PriceProvider):
+    """Deterministic offline provider generating a random walk per ticker.
+
+    The same ticker always yields the same prices, which makes it usable in
+    tests and demos without network access. Tickers listed in ``missing`` return
+    no data, like unknown symbols on Yahoo.
+    """
+
+    def __init__(self, start="2015-01-01", end=None, missing=()):
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize()
+        self.missing = {t.upper() for t in missing}
+        self.calls = []
+
+    def _bars(self, ticker):
+        index = pd.bdate_range(self.start, self.end, name="Date")
+        rng = np.random.default_rng(zlib.crc32(ticker.upper().encode()))
+        rets = rng.normal(0.0004, 0.015, len(index))
+        close = 100 * np.exp(np.cumsum(rets))
+        spread = np.abs(rng.normal(0, 0.005, len(index)))
+        return pd.DataFrame({
+            "Open": close * (1 - spread / 2),
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, len(index)),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        }, index=index)
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        self.calls.append(("history", ticker, period, start))
+        return self._slice(ticker, period, start)
+
+    def download(self, tickers, period=None, start=None, interval="1d"):
+        tickers = list(tickers)
+        self.calls.append(("download", tuple(tickers), period, start))
+        return {t: self._slice(t, period, start) for t in tickers}
+
+    def info(self, ticker):
+        self.calls.append(("info", ticker))
+        if ticker.upper() in self.missing:
+            return {}
+        rng = np.random.default_rng(zlib.crc32(ticker.upper().encode()) + 1)
+        close = float(self._bars(ticker)["Close"].iloc[-1])
+        return {
+            "symbol": ticker.upper(),
+            "longName": f"{ticker.upper()} Inc.",
+            "sector": ["Technology", "Healthcare", "Financial Services", "Energy"][int(rng.integers(4))],
+            "currentPrice": close,
+            "bid": close * 0.999,
+            "ask": close * 1.001,
+            "marketCap": float(rng.uniform(1e9, 2e12)),
+            "totalDebt": float(rng.uniform(1e8, 1e11)),
+            "operatingCashFlow": float(rng.uniform(1e8, 1e11)),
+            "fiftyTwoWeekLow": close * 0.8,
+            "fiftyTwoWeekHigh": close * 1.2,
+            "trailingPE": float(rng.uniform(5, 60)),
+            "priceToBook": float(rng.uniform(0.5, 20)),
+            "returnOnEquity": float(rng.uniform(-0.1, 0.5)),
+            "returnOnAssets": float(rng.uniform(-0.05, 0.2)),
+            "debtToEquity": float(rng.uniform(0, 250)),
+            "currentRatio": float(rng.uniform(0.5, 3)),
+            "quickRatio": float(rng.uniform(0.3, 2.5)),
+            "grossMargins": float(rng.uniform(0.1, 0.8)),
+            "profitMargins": float(rng.uniform(-0.1, 0.4)),
+            "earningsGrowth": float(rng.uniform(-0.3, 0.5)),
+            "dividendYield": float(rng.uniform(0, 0.05)),
+        }
+
+    def sustainability(self, ticker):
+        self.calls.append(("sustainability", ticker))
+        if ticker.upper() in self.missing:
+            return None
+        rng = np.random.default_rng(zlib.crc32(ticker.upper().encode()) + 2)
+        scores = rng.uniform(0, 30, 4).round(2)
+        return pd.DataFrame(
+            {"esgScores": scores},
+            index=["totalEsg", "environmentScore", "socialScore", "governanceScore"]
+        )
+
+    def news(self, ticker):
+        self.calls.append(("news", ticker))
+        if ticker.upper() in self.missing:
+            return []
+        now = int(self.end.timestamp())
+        titles = [
+            f"{ticker.upper()} reports strong quarterly gain",
+            f"Analysts see weak demand for {ticker.upper()} products",
+            f"{ticker.upper()} announces new partnership",
+        ]
+        return [
+            {
+                "uuid": f"{ticker.upper()}-{i}",
+                "title": title,
+                "publisher": "Fake Wire",
+                "link": f"https://example.com/{ticker.lower()}/{i}",
+                "providerPublishTime": now - 3600 * i,
+                "relatedTickers": [ticker.upper()],
+            }
+            for i, title in enumerate(titles)
+        ]
+
+    def _slice(self, ticker, period, start):
+        if ticker.upper() in self.missing:
+            return None
+        df = self._bars(ticker)
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start)]
+        if period and period != "max":
+            return df[df.index >= df.index[-1] - period_offset(period)]
+        return df
+
+
+def make_provider(name, scheduler, session=None):
+    """Build a provider from its name ("yahoo" or "fake")."""
+    if name == "yahoo":
+        return YahooProvider(scheduler, session=session)
+    if name == "fake":
+        return FakeProvider()
+    raise ValueError(f"Fournisseur de données inconnu : {name}")
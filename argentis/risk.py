@@ -0,0 +1,123 @@
+"""Portfolio VaR and CVaR: historical, parametric (delta-normal) and Monte Carlo.
+
+VaR and CVaR are expressed like the per-asset figures of the risk page: as
+the ``alpha`` quantile of the portfolio return (a negative number for a
+loss) and the mean return beyond that quantile.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+RiskEstimate = namedtuple("RiskEstimate", "var cvar")
+
+METHODS = {
+    "historical": "Historique",
+    "parametric": "Paramétrique",
+    "monte_carlo": "Monte Carlo",
+}
+
+# Lois des tirages Monte Carlo : degrés de liberté de la Student-t (None pour la loi normale)
+TAILS = {
+    "Normales": None,
+    "Épaisses (Student-t, 5 ddl)": 5,
+    "Très épaisses (Student-t, 3 ddl)": 3,
+}
+
+
+def covariance_factor(cov):
+    """Return L such that ``L @ L.T == cov``; falls back to an eigen-decomposition if ``cov`` is singular."""
+    cov = np.asarray(cov, dtype=float)
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        # Matrice seulement semi-définie (actifs redondants, historique court)
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0, None))
+
+
+def historical_var(rets, weights, alpha=0.05, horizon=1):
+    """VaR/CVaR from the empirical distribution of overlapping ``horizon``-day portfolio returns."""
+    port = pd.Series(np.asarray(rets, dtype=float) @ np.asarray(weights, dtype=float))
+    if horizon > 1:
+        port = port.rolling(horizon).sum().dropna()
+    var = float(port.quantile(alpha))
+    return RiskEstimate(var, float(port[port <= var].mean()))
+
+
+def parametric_var(mu, cov, weights, alpha=0.05, horizon=1):
+    """Delta-normal VaR/CVaR from daily mean vector and covariance."""
+    w = np.asarray(weights, dtype=float)
+    m = float(w @ mu) * horizon
+    s = float(np.sqrt(w @ cov @ w * horizon))
+    z = norm.ppf(alpha)
+    return RiskEstimate(m + z * s, m - s * norm.pdf(z) / alpha)
+
+
+def monte_carlo_var(mu, cov, weights, alpha=0.05, horizon=1, sims=100_000, rng=None, dof=None,
+                    memory_budget=64 * 2 ** 20):
+    """VaR/CVaR of ``horizon``-day paths of correlated daily asset returns ``mu + z @ L.T``.
+
+    ``L`` is the Cholesky factor of ``cov``. Every path draws ``horizon`` days
+    of asset returns, sums them per asset and weights them into a portfolio
+    P&L; no ``sqrt(horizon)`` scaling is applied. ``dof`` switches to
+    multivariate Student-t days with the same covariance, for fatter tails
+    than the delta-normal estimate. Paths are generated by chunks sized on
+    ``horizon x n_assets`` to fit ``memory_budget``; each chunk is cut to its
+    ``k = ceil(alpha * sims)`` worst P&L before being merged with the worst
+    ones so far, which is all VaR and CVaR need.
+    """
+    mu = np.asarray(mu, dtype=float)
+    w = np.asarray(weights, dtype=float)
+    L = covariance_factor(cov)
+    n = len(mu)
+    rng = rng if rng is not None else np.random.default_rng()
+    k = max(1, int(np.ceil(alpha * sims)))
+    # Tirages (chemins, jours, actifs) et rendements cumulés (chemins, actifs)
+    chunk = max(1, int(memory_budget // ((horizon + 1) * n * 8)))
+
+    tail = np.empty(0)
+    for start in range(0, sims, chunk):
+        size = min(chunk, sims - start)
+        z = rng.standard_normal((size, horizon, n))
+        if dof is not None:
+            # Student-t multivariée de même covariance, un mélange chi2 par jour : z * sqrt((dof - 2) / chi2)
+            z *= np.sqrt((dof - 2) / rng.chisquare(dof, (size, horizon, 1)))
+        # Rendements des actifs sur l'horizon : somme des jours corrélés mu + z @ L.T
+        assets = mu * horizon + z.sum(axis=1) @ L.T
+        port = assets @ w
+        if size > k:
+            port = np.partition(port, k - 1)[:k]
+        tail = np.concatenate([tail, port])
+        if len(tail) > k:
+            tail = np.partition(tail, k - 1)[:k]
+    tail.sort()
+    return RiskEstimate(float(tail[-1]), float(tail.mean()))
+
+
+def portfolio_risk(rets, weights, alpha=0.05, horizons=(1, 5, 10), sims=100_000, rng=None, dof=None,
+                   on_progress=None, seed=None):
+    """VaR and CVaR of a portfolio for every method and horizon.
+
+    ``rets`` is a frame of daily returns (one column per asset). Returns two
+    frames (VaR, CVaR) indexed by method label with one column per horizon.
+    ``on_progress(done, total)`` is called after each horizon. Without
+    ``rng``, draws come from a generator seeded with ``seed``.
+    """
+    weights = np.asarray(weights, dtype=float)
+    mu = rets.mean().to_numpy()
+    cov = rets.cov().to_numpy()
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    var, cvar = {}, {}
+    for h in horizons:
+        estimates = {
+            "historical": historical_var(rets, weights, alpha, h),
+            "parametric": parametric_var(mu, cov, weights, alpha, h),
+            "monte_carlo": monte_carlo_var(mu, cov, weights, alpha, h, sims=sims, rng=rng, dof=dof),
+        }
+        var[h] = {METHODS[k]: e.var for k, e in estimates.items()}
+        cvar[h] = {METHODS[k]: e.cvar for k, e in estimates.items()}
+        if on_progress is not None:
+            on_progress(len(var), len(horizons))
+    return pd.DataFrame(var), pd.DataFrame(cvar)
@@ -0,0 +1,299 @@
+"""Streaming rolling risk metrics, persisted between sessions.
+
+Each accumulator consumes one bar at a time: Welford moments with removal for
+volatility and correlation, a sorted window for the historical VaR and
+monotonic deques for the window peak and the worst drawdown. Their state is
+pickled per ticker, so a new trading day only costs the new bars.
+"""
+import bisect
+import copy
+import math
+import os
+import pickle
+import threading
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_DIR
+from .frontier import TRADING_DAYS
+
+
+class RollingMoments:
+    """Mean and variance of the last ``window`` values (Welford, with removal)."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x):
+        self.values.append(x)
+        delta = x - self.mean
+        self.mean += delta / len(self.values)
+        self.m2 += delta * (x - self.mean)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            delta = old - self.mean
+            self.mean -= delta / len(self.values)
+            self.m2 -= delta * (old - self.mean)
+
+    @property
+    def count(self):
+        return len(self.values)
+
+    @property
+    def variance(self):
+        return max(self.m2, 0.0) / (self.count - 1) if self.count > 1 else math.nan
+
+
+class RollingCovariance:
+    """Variances and covariance of the last ``window`` pairs (Welford co-moments)."""
+
+    def __init__(self, window):
+        self.window = window
+        self.pairs = deque()
+        self.mean_x = self.mean_y = 0.0
+        self.cxx = self.cyy = self.cxy = 0.0
+
+    def push(self, x, y):
+        self.pairs.append((x, y))
+        n = len(self.pairs)
+        dx, dy = x - self.mean_x, y - self.mean_y
+        self.mean_x += dx / n
+        self.mean_y += dy / n
+        self.cxx += dx * (x - self.mean_x)
+        self.cyy += dy * (y - self.mean_y)
+        self.cxy += dx * (y - self.mean_y)
+        if n > self.window:
+            x, y = self.pairs.popleft()
+            n -= 1
+            dx, dy = x - self.mean_x, y - self.mean_y
+            self.mean_x -= dx / n
+            self.mean_y -= dy / n
+            self.cxx -= dx * (x - self.mean_x)
+            self.cyy -= dy * (y - self.mean_y)
+            self.cxy -= dx * (y - self.mean_y)
+
+    @property
+    def count(self):
+        return len(self.pairs)
+
+    @property
+    def correlation(self):
+        denom = math.sqrt(max(self.cxx, 0.0) * max(self.cyy, 0.0))
+        return self.cxy / denom if denom > 0 else math.nan
+
+
+class RollingQuantile:
+    """Quantiles of the last ``window`` values, kept sorted (binary search on insert and removal)."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.sorted = []
+
+    def push(self, x):
+        self.values.append(x)
+        bisect.insort(self.sorted, x)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            del self.sorted[bisect.bisect_left(self.sorted, old)]
+
+    def quantile(self, q):
+        """Linear interpolation between order statistics, like ``pandas.Series.quantile``."""
+        if not self.sorted:
+            return math.nan
+        pos = q * (len(self.sorted) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(self.sorted) - 1)
+        return self.sorted[lo] + (pos - lo) * (self.sorted[hi] - self.sorted[lo])
+
+
+class RollingExtremum:
+    """Maximum (or minimum) of the last ``window`` values with a monotonic deque."""
+
+    def __init__(self, window, maximum=True):
+        self.window = window
+        self.sign = 1.0 if maximum else -1.0
+        self.queue = deque()
+        self.seen = 0
+
+    def push(self, x):
+        v = self.sign * x
+        while self.queue and self.queue[-1][1] <= v:
+            self.queue.pop()
+        self.queue.append((self.seen, v))
+        self.seen += 1
+        if self.queue[0][0] <= self.seen - 1 - self.window:
+            self.queue.popleft()
+
+    @property
+    def value(self):
+        return self.sign * self.queue[0][1] if self.queue else math.nan
+
+
+class _StreamingMetric:
+    """Rolling metrics of a frame fed one bar at a time.
+
+    ``update`` commits every new bar but the last one, which may still change
+    (session in progress, see ``PriceStore.refresh_many``): it is evaluated on
+    a copy of the accumulators and never persisted.
+    """
+
+    columns = ()
+
+    def __init__(self, window):
+        self.window = window
+        self.acc = self._accumulators()
+        self.last_date = None
+        self.last_row = None
+        self.dates = []
+        self.rows = []
+
+    def _accumulators(self):
+        raise NotImplementedError
+
+    def _push(self, acc, values):
+        raise NotImplementedError
+
+    def consistent(self, frame):
+        """Tell whether ``frame`` extends the bars already consumed (no restated prices)."""
+        if self.last_date is None:
+            return True
+        if self.last_date not in frame.index:
+            return False
+        return np.allclose(frame.loc[self.last_date].to_numpy(dtype=float), self.last_row, rtol=1e-9, atol=0)
+
+    def update(self, frame):
+        """Consume the bars of ``frame`` after the last committed one; return all metrics."""
+        new = frame if self.last_date is None else frame[frame.index > self.last_date]
+        values = new.to_numpy(dtype=float)
+        for date, row in zip(new.index[:-1], values[:-1]):
+            self.rows.append(self._push(self.acc, row))
+            self.dates.append(date)
+            self.last_date, self.last_row = date, row
+        dates, rows = self.dates, self.rows
+        if len(new):
+            dates = dates + [new.index[-1]]
+            rows = rows + [self._push(copy.deepcopy(self.acc), values[-1])]
+        return pd.DataFrame(rows, index=pd.DatetimeIndex(dates), columns=list(self.columns))
+
+
+class RollingRisk(_StreamingMetric):
+    """Annualized volatility, historical VaR, drawdown and max drawdown of one close series.
+
+    The drawdown is measured from the highest close of the trailing window and
+    the max drawdown is the worst drawdown of the window.
+    """
+
+    columns = ("volatility", "var", "drawdown", "max_drawdown")
+
+    def __init__(self, window=63, alpha=0.05):
+        self.alpha = alpha
+        super().__init__(window)
+
+    def _accumulators(self):
+        return {
+            "prev": None,
+            "moments": RollingMoments(self.window),
+            "quantile": RollingQuantile(self.window),
+            "peak": RollingExtremum(self.window, maximum=True),
+            "trough": RollingExtremum(self.window, maximum=False),
+        }
+
+    def _push(self, acc, values):
+        price = values[0]
+        acc["peak"].push(price)
+        drawdown = price / acc["peak"].value - 1
+        acc["trough"].push(drawdown)
+        prev, acc["prev"] = acc["prev"], price
+        if prev is None:
+            return (math.nan, math.nan, drawdown, acc["trough"].value)
+        r = price / prev - 1
+        acc["moments"].push(r)
+        acc["quantile"].push(r)
+        if acc["moments"].count < self.window:
+            return (math.nan, math.nan, drawdown, acc["trough"].value)
+        vol = math.sqrt(acc["moments"].variance * TRADING_DAYS)
+        return (vol, acc["quantile"].quantile(self.alpha), drawdown, acc["trough"].value)
+
+
+class RollingCorrelation(_StreamingMetric):
+    """Correlation of the daily returns of two close series."""
+
+    columns = ("correlation",)
+
+    def _accumulators(self):
+        return {"prev": None, "cov": RollingCovariance(self.window)}
+
+    def _push(self, acc, values):
+        prev, acc["prev"] = acc["prev"], values
+        if prev is None:
+            return (math.nan,)
+        ra, rb = values / prev - 1
+        acc["cov"].push(ra, rb)
+        return (acc["cov"].correlation if acc["cov"].count >= self.window else math.nan,)
+
+
+class RollingStore:
+    """Persist rolling accumulators in ``<root>/<key>.pkl`` and update them incrementally.
+
+    A state whose last bar no longer matches the prices (adjusted history
+    restated after a dividend or split) is rebuilt from scratch.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else DATA_DIR / "rolling"
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, key):
+        return self.root / f"{key.replace('/', '_')}.pkl"
+
+    def _lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _load(self, key):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _save(self, key, state):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def _update(self, key, frame, factory):
+        with self._lock(key):
+            state = self._load(key)
+            if state is None or not state.consistent(frame):
+                state = factory()
+            last = state.last_date
+            result = state.update(frame)
+            if state.last_date != last:
+                self._save(key, state)
+            return result
+
+    def risk(self, ticker, close, window=63, alpha=0.05):
+        """Rolling volatility, VaR and drawdowns of one close series (see ``RollingRisk``)."""
+        key = f"risk_{ticker.upper()}_{window}_{alpha:g}"
+        return self._update(key, close.dropna().to_frame(), lambda: RollingRisk(window, alpha))
+
+    def correlation(self, a, b, close_a, close_b, window=63):
+        """Rolling correlation of the daily returns of two tickers."""
+        key = f"corr_{a.upper()}_{b.upper()}_{window}"
+        frame = pd.concat([close_a, close_b], axis=1).dropna()
+        return self._update(key, frame, lambda: RollingCorrelation(window))["correlation"]
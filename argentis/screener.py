@@ -0,0 +1,112 @@
+"""Vectorized stock screener over a table of fundamentals.
+
+The universe is a frame with one row per ticker and one typed column per
+fundamental (``FIELDS``). Scoring rules are column expressions evaluated by
+``DataFrame.eval`` on the whole table at once; the first rule a ticker
+satisfies gives its score, like the cascade of conditions of the former
+per-ticker loop.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Colonne du tableau -> champ de l'info yfinance
+FIELDS = {
+    "pe": "trailingPE",
+    "pb": "priceToBook",
+    "roe": "returnOnEquity",
+    "roa": "returnOnAssets",
+    "growth": "earningsGrowth",
+    "debt_to_equity": "debtToEquity",
+    "current_ratio": "currentRatio",
+    "quick_ratio": "quickRatio",
+    "gross_margin": "grossMargins",
+    "net_margin": "profitMargins",
+    "dividend_yield": "dividendYield",
+    "market_cap": "marketCap",
+    "price": "currentPrice",
+}
+TEXT_FIELDS = {"name": "longName", "sector": "sector"}
+
+Rule = namedtuple("Rule", "condition score")
+
+# Règles historiques de la page : une valeur manquante (NaN) ne vérifie aucune comparaison,
+# et "x == x" n'est vrai que si x est renseigné
+DEFAULT_RULES = [
+    Rule("pe < 20 and growth > 0", 5),
+    Rule("pe > 30 and growth == growth", 1),
+    Rule("pe == pe and growth == growth", 3),
+]
+
+
+def fundamentals_table(infos):
+    """Build the screening table from ``{ticker: info}``; non-numeric values become NaN."""
+    tickers = list(infos)
+    columns = {
+        col: pd.to_numeric(pd.Series([infos[t].get(key) for t in tickers], index=tickers, dtype=object),
+                           errors="coerce").astype(float)
+        for col, key in FIELDS.items()
+    }
+    for col, key in TEXT_FIELDS.items():
+        columns[col] = pd.Series([infos[t].get(key) for t in tickers], index=tickers, dtype="string")
+    return pd.DataFrame(columns, index=pd.Index(tickers, name="ticker"))
+
+
+def parse_rules(text):
+    """Read rules written one per line as ``condition : score`` (``#`` starts a comment)."""
+    rules = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        condition, sep, score = line.rpartition(":")
+        try:
+            if not sep or not condition.strip():
+                raise ValueError
+            rules.append(Rule(condition.strip(), float(score)))
+        except ValueError:
+            raise ValueError(f"Ligne {number} : « condition : score » attendu, « {line} » reçu.") from None
+    return rules
+
+
+def format_rules(rules):
+    return "\n".join(f"{r.condition} : {r.score:g}" for r in rules)
+
+
+def _mask(table, expression):
+    try:
+        result = table.eval(expression)
+    except Exception as e:
+        raise ValueError(f"Expression invalide « {expression} » : {e}") from None
+    if np.ndim(result) == 0:
+        return np.full(len(table), bool(result))
+    return np.asarray(pd.Series(result, index=table.index).fillna(False), dtype=bool)
+
+
+def score(table, rules=DEFAULT_RULES, default=0.0):
+    """Score of every row: that of the first rule it satisfies, ``default`` otherwise."""
+    if table.empty:
+        return pd.Series(dtype=float)
+    conditions = [_mask(table, r.condition) for r in rules]
+    values = np.select(conditions, [float(r.score) for r in rules], default=default) if rules else default
+    return pd.Series(values, index=table.index, dtype=float, name="score")
+
+
+def screen(table, rules=DEFAULT_RULES, where=None, sort_by="score", k=None, ascending=False):
+    """Filter the table with ``where``, score it and return the top ``k`` rows sorted by ``sort_by``.
+
+    Only the ``k`` best rows are sorted (``argpartition``); rows whose sort
+    value is missing come last.
+    """
+    table = table.assign(score=score(table, rules))
+    if where:
+        table = table[_mask(table, where)]
+    keys = table[sort_by].to_numpy(dtype=float)
+    keys = np.where(np.isnan(keys), np.inf, keys if ascending else -keys)
+    if k is not None and k < len(keys):
+        top = np.argpartition(keys, k - 1)[:k]
+        top = top[np.argsort(keys[top], kind="stable")]
+    else:
+        top = np.argsort(keys, kind="stable")
+    return table.iloc[top]
@@ -0,0 +1,167 @@
+"""Lexicon-based headline sentiment, scored in batches.
+
+A batch of headlines is joined into one text and tokenized once with a
+small fixed pattern; every word is then resolved through dict lookups in
+the lexicon (``term<TAB>weight`` lines, ``*`` marking a prefix), so the cost
+does not grow with the size of the lexicon. Each word is credited to its
+headline through the offsets of the join. A term preceded by a negation
+("not", "doesn't", "ne", "n'", "sans"...) within ``NEGATION_WINDOW`` words of
+the same headline and clause counts with the opposite sign. Scores are
+memoized by headline hash, so headlines already seen are not scanned again.
+"""
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_LEXICON = Path(__file__).resolve().parent / "lexicon.tsv"
+
+LABELS = {1: "Positif", 0: "Neutre", -1: "Négatif"}
+
+# Négations (anglais et français, normalisées) : mots entiers, plus les contractions en n't et l'élision n'
+NEGATIONS = frozenset(("not", "no", "never", "without", "none", "nor", "neither", "cannot",
+                       "ne", "pas", "sans", "jamais", "aucun", "aucune", "ni"))
+# Fins de proposition, au-delà desquelles une négation ne porte plus
+CLAUSE_WORDS = frozenset(("but", "mais"))
+# Ponctuation de fin de proposition, contraction ou élision négative, mot (traits d'union compris)
+TOKEN_PATTERN = re.compile(r"(?P<stop>[,;:.!?])|(?<!\w)(?P<neg>\w+n['\u2019]t(?!\w)|n['\u2019](?=\w))|\w+(?:-\w+)*")
+# Nombre de mots après une négation dont le poids change de signe
+NEGATION_WINDOW = 3
+
+
+def normalize(text):
+    """Casefold and strip accents, so that "Hausse" and "hausse", "dégradé" and "degrade" match alike."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def read_lexicon(path):
+    """Read a ``term<TAB>weight`` file (``#`` starts a comment) into a dict."""
+    lexicon = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                term, weight = line.rsplit(None, 1)
+                lexicon[term] = float(weight)
+    return lexicon
+
+
+class SentimentEngine:
+    """Score headlines with a weighted lexicon of single words.
+
+    Terms (hyphens allowed) ending with ``*`` match every word starting with
+    them; an exact term takes precedence over a prefix, and a longer prefix
+    over a shorter one. A hyphenated word without an entry of its own takes
+    the weights of its parts. A term at most ``negation_window`` words after
+    a negation, in the same clause, counts with the opposite sign. At most
+    ``cache_size`` headline scores are memoized (LRU).
+    """
+
+    def __init__(self, lexicon, cache_size=100_000, negation_window=NEGATION_WINDOW):
+        self.exact, self.prefixes = {}, {}
+        for term, weight in lexicon.items():
+            if term.endswith("*"):
+                self.prefixes[normalize(term[:-1])] = float(weight)
+            else:
+                self.exact[normalize(term)] = float(weight)
+        if not self.exact and not self.prefixes:
+            raise ValueError("Le lexique est vide.")
+        self.max_prefix = max(map(len, self.prefixes), default=0)
+        # Poids par mot rencontré : le vocabulaire des titres est bien plus petit que leur nombre
+        self._word_weight = lru_cache(maxsize=cache_size)(self._resolve)
+        self.negation_window = negation_window
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_LEXICON, **kwargs):
+        return cls(read_lexicon(path), **kwargs)
+
+    def weight(self, word):
+        """Weight of a normalized word: exact entry, else its longest prefix entry."""
+        if word in self.exact:
+            return self.exact[word]
+        for k in range(min(len(word), self.max_prefix), 0, -1):
+            if word[:k] in self.prefixes:
+                return self.prefixes[word[:k]]
+        return 0.0
+
+    def _resolve(self, word):
+        """Kind (0 word, 1 negation, 2 end of clause) and weight of a normalized token."""
+        if word in NEGATIONS:
+            return 1, 0.0
+        if word in CLAUSE_WORDS:
+            return 2, 0.0
+        value = self.weight(word)
+        if not value and "-" in word:
+            value = sum(self.weight(part) for part in word.split("-"))
+        return 0, value
+
+    def _scan(self, texts):
+        """Score normalized texts in one pass over their join."""
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        positions, weights, kinds = [], [], []
+        resolve = self._word_weight
+        for m in TOKEN_PATTERN.finditer("\n".join(texts)):
+            positions.append(m.start())
+            if m.lastgroup == "stop":
+                kind, value = 2, 0.0
+            elif m.lastgroup == "neg":
+                kind, value = 1, 0.0
+            else:
+                kind, value = resolve(m.group())
+            kinds.append(kind)
+            weights.append(value)
+        owners = np.searchsorted(starts, np.asarray(positions, dtype=np.int64), side="right") - 1
+        weights = np.asarray(weights)
+        kinds = np.asarray(kinds, dtype=np.int8)
+        if (kinds == 1).any():
+            # Rang de chaque mot, de la dernière négation et de la dernière fin de proposition qui le précèdent
+            order = np.arange(len(kinds))
+            last = np.maximum.accumulate(np.where(kinds == 1, order, -1))
+            stop = np.maximum.accumulate(np.where(kinds == 2, order, -1))
+            negated = ((last > stop) & (order - last <= self.negation_window)
+                       & (owners[np.maximum(last, 0)] == owners))
+            weights = np.where(negated, -weights, weights)
+        return np.bincount(owners, weights=weights, minlength=len(texts))
+
+    def score(self, headlines):
+        """Return the sum of the lexicon weights found in each headline (an array)."""
+        keys = [hashlib.sha1(h.encode("utf-8")).digest() for h in headlines]
+        scores = np.empty(len(keys))
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[i] = self._cache[key]
+                else:
+                    missing.setdefault(key, []).append(i)
+        if missing:
+            first = [rows[0] for rows in missing.values()]
+            fresh = self._scan([normalize(headlines[i]).replace("\n", " ") for i in first])
+            with self._lock:
+                for (key, rows), value in zip(missing.items(), fresh):
+                    scores[rows] = value
+                    self._cache[key] = value
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return scores
+
+    def label(self, headlines):
+        """Return "Positif", "Neutre" or "Négatif" for each headline."""
+        return [LABELS[int(s)] for s in np.sign(self.score(headlines))]
+
+
+def default_engine():
+    """Engine on the lexicon named by ``ARGENTIS_LEXICON``, or the bundled one."""
+    return SentimentEngine.from_file(os.environ.get("ARGENTIS_LEXICON", DEFAULT_LEXICON))
@@ -0,0 +1,74 @@
+"""Reproducible simulations: seeded random streams and a cache of their results.
+
+Every simulation draws from ``np.random.Generator`` objects derived from an
+explicit seed. Work split into chunks gets one independent stream per chunk,
+spawned from the seed's ``SeedSequence``, so the result does not depend on
+how many workers evaluate the chunks. A simulation is then a pure function
+of its inputs, and its result is stored on disk under the hash of (name,
+tickers, period, data, number of draws, seed, parameters).
+"""
+import hashlib
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_DIR
+from .disk_cache import DiskCache, pickle_dumps
+
+DEFAULT_SEED = 42
+
+
+def spawn_generators(seed, count):
+    """``count`` independent generators spawned from ``seed`` (an int or a ``SeedSequence``)."""
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(s) for s in sequence.spawn(count)]
+
+
+def update_hash(h, value):
+    """Add a value to a running hash: frames and arrays by content, containers item by item."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(repr(value.columns if isinstance(value, pd.DataFrame) else value.name).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Index):
+        h.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(f"{value.dtype}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, dict):
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode())
+            update_hash(h, value[k])
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}".encode())
+        for v in value:
+            update_hash(h, v)
+    else:
+        h.update(repr(value).encode())
+
+
+def data_hash(data):
+    """Hash of the content of a frame, series or array (index and labels included)."""
+    h = hashlib.sha1()
+    update_hash(h, data if isinstance(data, (pd.DataFrame, pd.Series)) else np.asarray(data))
+    return h.hexdigest()
+
+
+def simulation_key(name, tickers, period, data, sims, seed, **params):
+    """Key of a simulation: its inputs, the data being hashed by content."""
+    payload = (name, tuple(tickers), period, data_hash(data), int(sims), seed, sorted(params.items()))
+    return hashlib.sha1(repr(payload).encode()).hexdigest()
+
+
+class SimulationCache:
+    """LRU store of simulation results in ``<root>/<key>.pkl``, at most ``max_entries`` files."""
+
+    def __init__(self, root=None, max_entries=256):
+        self.root = Path(root) if root is not None else DATA_DIR / "simulations"
+        self.max_entries = max_entries
+        self._files = DiskCache(self.root, max_entries, dumps=pickle_dumps, loads=pickle.loads)
+
+    def run(self, key, fn, *args, **kwargs):
+        """Result of ``fn(*args, **kwargs)`` stored under ``key``, computed only if not cached."""
+        return self._files.get_or_create(f"{key}.pkl", lambda: fn(*args, **kwargs))
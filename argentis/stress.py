@@ -0,0 +1,207 @@
+"""Stress tests of a set of assets under a whole library of scenarios at once.
+
+A scenario transforms the matrix of daily returns: an immediate shock per
+asset (the loss or gain of the first day), a multiplier of each asset's
+deviations from its mean (calmer or more agitated markets) and, optionally,
+a random daily noise on that multiplier. Scenarios come from historical
+replays (worst windows and dated episodes of the stored history), factor
+shocks (market moves transmitted through each asset's beta) and vectors
+typed by the user. All scenarios are stacked into arrays and applied to the
+returns in one broadcast ``(scenario, day, asset)`` tensor, from which every
+metric is reduced along the days.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .frontier import TRADING_DAYS
+
+# shock : choc immédiat par actif, scale : multiplicateur des écarts à la moyenne,
+# noise : écart-type du bruit journalier appliqué à ce multiplicateur
+Scenario = namedtuple("Scenario", "name kind shock scale noise")
+
+KINDS = {
+    "historical": "Historique",
+    "factor": "Facteur",
+    "custom": "Personnalisé",
+}
+
+METRICS = {
+    "shock": "Choc (%)",
+    "var": "VaR 1 jour (%)",
+    "cvar": "CVaR 1 jour (%)",
+    "volatility": "Volatilité annualisée (%)",
+    "return": "Rendement cumulé (%)",
+    "max_drawdown": "Drawdown max (%)",
+}
+
+PORTFOLIO = "Portefeuille"
+
+# Pires fenêtres de l'historique stocké (jours de bourse)
+HISTORICAL_WINDOWS = {
+    "Pire semaine": 5,
+    "Pire mois": 21,
+    "Pire trimestre": 63,
+}
+
+# Épisodes datés, rejoués s'ils sont couverts par l'historique
+EPISODES = {
+    "Krach Covid (2020)": ("2020-02-19", "2020-03-23"),
+    "Resserrement monétaire (2022)": ("2022-01-03", "2022-10-12"),
+    "Banques régionales (2023)": ("2023-03-08", "2023-03-17"),
+    "Débouclage du carry trade (2024)": ("2024-07-16", "2024-08-05"),
+}
+
+MARKET_MOVES = (-0.30, -0.20, -0.10, -0.05, 0.05, 0.10, 0.20)
+VOL_MULTIPLIERS = (1.0, 1.5, 2.0)
+VOLATILITY_NOISE = 0.25
+
+
+def _scenario(name, kind, shock, scale=1.0, noise=0.0):
+    return Scenario(name, kind, np.asarray(shock, dtype=float), np.asarray(scale, dtype=float), float(noise))
+
+
+def historical_scenarios(prices, windows=HISTORICAL_WINDOWS, episodes=EPISODES):
+    """Replays of past moves of ``prices`` (one column per asset) as immediate shocks.
+
+    A window scenario takes the returns of every asset over the worst
+    ``days``-day stretch of the equal-weighted portfolio; an episode those
+    between its two dates, assets not yet listed taking the average move.
+    """
+    prices = prices.sort_index()
+    log_rets = np.log(prices).diff().iloc[1:]
+    scenarios = []
+    for name, days in windows.items():
+        if len(log_rets) < days:
+            continue
+        window = log_rets.rolling(days).sum()
+        end = window.mean(axis=1, skipna=True).idxmin()
+        if pd.isna(end):
+            continue
+        shock = np.expm1(window.loc[end].to_numpy(dtype=float))
+        scenarios.append(_scenario(name, "historical", np.where(np.isnan(shock), np.nanmean(shock), shock)))
+    for name, (start, end) in episodes.items():
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if prices.empty or prices.index[0] > start or prices.index[-1] < end:
+            continue
+        shock = (prices.asof(end) / prices.asof(start) - 1).to_numpy(dtype=float)
+        if np.isnan(shock).all():
+            continue
+        scenarios.append(_scenario(name, "historical", np.where(np.isnan(shock), np.nanmean(shock), shock)))
+    return scenarios
+
+
+def betas(rets):
+    """Beta of every asset against the equal-weighted portfolio of all of them."""
+    market = rets.mean(axis=1).to_numpy(dtype=float)
+    x = rets.to_numpy(dtype=float)
+    variance = market.var(ddof=1)
+    if not variance > 0:
+        return np.ones(x.shape[1])
+    return ((x - x.mean(axis=0)) * (market - market.mean())[:, None]).sum(axis=0) / (len(market) - 1) / variance
+
+
+def factor_scenarios(rets, market_moves=MARKET_MOVES, vol_multipliers=VOL_MULTIPLIERS, noise=VOLATILITY_NOISE):
+    """Market moves transmitted through each asset's beta, for every volatility multiplier.
+
+    A "Volatilité élevée" scenario adds a random daily noise of standard
+    deviation ``noise`` on the deviations of every asset.
+    """
+    beta = betas(rets)
+    scenarios = []
+    for scale in vol_multipliers:
+        for move in market_moves:
+            name = f"Marché {move * 100:+.0f} %" + (f", volatilité ×{scale:g}" if scale != 1 else "")
+            scenarios.append(_scenario(name, "factor", beta * move, scale))
+    if noise:
+        scenarios.append(_scenario("Volatilité élevée", "factor", np.zeros(len(beta)), 1.0, noise))
+    return scenarios
+
+
+def parse_scenarios(text, assets):
+    """Read user scenarios written one per line as ``name : shock %[, shock %...]``.
+
+    Shocks are in percent, one per asset in the order of ``assets``; a single
+    value applies to every asset. ``#`` starts a comment; two lines may not
+    share a name.
+    """
+    scenarios, seen = [], set()
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        name, sep, values = line.partition(":")
+        try:
+            if not sep or not name.strip():
+                raise ValueError
+            shock = [float(v) / 100 for v in values.split(",")]
+        except ValueError:
+            raise ValueError(f"Ligne {number} : « nom : choc %, choc %, ... » attendu, « {line} » reçu.") from None
+        if len(shock) == 1:
+            shock = shock * len(assets)
+        if len(shock) != len(assets):
+            raise ValueError(f"Ligne {number} : {len(assets)} chocs attendus (un par actif), {len(shock)} reçus.")
+        if name.strip() in seen:
+            raise ValueError(f"Ligne {number} : le scénario « {name.strip()} » est déjà défini.")
+        seen.add(name.strip())
+        scenarios.append(_scenario(name.strip(), "custom", shock))
+    return scenarios
+
+
+def stress_test(rets, scenarios, weights=None, alpha=0.05, rng=None):
+    """Metrics of every asset (and of the portfolio ``weights``) under every scenario.
+
+    ``rets`` is a frame of daily returns (one column per asset). Returns a
+    frame indexed by (scenario, asset) with one column per metric of
+    ``METRICS``, in fractions; the scenario kind is in the ``kind`` column.
+    Scenario names must be unique.
+    """
+    names = [s.name for s in scenarios]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Noms de scénarios en double : {', '.join(duplicates)}. Choisissez des noms distincts.")
+    assets = list(rets.columns)
+    if not scenarios:
+        return pd.DataFrame(columns=["kind", *METRICS],
+                            index=pd.MultiIndex.from_arrays([[], []], names=["scenario", "asset"]))
+    x = rets.to_numpy(dtype=float)
+    n_days, n_assets = x.shape
+    mu = x.mean(axis=0)
+    shock = np.stack([np.broadcast_to(s.shock, n_assets) for s in scenarios])
+    scale = np.stack([np.broadcast_to(s.scale, n_assets) for s in scenarios])
+    noise = np.array([s.noise for s in scenarios])
+
+    # (scénario, jour, actif) : écarts à la moyenne amplifiés, bruités pour les scénarios aléatoires
+    factor = scale[:, None, :]
+    if noise.any():
+        rng = rng if rng is not None else np.random.default_rng()
+        factor = factor * (1 + noise[:, None, None] * rng.standard_normal((len(scenarios), n_days, 1)))
+    stressed = mu + factor * (x - mu)
+    if weights is not None:
+        w = np.asarray(weights, dtype=float)
+        stressed = np.concatenate([stressed, (stressed @ w)[:, :, None]], axis=2)
+        shock = np.concatenate([shock, (shock @ w)[:, None]], axis=1)
+        assets = assets + [PORTFOLIO]
+
+    var = np.quantile(stressed, alpha, axis=1)
+    tail = stressed <= var[:, None, :]
+    cvar = np.where(tail, stressed, 0).sum(axis=1) / np.maximum(tail.sum(axis=1), 1)
+    volatility = stressed.std(axis=1, ddof=1) * np.sqrt(TRADING_DAYS) if n_days > 1 else np.full_like(var, np.nan)
+    # Richesse : 1 avant le choc, 1 + choc après, puis les rendements stressés
+    start = (1 + shock)[:, None, :]
+    wealth = np.concatenate([np.ones_like(start), start, start * np.cumprod(1 + stressed, axis=1)], axis=1)
+    drawdown = (wealth / np.maximum.accumulate(wealth, axis=1) - 1).min(axis=1)
+
+    metrics = {
+        "shock": shock,
+        "var": var,
+        "cvar": cvar,
+        "volatility": volatility,
+        "return": wealth[:, -1] - 1,
+        "max_drawdown": drawdown,
+    }
+    index = pd.MultiIndex.from_product([names, assets], names=["scenario", "asset"])
+    result = pd.DataFrame({k: v.ravel() for k, v in metrics.items()}, index=index)
+    result.insert(0, "kind", np.repeat([KINDS[s.kind] for s in scenarios], len(assets)))
+    return result
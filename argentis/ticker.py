@@ -0,0 +1,107 @@
+"""Lazy ticker handle fetching each yfinance component on first access."""
+import threading
+import time
+
+# Durée de vie (secondes) de chaque composant en mémoire
+COMPONENT_TTL = {
+    "info": 6 * 3600,
+    "history": 900,
+    "sustainability": 24 * 3600,
+    "news": 900,
+}
+
+# Clés du dictionnaire historiquement renvoyé par get_ticker_data
+_LEGACY_KEYS = {
+    "info": "info",
+    "historical_data": "history",
+    "sustainability": "sustainability",
+    "news": "news",
+}
+
+
+class LazyTicker:
+    """Handle on one ticker whose components are fetched separately and cached.
+
+    ``info``, ``history``, ``sustainability`` and ``news`` are only downloaded
+    when a page reads them, then kept for their own TTL (``COMPONENT_TTL``).
+    A failed fetch returns None and is recorded in ``errors``; it is retried
+    on the next access. The handle also answers ``get("historical_data")``
+    and friends, like the dict previously returned by ``get_ticker_data``.
+    With a ``news_store``, news are ingested into it and read back from it;
+    with a ``fundamentals`` store, ``info`` is answered from its snapshot.
+    """
+
+    def __init__(self, symbol, provider, store, ttl=None, clock=time.monotonic, news_store=None, fundamentals=None):
+        self.symbol = symbol
+        self.provider = provider
+        self.store = store
+        self.news_store = news_store
+        self.fundamentals = fundamentals
+        self.ttl = dict(COMPONENT_TTL, **(ttl or {}))
+        self.errors = {}
+        self._clock = clock
+        self._cache = {}
+        self._locks = {name: threading.Lock() for name in self.ttl}
+
+    def _component(self, name, loader):
+        with self._locks[name]:
+            cached = self._cache.get(name)
+            if cached is not None and self._clock() - cached[1] < self.ttl[name]:
+                return cached[0]
+            try:
+                value = loader()
+            except Exception as e:
+                self.errors[name] = e
+                return None
+            self.errors.pop(name, None)
+            self._cache[name] = (value, self._clock())
+            return value
+
+    def _load_history(self):
+        df = self.store.refresh(self.symbol, self.provider)
+        if df is None or df.empty or "Close" not in df.columns or len(df) < 2:
+            return None
+        return df
+
+    def _load_info(self):
+        if self.fundamentals is None:
+            return self.provider.info(self.symbol)
+        infos = self.fundamentals.infos([self.symbol], self.provider)
+        return next(iter(infos.values()), {})
+
+    @property
+    def info(self):
+        return self._component("info", self._load_info)
+
+    @property
+    def history(self):
+        return self._component("history", self._load_history)
+
+    @property
+    def sustainability(self):
+        return self._component("sustainability", lambda: self.provider.sustainability(self.symbol))
+
+    @property
+    def news(self):
+        if self.news_store is not None:
+            return self._component("news", lambda: self.news_store.refresh(self.symbol, self.provider))
+        return self._component("news", lambda: self.provider.news(self.symbol))
+
+    def invalidate(self, name=None):
+        """Forget one component (or all of them) so that it is fetched again."""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def get(self, key, default=None):
+        name = _LEGACY_KEYS.get(key)
+        if name is None:
+            return default
+        value = getattr(self, name)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in _LEGACY_KEYS:
+            raise KeyError(key)
+        return getattr(self, _LEGACY_KEYS[key])
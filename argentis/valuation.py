@@ -0,0 +1,74 @@
+"""Simplified WACC and DCF valuations, vectorized over tickers and assumptions.
+
+Every function broadcasts its arguments with NumPy: a vector of cash flows
+against scalar rates values a whole universe, and cash flows against a
+column of discount rates and a row of growth rates gives, in one pass, the
+sensitivity surface of every ticker. The assumptions default to those the
+pages always used (growth 2 %, discount 8 %, tax 21 %, five years).
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+GROWTH_RATE = 0.02
+DISCOUNT_RATE = 0.08
+COST_OF_EQUITY = 0.08
+COST_OF_DEBT = 0.04
+TAX_RATE = 0.21
+YEARS = 5
+
+# values : tableau (tickers, taux d'actualisation, taux de croissance), en M$
+Sensitivity = namedtuple("Sensitivity", "tickers discount_rates growth_rates values")
+
+
+def wacc(total_debt, market_cap, cost_of_equity=COST_OF_EQUITY, cost_of_debt=COST_OF_DEBT, tax_rate=TAX_RATE):
+    """Weighted average cost of capital (a fraction) from the debt and equity values."""
+    total_debt = np.asarray(total_debt, dtype=float)
+    market_cap = np.asarray(market_cap, dtype=float)
+    total = total_debt + market_cap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        debt_weight = np.where(total > 0, total_debt / total, 0.0)
+        equity_weight = np.where(total > 0, market_cap / total, 0.0)
+    return equity_weight * cost_of_equity + debt_weight * cost_of_debt * (1 - tax_rate)
+
+
+def dcf(cash_flow, growth_rate=GROWTH_RATE, discount_rate=DISCOUNT_RATE, years=YEARS):
+    """Present value of ``years`` growing cash flows plus a Gordon terminal value.
+
+    Arguments broadcast together; NaN where the discount rate does not
+    exceed the growth rate (no finite terminal value).
+    """
+    cash_flow = np.asarray(cash_flow, dtype=float)
+    g = np.asarray(growth_rate, dtype=float)
+    r = np.asarray(discount_rate, dtype=float)
+    ratio = (1 + g) / (1 + r)
+    # Somme géométrique des flux actualisés : sum_{i=1..N} ratio^i
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(np.isclose(ratio, 1.0), years, ratio * (1 - ratio ** years) / (1 - ratio))
+        terminal = (1 + g) ** (years + 1) / (r - g) / (1 + r) ** years
+        return np.where(r > g, cash_flow * (annuity + terminal), np.nan)
+
+
+def value_universe(table, growth_rate=GROWTH_RATE, discount_rate=DISCOUNT_RATE, years=YEARS, **wacc_kwargs):
+    """WACC (%) and DCF (M$) of every row of a fundamentals table (``total_debt``, ``market_cap``, ``operating_cash_flow``).
+
+    Missing debt and market cap take the defaults of the former per-ticker
+    functions (no debt, a market cap of 1); a missing cash flow gives a NaN
+    DCF, to be shown as insufficient data rather than valued at zero.
+    """
+    result = pd.DataFrame(index=table.index)
+    result["wacc"] = wacc(table["total_debt"].fillna(0).to_numpy(dtype=float),
+                          table["market_cap"].fillna(1).to_numpy(dtype=float), **wacc_kwargs) * 100
+    result["dcf"] = dcf(table["operating_cash_flow"].to_numpy(dtype=float),
+                        growth_rate, discount_rate, years) / 1e6
+    return result
+
+
+def sensitivity(table, discount_rates, growth_rates, years=YEARS):
+    """DCF (M$) of every ticker for every (discount rate, growth rate) pair of the two grids (NaN without cash flow)."""
+    discount_rates = np.asarray(discount_rates, dtype=float)
+    growth_rates = np.asarray(growth_rates, dtype=float)
+    cash_flow = table["operating_cash_flow"].to_numpy(dtype=float)
+    values = dcf(cash_flow[:, None, None], growth_rates[None, None, :], discount_rates[None, :, None], years) / 1e6
+    return Sensitivity(list(table.index), discount_rates, growth_rates, values)
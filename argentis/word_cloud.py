@@ -0,0 +1,55 @@
+"""Word clouds rendered from word frequencies, cached as PNG files.
+
+Images are keyed by a hash of the frequencies and the rendering settings:
+as long as the headlines of a ticker bring no new word, the page serves the
+same PNG without running the WordCloud layout again.
+"""
+import hashlib
+import io
+import json
+from collections import Counter
+from pathlib import Path
+
+from wordcloud import STOPWORDS, WordCloud
+
+from . import DATA_DIR
+from .disk_cache import DiskCache
+from .news_store import cloud_words
+
+# Mots vides anglais de wordcloud complétés des mots vides français
+FRENCH_STOPWORDS = set("""
+au aux avec ce ces cet cette dans de des du elle en et eux il ils je la le les leur leurs lui ma mais me même
+mes moi mon ne nos notre nous on ou où par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une
+vos votre vous été être avoir fait faire plus moins très sans sous entre après avant depuis selon vers chez
+comme dont elles ont sont est était sera aussi encore contre face
+""".split())
+DEFAULT_STOPWORDS = frozenset({w.casefold() for w in STOPWORDS} | FRENCH_STOPWORDS)
+
+
+def word_frequencies(texts, stopwords=DEFAULT_STOPWORDS):
+    """Count the words of texts that are not in the store (simulated headlines...)."""
+    return dict(Counter(w for text in texts for w in cloud_words(text) if w not in stopwords))
+
+
+class WordCloudCache:
+    """LRU store of rendered word clouds in ``<root>/<hash>.png``, at most ``max_entries`` images."""
+
+    def __init__(self, root=None, max_entries=256):
+        self.root = Path(root) if root is not None else DATA_DIR / "wordclouds"
+        self.max_entries = max_entries
+        self._files = DiskCache(self.root, max_entries, suffixes=(".png",))
+
+    @staticmethod
+    def key(frequencies, params):
+        payload = json.dumps([sorted(frequencies.items()), sorted(params.items())], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def render(self, frequencies, **params):
+        """Return the PNG bytes of the word cloud of ``{word: count}``; ``params`` go to ``WordCloud()``."""
+        def create():
+            image = WordCloud(**params).generate_from_frequencies(frequencies).to_image()
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            return buffer.getvalue()
+
+        return self._files.get_or_create(f"{self.key(frequencies, params)}.png", create)
@@ -0,0 +1 @@
+"""Pytest root: makes the ``argentis`` package importable from ``tests/``."""
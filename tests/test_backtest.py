@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from argentis.backtest import backtest
+
+
+def prices(n=400, assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2022-01-03", periods=n)
+    rets = rng.normal(0.0003, 0.02, (n, assets)) * np.linspace(0.5, 2, assets)
+    return pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=index)
+
+
+def naive(prices, w, schedule, threshold, cost):
+    """Day-by-day reference: hold shares, rebalance on the schedule or on drift."""
+    p = prices.to_numpy()
+    w = np.asarray(w, dtype=float) / np.sum(w)
+    shares = w / p[0]
+    values, turnover, rebalances = [1.0], 0.0, 0
+    for t in range(1, len(p)):
+        held = shares * p[t]
+        value = held.sum()
+        if schedule == "monthly":
+            due = prices.index[t].month != prices.index[t - 1].month
+        elif schedule == "quarterly":
+            due = prices.index[t].quarter != prices.index[t - 1].quarter
+        elif schedule == "threshold":
+            due = (np.abs(held / value - w) > threshold).any()
+        else:
+            due = False
+        if due:
+            traded = np.abs(w - held / value).sum()
+            value *= 1 - cost * traded
+            shares = w * value / p[t]
+            turnover += traded
+            rebalances += 1
+        values.append(value)
+    return np.array(values), turnover, rebalances
+
+
+@pytest.mark.parametrize("schedule", ["none", "monthly", "quarterly", "threshold"])
+def test_each_schedule_matches_a_daily_loop(schedule):
+    panel = prices()
+    weights = np.array([[0.4, 0.3, 0.2, 0.1], [0.25, 0.25, 0.25, 0.25], [0.1, 0.1, 0.1, 0.7]])
+    result = backtest(panel, weights, schedule, thresholds=0.03, cost=0.002, window=17)
+    for i, w in enumerate(weights):
+        values, turnover, rebalances = naive(panel, w, schedule, 0.03, 0.002)
+        np.testing.assert_allclose(result.values[i], values, rtol=1e-12)
+        assert result.metrics["turnover"].iloc[i] == pytest.approx(turnover, rel=1e-12, abs=1e-15)
+        assert result.metrics["rebalances"].iloc[i] == rebalances
+    if schedule != "none":
+        assert (result.metrics["rebalances"] > 0).all()
+
+
+def test_mixed_schedules_and_windows_give_the_same_paths():
+    panel = prices(300, 3, seed=1)
+    weights = np.tile([0.5, 0.3, 0.2], (4, 1))
+    schedules = ["none", "monthly", "quarterly", "threshold"]
+    thresholds = [0.0, 0.0, 0.0, 0.02]
+    result = backtest(panel, weights, schedules, thresholds, cost=0.001, window=5, memory_budget=10 ** 3)
+    for i, schedule in enumerate(schedules):
+        values, _, rebalances = naive(panel, weights[i], schedule, thresholds[i], 0.001)
+        np.testing.assert_allclose(result.values[i], values, rtol=1e-12)
+        assert result.metrics["rebalances"].iloc[i] == rebalances
+    assert list(result.metrics["schedule"]) == ["Aucun", "Mensuel", "Trimestriel", "Seuil de dérive"]
+
+
+def test_metrics_of_the_paths():
+    panel = prices(253, 2, seed=2)
+    result = backtest(panel, [0.6, 0.4], "monthly")
+    values = result.values[0]
+    rets = values[1:] / values[:-1] - 1
+    assert result.metrics["total_return"].iloc[0] == pytest.approx(values[-1] - 1)
+    assert result.metrics["cagr"].iloc[0] == pytest.approx(values[-1] - 1)
+    assert result.metrics["volatility"].iloc[0] == pytest.approx(rets.std(ddof=1) * np.sqrt(252))
+    assert result.metrics["max_drawdown"].iloc[0] == pytest.approx((values / np.maximum.accumulate(values) - 1).min())
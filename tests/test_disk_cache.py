@@ -0,0 +1,44 @@
+import os
+import pickle
+
+from argentis.disk_cache import DiskCache, pickle_dumps
+from argentis.simulation import SimulationCache
+
+
+def test_get_or_create_computes_once(tmp_path):
+    cache = DiskCache(tmp_path, 4)
+    calls = []
+    create = lambda: calls.append(1) or b"data"
+    assert cache.get_or_create("a.pkl", create) == b"data"
+    assert cache.get_or_create("a.pkl", create) == b"data"
+    assert len(calls) == 1
+
+
+def test_evicts_least_recently_read(tmp_path):
+    cache = DiskCache(tmp_path, 2, dumps=pickle_dumps, loads=pickle.loads)
+    cache.put("a.pkl", 1)
+    cache.put("b.pkl", 2)
+    os.utime(tmp_path / "a.pkl", (0, 0))
+    os.utime(tmp_path / "b.pkl", (10, 10))
+    assert cache.get("a.pkl") == 1          # lecture : "a" redevient le plus récent
+    cache.put("c.pkl", 3)
+    assert cache.names() == ["a.pkl", "c.pkl"]
+
+
+def test_ignores_other_suffixes_and_unreadable_entries(tmp_path):
+    cache = DiskCache(tmp_path, 1, suffixes=(".png",))
+    (tmp_path / "notes.json").write_text("{}")
+    cache.put("x.png", b"1")
+    cache.put("y.png", b"2")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.json", "y.png"]
+    pickled = DiskCache(tmp_path, 4, loads=pickle.loads)
+    (tmp_path / "bad.pkl").write_bytes(b"not a pickle")
+    assert pickled.get("bad.pkl") is None
+
+
+def test_simulation_cache_runs_once(tmp_path):
+    cache = SimulationCache(tmp_path)
+    calls = []
+    fn = lambda x: calls.append(x) or {"x": x}
+    assert cache.run("k", fn, 3) == cache.run("k", fn, 3) == {"x": 3}
+    assert calls == [3]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from argentis.downsample import downsample, lttb_indices, minmax_indices
+
+
+def series(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2000-01-03", periods=n)
+    return pd.Series(100 + np.cumsum(rng.normal(0, 1, n)), index=index)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("points", [4, 5, 50, 801])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_ends_and_extremes_within_budget(method, points, seed):
+    s = series(seed=seed)
+    # Extrêmes placés loin des extrémités, dans des seaux quelconques
+    s.iloc[1234] = s.max() + 50
+    s.iloc[1240] = s.min() - 50
+    out = downsample(s, points, method)
+    assert len(out) <= points
+    assert out.index[0] == s.index[0] and out.index[-1] == s.index[-1]
+    assert out.max() == s.max() and out.min() == s.min()
+    assert out.index.is_monotonic_increasing and out.index.is_unique
+    pd.testing.assert_series_equal(out, s.loc[out.index])
+
+
+@pytest.mark.parametrize("points", [3, 10, 800])
+def test_lttb_returns_exactly_the_budget(points):
+    s = series(seed=3)
+    assert len(lttb_indices(np.arange(len(s), dtype=float), s.to_numpy(), points)) == points
+    assert len(downsample(s, points, "lttb")) == points
+
+
+@pytest.mark.parametrize("points", [4, 10, 800])
+def test_minmax_returns_the_budget(points):
+    y = series(seed=4).to_numpy()
+    kept = minmax_indices(y, points)
+    assert len(kept) == points
+    # Chaque seau intérieur apporte son minimum et son maximum
+    inner = minmax_indices(np.sin(np.arange(1000)), points)
+    assert len(inner) == points
+
+
+def test_lttb_keeps_the_shape_of_a_spike():
+    y = np.zeros(1000)
+    y[500] = 1.0
+    kept = lttb_indices(np.arange(1000, dtype=float), y, 10)
+    assert 500 in kept and kept[0] == 0 and kept[-1] == 999
+
+
+def test_short_data_and_missing_values():
+    s = series(100)
+    assert downsample(s, 800) is s
+    gappy = series(3000, seed=5)
+    gappy.iloc[::7] = np.nan
+    out = downsample(gappy, 200, "minmax")
+    assert out.notna().all() and len(out) <= 200
+    assert out.max() == gappy.max() and out.min() == gappy.min()
+    frame = pd.DataFrame({"a": series(3000, 6), "b": series(3000, 7)})
+    both = downsample(frame, 100)
+    assert both["a"].max() == frame["a"].max() and both["b"].min() == frame["b"].min()
+    assert len(both) <= 200
+    with pytest.raises(ValueError):
+        downsample(s, 10, "every-other")
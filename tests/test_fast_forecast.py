@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+
+from argentis import INTERVAL_WIDTH
+from argentis.fast_forecast import drift, forecast_panel, ses, trend
+
+HORIZON = 10
+
+
+def panel(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=n)
+    data = 100 + np.cumsum(rng.normal(0.1, 1.0, (n, 3)), axis=0)
+    frame = pd.DataFrame(data, index=index, columns=["AAA", "BBB", "NEW"])
+    frame.iloc[:120, 2] = np.nan      # coté plus tard
+    frame.iloc[[50, 51, 200], 0] = np.nan  # séances manquantes
+    return frame
+
+
+def test_drift_matches_the_textbook_formula():
+    frame = panel()
+    mean, std = drift(frame.ffill().to_numpy(), HORIZON)
+    h = np.arange(1, HORIZON + 1)
+    for j, col in enumerate(frame.columns):
+        y = frame[col].ffill().dropna().to_numpy()
+        T = len(y)
+        slope = (y[-1] - y[0]) / (T - 1)
+        sigma = np.sqrt(((np.diff(y) - slope) ** 2).sum() / (T - 2))
+        np.testing.assert_allclose(mean[:, j], y[-1] + h * slope)
+        np.testing.assert_allclose(std[:, j], sigma * np.sqrt(h * (1 + h / (T - 1))))
+
+
+@pytest.mark.parametrize("window", [252, 60])
+def test_trend_matches_a_least_squares_fit(window):
+    frame = panel()
+    values = frame.to_numpy()
+    mean, std = trend(values, HORIZON, window=window)
+    for j in range(values.shape[1]):
+        y = values[-window:, j]
+        x = np.arange(len(y), dtype=float)
+        x, y = x[~np.isnan(y)], y[~np.isnan(y)]
+        slope, intercept = np.polyfit(x, y, 1)
+        resid = y - (intercept + slope * x)
+        sigma = np.sqrt((resid ** 2).sum() / (len(y) - 2))
+        x_new = window - 1 + np.arange(1, HORIZON + 1)
+        np.testing.assert_allclose(mean[:, j], intercept + slope * x_new)
+        expected = sigma * np.sqrt(1 + 1 / len(y) + (x_new - x.mean()) ** 2 / ((x - x.mean()) ** 2).sum())
+        np.testing.assert_allclose(std[:, j], expected)
+
+
+def test_ses_matches_the_recursion_and_picks_the_best_constant():
+    frame = panel(seed=1)
+    values = frame.ffill().to_numpy()
+    alphas = np.array([0.1, 0.5, 0.9])
+    mean, std = ses(values, HORIZON, alphas=alphas)
+    for j in range(values.shape[1]):
+        y = values[~np.isnan(values[:, j]), j]
+        fits = []
+        for alpha in alphas:
+            level, errors = y[0], []
+            for v in y[1:]:
+                errors.append(v - level)
+                level += alpha * (v - level)
+            fits.append((np.mean(np.square(errors)), alpha, level))
+        mse, alpha, level = min(fits)
+        np.testing.assert_allclose(mean[:, j], level)
+        np.testing.assert_allclose(std[:, j], np.sqrt(mse) * np.sqrt(1 + np.arange(HORIZON) * alpha ** 2))
+
+
+def test_forecast_panel_intervals_and_short_histories():
+    frame = panel()
+    frame["TINY"] = np.nan
+    frame.iloc[-2:, 3] = [10.0, 11.0]
+    result = forecast_panel(frame, HORIZON, "drift")
+    z = norm.ppf(0.5 + INTERVAL_WIDTH / 2)
+    mean, std = drift(frame.ffill().to_numpy(), HORIZON)
+    np.testing.assert_allclose(result.upper["AAA"] - result.mean["AAA"], z * std[:, 0])
+    assert list(result.mean.index) == list(range(1, HORIZON + 1))
+    assert result.mean["TINY"].isna().all()
+    single = forecast_panel(frame["BBB"], HORIZON, "trend")
+    np.testing.assert_allclose(single.mean["BBB"], trend(frame[["BBB"]].ffill().to_numpy(), HORIZON)[0][:, 0])
+    with pytest.raises(ValueError):
+        forecast_panel(frame, HORIZON, "prophet")
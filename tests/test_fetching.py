@@ -0,0 +1,77 @@
+import json
+import time
+
+import pytest
+
+from argentis.fetching import FetchScheduler, TokenBucket
+
+
+class Flaky:
+    """Callable failing with ``error`` for its first ``failures`` calls."""
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, x=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return x
+
+
+def test_bucket_allows_bursts_then_throttles():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.1, abs=0.02)
+    start = time.monotonic()
+    bucket.acquire(3)
+    assert time.monotonic() - start == pytest.approx(0.3, abs=0.1)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_scheduler_keeps_the_rate_across_workers():
+    scheduler = FetchScheduler(TokenBucket(rate=50, capacity=1), max_workers=8)
+    start = time.monotonic()
+    results, errors = scheduler.map(lambda x: x * 2, range(11))
+    # Un jeton immédiat, puis dix à 50 par seconde
+    assert time.monotonic() - start >= 0.19
+    assert results == {i: i * 2 for i in range(11)} and errors == {}
+
+
+@pytest.mark.parametrize("error", [ConnectionError("reset"), TimeoutError("slow"), OSError("dns"),
+                                   json.JSONDecodeError("Expecting value", "<html>", 0)])
+def test_network_and_http_errors_are_retried(error):
+    scheduler = FetchScheduler(TokenBucket(rate=1000), base_delay=0.001, max_attempts=4)
+    fn = Flaky(2, error)
+    assert scheduler.call(fn, "ok") == "ok"
+    assert fn.calls == 3
+    always = Flaky(10, error)
+    with pytest.raises(type(error)):
+        scheduler.call(always)
+    assert always.calls == 4
+
+
+@pytest.mark.parametrize("error", [ValueError("bad argument"), RuntimeError("bug"), KeyError("regularMarketPrice"),
+                                   Exception("unknown symbol")])
+def test_other_errors_are_not_retried(error):
+    scheduler = FetchScheduler(TokenBucket(rate=1000), base_delay=0.001)
+    fn = Flaky(1, error)
+    with pytest.raises(type(error)):
+        scheduler.call(fn)
+    assert fn.calls == 1
+
+
+def test_map_reports_errors_per_item():
+    scheduler = FetchScheduler(TokenBucket(rate=1000), base_delay=0.001, max_attempts=2)
+
+    def fetch(symbol):
+        if symbol == "BAD":
+            raise KeyError(symbol)
+        return symbol.lower()
+
+    results, errors = scheduler.map(fetch, ["AAA", "BAD", "AAA", "BBB"])
+    assert results == {"AAA": "aaa", "BBB": "bbb"}
+    assert list(errors) == ["BAD"] and isinstance(errors["BAD"], KeyError)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from argentis.frontier import simulate_frontier
+
+MU = np.linspace(0.05, 0.15, 6)
+COV = np.diag(np.linspace(0.02, 0.09, 6))
+
+
+def test_same_seed_same_portfolios_whatever_the_chunking():
+    a = simulate_frontier(MU, COV, 5000, seed=3)
+    b = simulate_frontier(MU, COV, 5000, seed=3, memory_budget=2 ** 10, workers=3, keep_weights=True)
+    np.testing.assert_array_equal(a.vols, b.vols)
+    np.testing.assert_array_equal(a.best_weights, b.weights[b.best])
+    assert a.best == np.nanargmax(a.sharpes)
+
+
+def test_other_seed_other_portfolios():
+    a = simulate_frontier(MU, COV, 1000, seed=1)
+    b = simulate_frontier(MU, COV, 1000, seed=2)
+    assert not np.array_equal(a.vols, b.vols)
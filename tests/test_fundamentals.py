@@ -0,0 +1,80 @@
+import pytest
+
+from argentis.fundamentals import FundamentalsStore
+from argentis.providers import FakeProvider
+
+TICKERS = [f"T{i:02d}" for i in range(60)]
+
+
+class GappyProvider(FakeProvider):
+    """Fake provider leaving some figures out, and repeating one P/E exactly."""
+
+    def info(self, ticker):
+        info = super().info(ticker)
+        number = int(ticker[1:])
+        if number % 11 == 1:
+            info["trailingPE"] = 15.0
+        if number % 5 == 0:
+            info.pop("trailingPE")
+        if number % 7 == 0:
+            info["returnOnEquity"] = None
+        return info
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FundamentalsStore(tmp_path, clock=Clock())
+    store.refresh(TICKERS, GappyProvider(start="2024-01-01", end="2024-06-28"))
+    return store
+
+
+@pytest.mark.parametrize("expression", [
+    "pe < 15",
+    "pe <= 15",
+    "pe == 15",
+    "pe >= 15",
+    "pe > 15",
+    "pe < 20 and roe > 0.15",
+    "roe >= 0 & pe > 30 and dividend_yield < 0.02",
+    "market_cap > 1e11",
+    "debt_to_equity < -1",
+])
+def test_indexed_select_matches_query(store, expression):
+    table = store.table()
+    assert store.select(expression) == list(table.query(expression).index)
+
+
+def test_nan_rows_never_match(store):
+    table = store.table()
+    assert table["pe"].isna().sum() == 12
+    missing = set(table.index[table["pe"].isna()])
+    assert not missing & set(store.select("pe > -1e9"))
+    assert len(store.select("pe > -1e9")) == len(TICKERS) - len(missing)
+    assert store.select("pe == pe") == list(table.index[table["pe"].notna()])
+
+
+def test_other_expressions_fall_back_to_query(store):
+    assert store.select("sector == 'Energy' or pe < 10") == list(store.table().query("sector == 'Energy' or pe < 10").index)
+    with pytest.raises(ValueError, match="Expression invalide"):
+        store.select("unknown_column > 1")
+
+
+def test_stale_rows_only_are_downloaded(store):
+    provider = GappyProvider(start="2024-01-01", end="2024-06-28")
+    store.refresh(TICKERS[:3] + ["T99"], provider, fields=["pe"])
+    assert [c[1] for c in provider.calls if c[0] == "info"] == ["T99"]
+    # Le prix vit 15 minutes, les ratios 6 heures
+    store._clock.now += 1000
+    assert store.stale(TICKERS[:2], fields=["pe"]) == []
+    assert store.stale(TICKERS[:2], fields=["price"]) == TICKERS[:2]
+    # Le tableau relu après rafraîchissement reconstruit ses index
+    store.refresh(TICKERS[:2], provider, fields=["price"])
+    assert store.select("pe <= 15") == list(store.table().query("pe <= 15").index)
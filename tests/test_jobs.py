@@ -0,0 +1,111 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from argentis.jobs import PENDING, JobQueue, job_id
+
+
+def work(rets, weights, alpha=0.05):
+    return rets, weights, alpha
+
+
+def other(rets, weights, alpha=0.05):
+    return rets, weights, alpha
+
+
+def frame(seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2024-01-01", periods=50)
+    return pd.DataFrame(rng.normal(size=(50, 3)), index=index, columns=["AAA", "BBB", "CCC"])
+
+
+def test_equal_content_gives_the_same_id():
+    a = job_id(work, (frame(), np.array([0.2, 0.3, 0.5])), {"alpha": 0.05})
+    # Copies non contiguës, blocs pandas consolidés autrement : même contenu, même identifiant
+    rets = frame()
+    rets = pd.concat([rets[["AAA"]], rets[["BBB", "CCC"]]], axis=1)
+    weights = np.array([[0.2, 0.3, 0.5], [0, 0, 0]])[0, ::1]
+    assert job_id(work, (rets, weights), {"alpha": 0.05}) == a
+
+
+def test_any_change_gives_another_id():
+    a = job_id(work, (frame(), np.array([0.2, 0.3, 0.5])), {"alpha": 0.05})
+    changed = frame()
+    changed.iloc[10, 1] += 1e-9
+    assert job_id(work, (changed, np.array([0.2, 0.3, 0.5])), {"alpha": 0.05}) != a
+    assert job_id(work, (frame(), np.array([0.2, 0.3, 0.5])), {"alpha": 0.01}) != a
+    assert job_id(work, (frame().rename(columns={"AAA": "ZZZ"}), np.array([0.2, 0.3, 0.5])), {"alpha": 0.05}) != a
+    assert job_id(other, (frame(), np.array([0.2, 0.3, 0.5])), {"alpha": 0.05}) != a
+
+
+def test_keyword_order_does_not_matter():
+    assert job_id(work, (1,), {"alpha": 0.05, "beta": 2}) == job_id(work, (1,), {"beta": 2, "alpha": 0.05})
+
+
+def square(x, on_progress=None):
+    for i in range(3):
+        on_progress(i + 1, 3)
+    return x * x
+
+
+def fail(x):
+    raise ValueError(f"échec {x}")
+
+
+def crash(x):
+    os._exit(1)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path, max_workers=1, retry_after=3600)
+    yield queue
+    if queue._executor is not None:
+        queue._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def wait(queue, key, timeout=60):
+    deadline = time.monotonic() + timeout
+    while queue.status(key)["state"] in PENDING:
+        assert time.monotonic() < deadline, "job still pending"
+        time.sleep(0.05)
+    return queue.status(key)
+
+
+def test_submit_runs_once_and_reports_progress(queue):
+    key = queue.submit(square, 7)
+    assert queue.submit(square, 7) == key
+    assert queue.submit(square, 8) != key
+    assert wait(queue, key) == {"state": "done", "done": 1, "total": 1, "error": None}
+    assert queue.result(key) == 49
+    # Résultat sur disque : une nouvelle file (autre processus serveur) le retrouve sans recalcul
+    other = JobQueue(queue.root, max_workers=1)
+    assert other.submit(square, 7) == key and other._executor is None
+    assert other.status(key)["state"] == "done" and other.result(key) == 49
+
+
+def test_unknown_and_failed_jobs(queue):
+    assert queue.status("missing")["state"] == "unknown"
+    assert queue.result("missing") is None
+    key = queue.submit(fail, 1)
+    status = wait(queue, key)
+    assert status["state"] == "failed" and "échec 1" in status["error"]
+    # Échec ordinaire : pas de nouvel essai avant retry_after
+    future = queue._futures[key][0]
+    assert queue.submit(fail, 1) == key and queue._futures[key][0] is future
+
+
+def test_crashed_worker_is_replaced(queue):
+    key = queue.submit(crash, 1)
+    assert wait(queue, key)["state"] == "failed"
+    broken = queue._executor
+    # Le pool cassé est remplacé ; le job perdu avec le processus est relancé sans attendre retry_after
+    other = queue.submit(square, 3)
+    assert queue._executor is not broken
+    assert wait(queue, other)["state"] == "done" and queue.result(other) == 9
+    lost = queue._futures[key][0]
+    assert queue.submit(crash, 1) == key and queue._futures[key][0] is not lost
+    assert wait(queue, key)["state"] == "failed"
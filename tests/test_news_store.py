@@ -0,0 +1,88 @@
+import datetime
+
+import pytest
+
+from argentis.news_store import NewsStore
+from argentis.providers import FakeProvider
+
+NOW = 1_700_000_000
+
+
+def item(title, minutes_ago, link=None, related=()):
+    return {"title": title, "publisher": "Wire", "link": link or f"https://news.test/{title}",
+            "providerPublishTime": NOW - 60 * minutes_ago, "relatedTickers": list(related)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(tmp_path)
+
+
+def titles(articles):
+    return [a["title"] for a in articles]
+
+
+def test_the_same_article_is_stored_once(store):
+    first = item("Apple beats estimates", 30, link="https://news.test/a")
+    assert store.ingest("AAPL", [first]) == 1
+    assert store.ingest("AAPL", [first]) == 0
+    # Même lien, ou même titre à la casse et la ponctuation près, pour un autre ticker
+    assert store.ingest("MSFT", [dict(first, title="Other title")]) == 0
+    assert store.ingest("GOOG", [item("APPLE beats estimates!", 20, link="https://other.test/b")]) == 0
+    assert len(store.search()) == 1
+    assert sorted(store.search()[0]["relatedTickers"]) == ["AAPL", "GOOG", "MSFT"]
+
+
+def test_refresh_only_inserts_past_the_cursor(store):
+    store.ingest("AAPL", [item("First", 60), item("Second", 30)])
+    assert store.cursor("AAPL")[0] == NOW - 30 * 60
+    # Plus ancien que le curseur : ignoré ; même horodatage : le dédoublonnage tranche
+    added = store.ingest("AAPL", [item("Too old", 90), item("Second", 30), item("Same time", 30), item("Third", 10)])
+    assert added == 2
+    found = titles(store.search(tickers=["AAPL"]))
+    assert found[0] == "Third" and set(found[1:3]) == {"Second", "Same time"} and found[3] == "First"
+    assert store.cursor("AAPL")[0] == NOW - 10 * 60
+    assert store.ingest("AAPL", []) == 0
+    assert store.cursor("AAPL")[0] == NOW - 10 * 60
+
+
+def test_tickers_are_isolated(store):
+    store.ingest("AAPL", [item("Apple news", 10)])
+    # Le curseur d'AAPL ne filtre pas les articles plus anciens de MSFT
+    store.ingest("msft ", [item("Microsoft news", 120), item("Cloud deal with Apple", 5, related=["AAPL"])])
+    assert titles(store.search(tickers=["MSFT"])) == ["Cloud deal with Apple", "Microsoft news"]
+    assert titles(store.search(tickers=["AAPL"])) == ["Cloud deal with Apple", "Apple news"]
+    assert store.cursor("AAPL")[0] == NOW - 10 * 60
+    assert store.cursor("GOOG") is None
+    assert store.search(tickers=["GOOG"]) == []
+
+
+def test_search_by_words_and_date(store):
+    store.ingest("AAPL", [item("Apple résultats en hausse", 60 * 24 * 10), item("Apple cuts prices", 5)])
+    assert titles(store.search("resultats HAUSSE")) == ["Apple résultats en hausse"]
+    assert titles(store.search("apple")) == ["Apple cuts prices", "Apple résultats en hausse"]
+    assert store.search("apple missing") == []
+    since = datetime.datetime.fromtimestamp(NOW - 3600)
+    assert titles(store.search("apple", since=since)) == ["Apple cuts prices"]
+
+
+def test_refresh_calls_the_provider_once_per_max_age(store):
+    provider = FakeProvider(end="2024-06-28")
+    first = store.refresh("AAPL", provider)
+    second = store.refresh("aapl", provider)
+    assert [c for c in provider.calls if c[0] == "news"] == [("news", "AAPL")]
+    assert len(first) == 3 and titles(first) == titles(second)
+
+
+def test_word_counts_cover_the_latest_headlines_only(store):
+    store.ingest("AAPL", [item(f"Merger talks stall {i}", 100 + i) for i in range(3)])
+    store.ingest("AAPL", [item("Apple record sales", 20), item("Record iPhone sales in the quarter", 10)])
+    store.ingest("MSFT", [item("Microsoft sales slump", 5, related=["MSFT"])])
+    counts = store.word_counts("aapl", stopwords={"the", "in"}, articles=2)
+    assert counts == {"record": 2, "sales": 2, "apple": 1, "iphone": 1, "quarter": 1}
+    # Fenêtre plus large : les anciens titres comptent à nouveau
+    assert store.word_counts("AAPL", articles=5)["merger"] == 3
+    assert list(store.word_counts("AAPL", articles=5, limit=2)) == ["merger", "talks"]
+    since = datetime.datetime.fromtimestamp(NOW - 15 * 60, tz=datetime.timezone.utc)
+    assert store.word_counts("AAPL", stopwords={"the", "in"}, since=since) == {
+        "record": 1, "iphone": 1, "sales": 1, "quarter": 1}
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+
+from argentis.optimizer import efficient_frontier, max_sharpe, min_variance
+
+
+@pytest.fixture
+def market():
+    rng = np.random.default_rng(0)
+    n = 8
+    x = rng.normal(0, 0.01, (500, n)) + rng.normal(0, 0.01, (500, 1))
+    mu = x.mean(axis=0) * 252 + np.linspace(0.02, 0.16, n)
+    cov = np.cov(x.T) * 252
+    return mu, cov
+
+
+def slsqp(objective, n, max_weight=1.0, constraints=()):
+    """Reference solution of a long-only, fully invested problem with scipy."""
+    cons = [{"type": "eq", "fun": lambda w: w.sum() - 1}, *constraints]
+    result = minimize(objective, np.full(n, 1 / n), method="SLSQP", bounds=[(0, max_weight)] * n,
+                      constraints=cons, options={"ftol": 1e-12, "maxiter": 1000})
+    assert result.success
+    return result.x
+
+
+def test_min_variance_with_bounds_and_budget(market):
+    mu, cov = market
+    p = min_variance(mu, cov, max_weight=0.2)
+    ref = slsqp(lambda w: w @ cov @ w, len(mu), 0.2)
+    assert p.weights.sum() == pytest.approx(1)
+    assert p.weights.max() <= 0.2 + 1e-8
+    assert p.vol ** 2 == pytest.approx(ref @ cov @ ref, rel=1e-5)
+    np.testing.assert_allclose(p.weights, ref, atol=1e-4)
+
+
+def test_min_variance_for_target_return(market):
+    mu, cov = market
+    target = 0.12
+    p = min_variance(mu, cov, target_return=target)
+    ref = slsqp(lambda w: w @ cov @ w, len(mu), constraints=[{"type": "eq", "fun": lambda w: w @ mu - target}])
+    assert p.ret == pytest.approx(target, abs=1e-6)
+    assert p.vol ** 2 == pytest.approx(ref @ cov @ ref, rel=1e-5)
+
+
+def test_max_sharpe_with_sector_caps(market):
+    mu, cov = market
+    sectors = ["a", "a", "a", "b", "b", "c", "c", "c"]
+    caps = {"a": 0.5, "b": 0.3, "c": 0.4}
+    p = max_sharpe(mu, cov, risk_free=0.01, max_weight=0.35, sectors=sectors, sector_caps=caps)
+    sector_rows = [{"type": "ineq", "fun": lambda w, s=s: caps[s] - sum(w[i] for i, t in enumerate(sectors) if t == s)}
+                   for s in caps]
+    ref = slsqp(lambda w: -(w @ mu - 0.01) / np.sqrt(w @ cov @ w), len(mu), 0.35, sector_rows)
+    assert p.sharpe == pytest.approx((ref @ mu - 0.01) / np.sqrt(ref @ cov @ ref), rel=1e-5)
+    for s, cap in caps.items():
+        assert sum(w for w, t in zip(p.weights, sectors) if t == s) <= cap + 1e-8
+
+
+def test_frontier_points_are_min_variance(market):
+    mu, cov = market
+    for point in efficient_frontier(mu, cov, points=10, max_weight=0.4)[::3]:
+        ref = slsqp(lambda w: w @ cov @ w, len(mu), 0.4,
+                    [{"type": "eq", "fun": lambda w, r=point.ret: w @ mu - r}])
+        assert point.vol ** 2 == pytest.approx(ref @ cov @ ref, rel=1e-4)
+
+
+def test_infeasible_constraints_raise(market):
+    mu, cov = market
+    with pytest.raises(ValueError):
+        min_variance(mu, cov, max_weight=0.1)
+    with pytest.raises(ValueError):
+        min_variance(mu, cov, sectors=["a"] * 8, sector_caps={"a": 0.5})
+    with pytest.raises(ValueError):
+        min_variance(mu, cov, target_return=mu.max() + 0.05)
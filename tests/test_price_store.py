@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+import pytest
+
+from argentis.price_store import PriceStore
+from argentis.providers import FakeProvider
+
+
+class DividendProvider(FakeProvider):
+    """Fake provider paying a dividend on its last bar for some tickers."""
+
+    def __init__(self, payers=(), **kwargs):
+        super().__init__(**kwargs)
+        self.payers = set(payers)
+
+    def _bars(self, ticker):
+        df = super()._bars(ticker)
+        if ticker in self.payers:
+            df.loc[df.index[-1], "Dividends"] = 0.5
+        return df
+
+
+def downloads(provider):
+    return [c for c in provider.calls if c[0] == "download"]
+
+
+def make_stale(store, *tickers):
+    for t in tickers:
+        os.utime(store._path(t), (0, 0))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(tmp_path, max_age=900)
+
+
+def test_cold_tickers_are_fetched_in_one_request(store):
+    provider = FakeProvider(start="2024-01-01", end="2024-06-28")
+    frames = store.refresh_many(["AAA", "BBB"], provider)
+    assert downloads(provider) == [("download", ("AAA", "BBB"), "5y", None)]
+    assert frames["AAA"].index[-1] == pd.Timestamp("2024-06-28")
+    # Données fraîches : servies depuis le disque
+    store.refresh_many(["AAA", "BBB"], provider)
+    assert len(downloads(provider)) == 1
+
+
+def test_stale_tickers_only_download_new_bars(store):
+    store.refresh_many(["AAA"], FakeProvider(start="2024-01-01", end="2024-06-28"))
+    make_stale(store, "AAA")
+    later = FakeProvider(start="2024-01-01", end="2024-07-31")
+    frame = store.refresh_many(["AAA"], later)["AAA"]
+    assert downloads(later) == [("download", ("AAA",), None, "2024-06-28")]
+    expected = later.history("AAA", start="2024-01-01")
+    assert frame.index.equals(expected.index)
+    pd.testing.assert_series_equal(frame["Close"], expected["Close"], check_freq=False)
+    assert store.load("AAA").index[-1] == pd.Timestamp("2024-07-31")
+
+
+def test_corporate_action_rewrites_the_whole_history(store):
+    store.refresh_many(["AAA", "BBB"], FakeProvider(start="2024-01-01", end="2024-06-28"))
+    make_stale(store, "AAA", "BBB")
+    later = DividendProvider(payers={"AAA"}, start="2024-01-01", end="2024-07-31")
+    frames = store.refresh_many(["AAA", "BBB"], later)
+    assert downloads(later) == [
+        ("download", ("AAA", "BBB"), None, "2024-06-28"),
+        ("download", ("AAA",), "5y", None),
+    ]
+    assert frames["AAA"]["Dividends"].iloc[-1] == 0.5
+    assert frames["AAA"].index[0] == pd.Timestamp("2024-01-01")
+
+
+def test_at_most_two_requests_for_any_mix(store):
+    first = FakeProvider(start="2024-01-01", end="2024-06-28")
+    store.refresh_many(["FRESH", "STALE", "PAYER"], first)
+    make_stale(store, "STALE", "PAYER")
+    later = DividendProvider(payers={"PAYER"}, start="2024-01-01", end="2024-07-31", missing={"GONE"})
+    frames = store.refresh_many(["FRESH", "STALE", "PAYER", "COLD", "GONE"], later)
+    assert len(downloads(later)) == 2
+    assert frames["GONE"] is None
+    assert all(frames[t] is not None for t in ("FRESH", "STALE", "PAYER", "COLD"))
+
+
+def test_spellings_of_one_symbol_share_a_lock(store):
+    provider = FakeProvider(start="2024-01-01", end="2024-06-28")
+    # Deux orthographes du même symbole : un seul verrou, un seul téléchargement
+    frames = store.refresh_many(["aapl", " AAPL", "AAPL"], provider)
+    assert downloads(provider) == [("download", ("AAPL",), "5y", None)]
+    assert frames["aapl"] is frames[" AAPL"] is frames["AAPL"]
+    make_stale(store, "AAPL")
+    store.refresh_many(["AAPL", "aapl"], provider)
+    assert len(downloads(provider)) == 2
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from argentis.frontier import TRADING_DAYS
+from argentis.rolling import RollingCorrelation, RollingRisk, RollingStore
+
+WINDOW = 21
+
+
+def closes(seed=0, n=300):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=n)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))), index=index)
+
+
+def reference_risk(close, window=WINDOW, alpha=0.05):
+    rets = close.pct_change()
+    drawdown = close / close.rolling(window, min_periods=1).max() - 1
+    return pd.DataFrame({
+        "volatility": rets.rolling(window).std() * np.sqrt(TRADING_DAYS),
+        "var": rets.rolling(window).quantile(alpha),
+        "drawdown": drawdown,
+        "max_drawdown": drawdown.rolling(window, min_periods=1).min(),
+    })
+
+
+def assert_same(result, expected):
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, check_names=False, rtol=1e-9, atol=1e-12)
+
+
+def test_risk_matches_pandas_including_the_warm_up():
+    close = closes()
+    result = RollingRisk(WINDOW).update(close.to_frame())
+    expected = reference_risk(close)
+    assert result["volatility"].iloc[:WINDOW].isna().all() and result["var"].iloc[:WINDOW].isna().all()
+    assert_same(result, expected)
+
+
+def test_correlation_matches_pandas():
+    a, b = closes(1), closes(2)
+    b = b * np.exp(0.5 * np.log(a).diff().fillna(0).cumsum())
+    result = RollingCorrelation(WINDOW).update(pd.concat([a, b], axis=1))["correlation"]
+    expected = a.pct_change().rolling(WINDOW).corr(b.pct_change())
+    pd.testing.assert_series_equal(result, expected, check_freq=False, check_names=False, rtol=1e-8)
+
+
+def test_incremental_updates_match_one_pass():
+    close = closes(3)
+    state = RollingRisk(WINDOW)
+    for end in (30, 31, 120, 250, len(close)):
+        result = state.update(close.iloc[:end].to_frame())
+    assert_same(result, reference_risk(close))
+
+
+def test_last_bar_is_provisional():
+    close = closes(4, 100)
+    state = RollingRisk(WINDOW)
+    state.update(close.to_frame())
+    # Séance en cours : la dernière barre change, l'état engagé ne l'a pas consommée
+    revised = close.copy()
+    revised.iloc[-1] *= 0.9
+    assert state.consistent(revised.to_frame())
+    assert_same(state.update(revised.to_frame()), reference_risk(revised))
+
+
+def test_store_skips_gaps_and_rebuilds_restated_history(tmp_path):
+    store = RollingStore(tmp_path)
+    close = closes(5, 200)
+    close.iloc[[10, 50, 51]] = np.nan
+    assert_same(store.risk("AAA", close.iloc[:150], WINDOW), reference_risk(close.iloc[:150].dropna()))
+    assert_same(store.risk("AAA", close, WINDOW), reference_risk(close.dropna()))
+    # Dividende détaché après le dernier jour engagé : les cours ajustés antérieurs changent, l'état est reconstruit
+    restated = close * np.where(np.arange(len(close)) < 199, 0.98, 1.0)
+    assert_same(store.risk("AAA", restated, WINDOW), reference_risk(restated.dropna()))
+    a, b = closes(6, 200), closes(7, 200)
+    b.iloc[30] = np.nan
+    frame = pd.concat([a, b], axis=1).dropna()
+    expected = frame[0].pct_change().rolling(WINDOW).corr(frame[1].pct_change())
+    result = store.correlation("AAA", "BBB", a, b, WINDOW)
+    pd.testing.assert_series_equal(result, expected, check_freq=False, check_names=False, rtol=1e-8)
+
+
+@pytest.mark.parametrize("alpha", [0.01, 0.5, 0.99])
+def test_var_interpolates_like_pandas(alpha):
+    close = closes(8, 120)
+    result = RollingRisk(WINDOW, alpha).update(close.to_frame())["var"]
+    expected = close.pct_change().rolling(WINDOW).quantile(alpha)
+    pd.testing.assert_series_equal(result, expected, check_freq=False, check_names=False, rtol=1e-9)
@@ -0,0 +1,33 @@
+import pytest
+
+from argentis.screener import DEFAULT_RULES, fundamentals_table, score
+
+
+def baseline_score(info):
+    """Scoring of the former per-ticker loop of the Recommandations page."""
+    pe = info.get("trailingPE", "N/A")
+    gr = info.get("earningsGrowth", "N/A")
+    if pe != "N/A" and gr != "N/A":
+        return 5 if pe < 20 and gr > 0 else (1 if pe > 30 else 3)
+    return 0
+
+
+@pytest.mark.parametrize("info", [
+    {},
+    {"trailingPE": 35},
+    {"trailingPE": 15},
+    {"earningsGrowth": 0.1},
+    {"earningsGrowth": -0.1},
+    {"trailingPE": 15, "earningsGrowth": 0.1},
+    {"trailingPE": 35, "earningsGrowth": 0.1},
+    {"trailingPE": 25, "earningsGrowth": -0.1},
+    {"trailingPE": 15, "earningsGrowth": -0.1},
+])
+def test_default_rules_match_baseline(info):
+    table = fundamentals_table({"T": info})
+    assert score(table, DEFAULT_RULES)["T"] == baseline_score(info)
+
+
+def test_scores_whole_table_at_once():
+    infos = {"A": {"trailingPE": 35}, "B": {"trailingPE": 15, "earningsGrowth": 0.2}, "C": {}}
+    assert score(fundamentals_table(infos)).to_dict() == {"A": 0.0, "B": 5.0, "C": 0.0}
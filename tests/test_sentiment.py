@@ -0,0 +1,50 @@
+import numpy as np
+
+from argentis.sentiment import SentimentEngine, default_engine
+
+LEXICON = {"beat*": 1, "growth": 1, "fall*": -1, "fail*": -1, "hausse": 1, "progress*": 1}
+
+
+def scores(*headlines, **kwargs):
+    return SentimentEngine(LEXICON, **kwargs).score(list(headlines)).tolist()
+
+
+def test_terms_are_summed_per_headline():
+    assert scores("Stock beats estimates", "Growth stalls, shares fall", "Nothing here") == [1, 0, 0]
+
+
+def test_negation_flips_the_following_terms():
+    assert scores("Stock doesn't beat estimates", "Stock doesn’t beat estimates") == [-1, -1]
+    assert scores("No growth in sight", "Company never fails to deliver") == [-1, 1]
+    assert scores("Le titre ne progresse pas", "Pas de hausse en vue", "Une séance sans hausse") == [-1, -1, -1]
+
+
+def test_negation_scope_is_bounded():
+    # Au-delà de la fenêtre, après une fin de proposition, ou dans le titre suivant : pas d'inversion
+    assert scores("Not that anyone expected it to beat") == [1]
+    assert scores("Not a surprise: shares fall", "Not great but growth") == [-1, 1]
+    assert scores("Shares did not", "beat estimates") == [0, 1]
+    assert scores("Stock doesn't beat estimates", negation_window=0) == [1]
+
+
+def test_bundled_lexicon_handles_negation():
+    engine = default_engine()
+    assert engine.score(["Stock doesn't beat estimates"])[0] < 0 < engine.score(["Stock beats estimates"])[0]
+    assert np.array_equal(engine.label(["Stock beats estimates"]), ["Positif"])
+
+
+def test_bundled_prefixes_do_not_catch_unrelated_words():
+    engine = default_engine()
+    assert engine.score(["Topic of the day: a mission to Suez", "Shares topple"]).tolist() == [0, 0]
+    assert engine.score(["Apple tops estimates", "Company sued"]).tolist() == [1, -1]
+
+
+def test_hyphenated_words_fall_back_to_their_parts():
+    assert scores("Q3-growth", "Beat-and-raise quarter") == [1, 1]
+    assert SentimentEngine({"sell-off": -1, "sell*": 1}).score(["Tech sell-off"]).tolist() == [-1]
+
+
+def test_scores_do_not_depend_on_unrelated_entries():
+    big = dict(LEXICON, **{f"filler{i}" + "*" * (i % 2): 1 for i in range(5000)})
+    headlines = ["Stock doesn't beat estimates", "Growth stalls, shares fall", "Filler1 text"]
+    assert SentimentEngine(big).score(headlines).tolist() == scores(*headlines[:2]) + [1]
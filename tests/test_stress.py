@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from argentis.frontier import TRADING_DAYS
+from argentis.stress import (PORTFOLIO, Scenario, factor_scenarios, historical_scenarios, parse_scenarios,
+                             stress_test)
+
+RETS = pd.DataFrame({"AAA": [0.01, -0.02, 0.03, 0.00], "BBB": [0.02, 0.01, -0.01, 0.02]},
+                    index=pd.bdate_range("2024-01-01", periods=4))
+
+
+def scenario(name, shock, scale=1.0, kind="custom"):
+    return Scenario(name, kind, np.asarray(shock, dtype=float), np.asarray(scale, dtype=float), 0.0)
+
+
+def test_shock_and_scale_by_hand():
+    result = stress_test(RETS, [scenario("Choc", [-0.10, 0.05], scale=2.0)], weights=[0.5, 0.5], alpha=0.25)
+    # AAA : moyenne 0,005, écarts doublés
+    a = np.array([0.015, -0.045, 0.055, -0.005])
+    row = result.loc[("Choc", "AAA")]
+    assert row["shock"] == pytest.approx(-0.10)
+    assert row["return"] == pytest.approx(0.9 * np.prod(1 + a) - 1)
+    assert row["volatility"] == pytest.approx(a.std(ddof=1) * np.sqrt(TRADING_DAYS))
+    assert row["var"] == pytest.approx(np.quantile(a, 0.25))
+    assert row["cvar"] == pytest.approx(a[a <= np.quantile(a, 0.25)].mean())
+    wealth = np.concatenate([[1.0, 0.9], 0.9 * np.cumprod(1 + a)])
+    assert row["max_drawdown"] == pytest.approx((wealth / np.maximum.accumulate(wealth) - 1).min())
+    b = np.array([0.01, 0.0, -0.02, 0.01]) * 2 + 0.01
+    portfolio = result.loc[("Choc", PORTFOLIO)]
+    assert portfolio["shock"] == pytest.approx(-0.025)
+    assert portfolio["return"] == pytest.approx(0.975 * np.prod(1 + (a + b) / 2) - 1)
+
+
+def test_identity_scenario_keeps_the_history():
+    result = stress_test(RETS, [scenario("Neutre", [0.0, 0.0])])
+    assert result.loc[("Neutre", "BBB"), "return"] == pytest.approx(np.prod(1 + RETS["BBB"]) - 1)
+
+
+def test_factor_and_historical_scenarios():
+    beta = factor_scenarios(RETS, market_moves=(-0.2,), vol_multipliers=(1.0,), noise=0)
+    assert len(beta) == 1 and beta[0].shock.mean() == pytest.approx(-0.2)
+    prices = (1 + RETS).cumprod() * 100
+    worst = historical_scenarios(prices, windows={"Pire jour": 1}, episodes={})[0]
+    day = RETS.mean(axis=1).idxmin()
+    np.testing.assert_allclose(worst.shock, RETS.loc[day].to_numpy())
+
+
+def test_parse_scenarios():
+    parsed = parse_scenarios("Krach : -30  # commentaire\n\nMix : -10, 5", ["AAA", "BBB"])
+    assert [s.name for s in parsed] == ["Krach", "Mix"]
+    np.testing.assert_allclose(parsed[0].shock, [-0.3, -0.3])
+    np.testing.assert_allclose(parsed[1].shock, [-0.1, 0.05])
+    with pytest.raises(ValueError, match="Ligne 1"):
+        parse_scenarios("sans deux-points", ["AAA"])
+    with pytest.raises(ValueError, match="2 chocs"):
+        parse_scenarios("X : 1, 2, 3", ["AAA", "BBB"])
+
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(ValueError, match="Ligne 2"):
+        parse_scenarios("Krach : -30\nKrach : -20", ["AAA", "BBB"])
+    with pytest.raises(ValueError, match="Pire mois"):
+        stress_test(RETS, [scenario("Pire mois", [-0.1, -0.1], kind="historical"), scenario("Pire mois", [0.1, 0.1])])
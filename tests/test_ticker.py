@@ -0,0 +1,127 @@
+import pytest
+
+from argentis.news_store import NewsStore
+from argentis.price_store import PriceStore
+from argentis.providers import FakeProvider
+from argentis.ticker import COMPONENT_TTL, LazyTicker
+
+
+class Clock:
+    """Manually advanced clock standing in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingProvider(FakeProvider):
+    """Fake provider whose ``info`` fails the first ``failures`` times."""
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def info(self, ticker):
+        if self.failures:
+            self.failures -= 1
+            self.calls.append(("info", ticker))
+            raise ConnectionError("reset by peer")
+        return super().info(ticker)
+
+
+def calls(provider, kind):
+    return sum(1 for c in provider.calls if c[0] == kind)
+
+
+@pytest.fixture
+def setup(tmp_path):
+    provider = FakeProvider(start="2024-01-01")
+    clock = Clock()
+    ticker = LazyTicker("AAPL", provider, PriceStore(tmp_path), clock=clock)
+    return ticker, provider, clock
+
+
+def test_components_are_fetched_on_first_access_only(setup):
+    ticker, provider, _ = setup
+    assert provider.calls == []
+    assert ticker.info["symbol"] == "AAPL"
+    assert [c[0] for c in provider.calls] == ["info"]
+    # Les autres composants ne sont pas téléchargés avec info
+    assert ticker.sustainability is not None and ticker.sustainability is not None
+    assert calls(provider, "sustainability") == 1
+    assert calls(provider, "news") == 0
+    assert calls(provider, "history") + calls(provider, "download") == 0
+
+
+def test_each_component_expires_after_its_own_ttl(setup):
+    ticker, provider, clock = setup
+    ticker.info, ticker.news
+    clock.now = COMPONENT_TTL["news"] - 1
+    ticker.info, ticker.news
+    assert calls(provider, "info") == 1 and calls(provider, "news") == 1
+    clock.now = COMPONENT_TTL["news"]
+    ticker.info, ticker.news
+    assert calls(provider, "info") == 1 and calls(provider, "news") == 2
+    clock.now = COMPONENT_TTL["info"]
+    ticker.info
+    assert calls(provider, "info") == 2
+
+
+def test_ttl_overrides_and_invalidate(tmp_path):
+    provider = FakeProvider(start="2024-01-01")
+    clock = Clock()
+    ticker = LazyTicker("MSFT", provider, PriceStore(tmp_path), ttl={"info": 10}, clock=clock)
+    assert ticker.ttl["info"] == 10 and ticker.ttl["news"] == COMPONENT_TTL["news"]
+    ticker.info
+    clock.now = 10
+    ticker.info
+    assert calls(provider, "info") == 2
+    ticker.news
+    ticker.invalidate("info")
+    ticker.info, ticker.news
+    assert calls(provider, "info") == 3 and calls(provider, "news") == 1
+    ticker.invalidate()
+    ticker.info, ticker.news
+    assert calls(provider, "info") == 4 and calls(provider, "news") == 2
+
+
+def test_failed_fetch_is_recorded_and_retried(tmp_path):
+    provider = FailingProvider(1, start="2024-01-01")
+    ticker = LazyTicker("AAPL", provider, PriceStore(tmp_path), clock=Clock())
+    assert ticker.info is None
+    assert isinstance(ticker.errors["info"], ConnectionError)
+    # Un échec n'est pas mis en cache : l'accès suivant réessaie
+    assert ticker.info["symbol"] == "AAPL"
+    assert "info" not in ticker.errors
+    assert calls(provider, "info") == 2
+
+
+def test_history_goes_through_the_store(setup, tmp_path):
+    ticker, provider, _ = setup
+    df = ticker.history
+    assert "Close" in df.columns and len(df) > 2
+    assert ticker.history is df
+    assert calls(provider, "history") + calls(provider, "download") == 1
+    missing = LazyTicker("NOPE", FakeProvider(start="2024-01-01", missing=["NOPE"]), PriceStore(tmp_path / "m"))
+    assert missing.history is None
+
+
+def test_legacy_dict_access(setup):
+    ticker, provider, _ = setup
+    assert ticker.get("historical_data") is ticker.history
+    assert ticker["info"] is ticker.info
+    assert ticker.get("unknown", "default") == "default"
+    with pytest.raises(KeyError):
+        ticker["unknown"]
+    missing = LazyTicker("NOPE", FakeProvider(missing=["NOPE"]), None)
+    assert missing.get("sustainability", "aucune") == "aucune"
+
+
+def test_news_are_read_back_from_the_news_store(tmp_path):
+    provider = FakeProvider(start="2024-01-01")
+    ticker = LazyTicker("AAPL", provider, PriceStore(tmp_path), news_store=NewsStore(tmp_path / "news"))
+    news = ticker.news
+    assert len(news) == 3 and calls(provider, "news") == 1
+    assert {n["title"] for n in news} == {item["title"] for item in provider.news("AAPL")}
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from argentis.valuation import dcf, sensitivity, value_universe
+
+
+def table():
+    return pd.DataFrame({
+        "total_debt": [1e9, None, 0.0],
+        "market_cap": [4e9, 2e9, None],
+        "operating_cash_flow": [5e8, None, 1e8],
+    }, index=["AAA", "NOCF", "CCC"], dtype=object)
+
+
+def test_dcf_matches_the_explicit_sum():
+    g, r, n = 0.02, 0.08, 5
+    flows = sum(100 * (1 + g) ** i / (1 + r) ** i for i in range(1, n + 1))
+    terminal = 100 * (1 + g) ** (n + 1) / (r - g) / (1 + r) ** n
+    assert np.isclose(dcf(100, g, r, n), flows + terminal)
+    assert np.isnan(dcf(100, 0.08, 0.08))
+
+
+def test_missing_cash_flow_is_not_valued_at_zero():
+    result = value_universe(table())
+    assert np.isnan(result.loc["NOCF", "dcf"])
+    assert np.isfinite(result.loc["NOCF", "wacc"])
+    assert np.isclose(result.loc["AAA", "dcf"], dcf(5e8) / 1e6)
+    assert np.isclose(result.loc["CCC", "dcf"], dcf(1e8) / 1e6)
+
+
+def test_sensitivity_masks_missing_cash_flow():
+    surface = sensitivity(table(), [0.06, 0.08], [0.01, 0.02, 0.03])
+    assert surface.values.shape == (3, 2, 3)
+    assert np.isnan(surface.values[1]).all()
+    assert np.isclose(surface.values[0, 1, 1], dcf(5e8) / 1e6)